@@ -1,10 +1,18 @@
 """
-agent_actionstack.py  (v4)
+agent_actionstack.py  (v5)
 ────────────────────────────────────────────────────────────────────────────
 • 주요 변경
-  1. _nearest_safe : 탐험 단계에서는 이미 방문한 (1,1)을 목표로 삼지 않음
-  2. _plan         : 방문 safe 가 고갈되면 unknown 으로 즉시 전환
-  3. 나머지 로직(v3) : Grab-TurnLeft×2, 행동 스택 역추적, 3-회 사격 서열 등
+  1. _move         : 부호 기반 탐욕 조향 → planner.Planner 최단 경로
+                     (known-safe 칸만 통과, 회전 비용 포함). 경로가 없을 때만 탐욕 조향
+  2. 귀환          : 행동 스택 역추적(visit_act) · Grab-TurnLeft×2 제거,
+                     (1,1) 까지 최단 경로로 복귀
+  3. _best_unknown  : risk="exact" 이면 inference.Inference 로 safe 와 맞닿은 unknown 중
+                     P(pit or wumpus) 최소 칸 선택 (예산 초과 시 기존 점수 방식)
+  4. _update        : breeze_cells 교집합(공통 이웃을 pit 으로 오판) 제거 →
+                     propagation.Propagator 증분 전파로 확정 safe / pit / wumpus 도출
+  5. 나머지 로직(v4) : _nearest_safe (1,1) 제외, safe 고갈 시 unknown 전환, 3-회 사격 서열 등
+  6. 계측          : metrics=metrics.Metrics() 면 step 구간 시간 · 결정 경로 카운터 기록
+                     (기본 None → trace 처럼 `is not None` 검사만 남음)
 ────────────────────────────────────────────────────────────────────────────
 """
 
@@ -12,8 +20,20 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Set, Tuple, List, Optional, Deque
 from collections import deque
+from time import perf_counter
+import copy
 
-from setting import Dir, Percept, World, SAFE_STARTS
+from setting import Dir, DIRS, Percept, World, SAFE_STARTS, ACT_CODE
+from topology import TURN, toward
+from tracelog import ListTrace, DEAD
+from kb import Board, CellSet
+from frontier import Frontier
+from planner import Planner
+from inference import Inference
+from propagation import Propagator
+from metrics import Metrics
+
+SHOT_NO = {1: 1, 3: 2, 0: 3}                    # 사격 직후 shoot_stage → 3-회 시퀀스 중 몇 번째 사격
 
 
 # ──────────────────────────────────────────────────────────────────────────
@@ -24,26 +44,32 @@ class Agent:
     x: int = 1
     y: int = 1
     dir: Dir = Dir.E
-    arrows: int = 3
+    arrows: int = 3                 # 시작 화살 수 (reset_position 도 이 값으로)
     has_gold: bool = False
     performance: int = 0
 
-    # ── 2. 지식 베이스 ─────────────────────────────────────────
-    visited: Set[Tuple[int, int]] = field(default_factory=set)
-    safe: Set[Tuple[int, int]] = field(default_factory=lambda: {(1, 1), (1, 2), (2, 1)})
-    definite_pit: Set[Tuple[int, int]] = field(default_factory=set)
-    definite_wumpus: Set[Tuple[int, int]] = field(default_factory=set)
-    definite_obstacle: Set[Tuple[int, int]] = field(default_factory=set)
+    # ── 2. 지식 베이스 (kb.CellSet 비트보드, __post_init__ 에서 생성) ──
+    board: Board = field(init=False, repr=False)
+    visited: CellSet = field(init=False)
+    safe: CellSet = field(init=False)
+    definite_pit: CellSet = field(init=False)
+    definite_wumpus: CellSet = field(init=False)
+    definite_obstacle: CellSet = field(init=False)
+    breeze: CellSet = field(init=False)
+    stench: CellSet = field(init=False)         # stench 관측 칸 (wumpus 사살 시 비움)
+    nostench: CellSet = field(init=False)       # stench 없음 관측 칸
+    frontier: Frontier = field(init=False, repr=False)     # 목표 선택 인덱스
+    planner: Planner = field(init=False, repr=False)       # safe 칸 최단 경로
+    inference: Inference = field(init=False, repr=False)   # 프런티어 P(pit) / P(wumpus)
+    kb: Propagator = field(init=False, repr=False)         # 증분 제약 전파 (확정 safe / pit / wumpus)
 
     stench_dirs: Set[Dir] = field(default_factory=set)
-    breeze_cells: List[Tuple[int, int]] = field(default_factory=list)
 
     # ── 3. 제어 플래그 ─────────────────────────────────────────
     returning: bool = False
     pending_shot: Optional[Dir] = None
     turn_after_shoot: bool = False
     force_forward: bool = False
-    forced_turns: int = 0           # Grab 후 남은 강제 TurnLeft 횟수
     shoot_stage: int = 0            # Wumpus 사격 단계 (0~5)
 
     prev: Tuple[int, int] = (1, 1)
@@ -52,106 +78,186 @@ class Agent:
 
     start_targets: Deque[Tuple[int, int]] = field(default_factory=lambda: deque([(2, 1), (1, 2)]))
 
-    # ── 4. 행동 스택 ───────────────────────────────────────────
-    visit_act: List[str] = field(default_factory=list)
-    pop_idx: int = -1
+    trace: Optional[ListTrace] = field(default_factory=ListTrace, repr=False)   # None = 기록 끔
+    risk: str = "exact"             # unknown 목표 선택: exact(확률 추론) / heuristic(점수)
+    start_arrows: int = field(init=False, repr=False)
+    metrics: Optional[Metrics] = field(default=None, repr=False)                 # None = 계측 끔
+
+    def __post_init__(self):
+        self.board = b = Board(self.world.size)
+        self.visited = CellSet(b)
+        self.safe = CellSet(b, SAFE_STARTS)
+        self.definite_pit = CellSet(b)
+        self.definite_wumpus = CellSet(b)
+        self.definite_obstacle = CellSet(b)
+        self.breeze = CellSet(b)
+        self.stench = CellSet(b)
+        self.nostench = CellSet(b)
+        self.frontier = Frontier(b)
+        self.planner = Planner(b)
+        w = self.world                          # 생성 파라미터 = 사전확률 / 종류별 상한
+        self.inference = Inference(b, w.max_pits, wumpus_cap=w.max_wumpi,
+                                   pit_prob=w.pit_prob, wumpus_prob=w.wumpus_prob)
+        self.kb = Propagator(b, w.max_pits, w.max_wumpi)
+        self.start_arrows = self.arrows
+        for x, y in SAFE_STARTS:
+            self.kb.fact(b.id(x, y), pit=False, wumpus=False)
 
-    history: List[dict] = field(default_factory=list)
+    # ──────────────────────────────────────────────────────────
+    #  스냅샷 (replay 체크포인트 등)
+    #  frontier / planner / inference 는 KB 마스크에서 다시 계산되므로 저장하지 않음
+    # ──────────────────────────────────────────────────────────
+    _STATE = ("x", "y", "dir", "arrows", "has_gold", "performance",
+              "returning", "pending_shot", "turn_after_shoot", "force_forward",
+              "shoot_stage", "prev", "prev_dir", "spin_count")
+    _KB = ("visited", "safe", "definite_pit", "definite_wumpus",
+           "definite_obstacle", "breeze", "stench", "nostench")
+
+    def snapshot(self) -> tuple:
+        return (tuple(getattr(self, k) for k in self._STATE),
+                tuple(getattr(self, k).bits for k in self._KB),
+                self.kb.snapshot(), frozenset(self.stench_dirs),
+                tuple(self.start_targets))
+
+    def restore(self, snap: tuple):
+        state, kb, props, stench_dirs, start_targets = snap
+        for k, v in zip(self._STATE, state):
+            setattr(self, k, v)
+        for k, v in zip(self._KB, kb):
+            getattr(self, k).bits = v
+        self.kb.restore(props)
+        self.stench_dirs = set(stench_dirs)
+        self.start_targets = deque(start_targets)
+        self.frontier.sync(self.safe.bits, self.visited.bits,      # 스텝 전에 고르는 경우(회복) 대비
+                           self._known_bits(), self.breeze.bits)
+
+    def fork(self, world: Optional[World] = None) -> "Agent":
+        """독립적으로 진행할 수 있는 복사본 (기록 없음). world 를 주면 그 월드에서 이어 감
+        (rollout 에서 KB 와 맞는 가상 월드로 분기). inference 메모는 공유"""
+        a = copy.copy(self)
+        a.world = self.world if world is None else world
+        for k in self._KB:
+            setattr(a, k, getattr(self, k).copy())
+        a.kb, a.frontier, a.planner = self.kb.fork(), self.frontier.fork(), self.planner.fork()
+        a.stench_dirs = set(self.stench_dirs)
+        a.start_targets = deque(self.start_targets)
+        a.trace = None
+        a.metrics = None
+        return a
 
     # ──────────────────────────────────────────────────────────
     #  로그 헬퍼
     # ──────────────────────────────────────────────────────────
-    def _log(self, step: int, act: str, p: Percept):
-        self.history.append(dict(step=step, act=act,
-                                 pos=(self.x, self.y),
-                                 dir=self.dir.name, percept=repr(p)))
+    def _log(self, step: int, act: str, p: Percept, dead: bool = False):
+        self.trace.record(step, ACT_CODE[act] | (DEAD if dead else 0),
+                          self.x, self.y, self.dir.code, p)
+
+    @property
+    def history(self) -> List[dict]:
+        """기록을 dict 목록으로 (읽을 때만 문자열 변환)"""
+        return self.trace.rows() if self.trace is not None else []
 
     # ──────────────────────────────────────────────────────────
     #  탐색 유틸리티
     # ──────────────────────────────────────────────────────────
+    def _known_bits(self) -> int:
+        return (self.visited.bits | self.safe.bits | self.definite_pit.bits |
+                self.definite_wumpus.bits | self.definite_obstacle.bits)
+
+    def _danger_bits(self) -> int:
+        return self.definite_pit.bits | self.definite_wumpus.bits | self.definite_obstacle.bits
+
     def _best_unknown(self) -> Optional[Tuple[int, int]]:
-        best, score = None, -1.0
-        for x in range(1, 5):
-            for y in range(1, 5):
-                pos = (x, y)
-                if pos in self.visited | self.safe | self.definite_pit | \
-                   self.definite_wumpus | self.definite_obstacle:
-                    continue
-                adj = [(x + d.dx, y + d.dy) for d in Dir]
-                safe_ratio = sum(1 for a in adj if a in self.safe) / 4
-                near_breeze = any(abs(x - bx) + abs(y - by) == 1
-                                  for bx, by in self.breeze_cells)
-                val = safe_ratio + (0.5 if near_breeze else 0)
-                if val > score:
-                    best, score = pos, val
-        return best
+        """risk=exact → safe 와 맞닿은 unknown 중 P(pit or wumpus) 최소 (동점이면 점수 큰 쪽)
+        그 외 / 추론 실패 → 점수 = 인접 safe 비율 + breeze 인접 보너스 (frontier 힙에서 최대값)"""
+        if self.risk == "exact":
+            tgt = self._min_risk()
+            if tgt:
+                return tgt
+        i = self.frontier.best_unknown()
+        return None if i is None else self.board.xy(i)
+
+    def _min_risk(self) -> Optional[Tuple[int, int]]:
+        b = self.board
+        cand = b.spread(self.safe.bits) & b.interior & ~self._known_bits()
+        if not cand:
+            return None
+        kb = self.kb                            # 상한은 KB 의 현재 값 (사살한 wumpus 만큼 줄어듦)
+        risks = self.inference.risks(self.safe.bits, self.visited.bits,
+                                     self.definite_pit.bits, self.definite_wumpus.bits,
+                                     self.breeze.bits, self.stench.bits, self.nostench.bits,
+                                     pit_cap=kb.pit.cap, wumpus_cap=kb.wumpus.cap)
+        if risks is None:
+            return None
+        score = self.frontier.score
+        best, bkey = None, None
+        for i in b.ids(cand):
+            pp, pw = risks[i]
+            k = (round(1 - (1 - pp) * (1 - pw), 9), -score.get(i, 0.0), i)
+            if bkey is None or k < bkey:
+                best, bkey = i, k
+        return b.xy(best)
 
     def _nearest_safe(self) -> Optional[Tuple[int, int]]:
         """아직 방문하지 않은 safe. returning 상태에서만 (1,1)을 허용"""
-        for p in sorted(self.safe,
-                        key=lambda t: abs(t[0] - self.x) + abs(t[1] - self.y)):
-            if p == (1, 1) and not self.returning:     # ★ 변경
-                continue
-            if p not in self.visited and p != (self.x, self.y) and p != self.prev:
-                return p
-        return None
+        b = self.board
+        exclude = (1 << b.id(self.x, self.y)) | (1 << b.id(*self.prev))
+        if not self.returning:                                  # ★ 변경
+            exclude |= 1 << b.id(1, 1)
+        return self.frontier.nearest_safe(self.x, self.y, exclude)
 
     def _move(self, tgt: Optional[Tuple[int, int]]) -> str:
         if tgt is None:
             return "TurnLeft"
-        if tgt != (1, 1) and tgt in (self.definite_pit |
-                                     self.definite_wumpus |
-                                     self.definite_obstacle):
+        if tgt != (1, 1) and (self._danger_bits() >> self.board.id(*tgt)) & 1:
             return "TurnLeft"
+        act = self.planner.next_action(self.safe.bits, self.x, self.y,
+                                       self.dir.code, *tgt)
+        if act:
+            return act
         if (self.x + self.dir.dx, self.y + self.dir.dy) == tgt:
             return "Forward"
 
-        dx, dy = tgt[0] - self.x, tgt[1] - self.y
-        desired = (Dir.E if dx > 0 else Dir.W if dx < 0 else
-                   Dir.N if dy > 0 else Dir.S)
-        if self.dir == desired:
-            return "Forward"
-        order = [Dir.N, Dir.E, Dir.S, Dir.W]
-        return "TurnRight" if (order.index(desired) - order.index(self.dir)) % 4 == 1 \
-                           else "TurnLeft"
+        # safe 칸만으로는 닿지 않는 목표 → 부호 기반 탐욕 조향
+        return TURN[self.dir.code][toward(tgt[0] - self.x, tgt[1] - self.y)] or "Forward"
 
     def _plan(self, tgt: Optional[Tuple[int, int]]) -> str:
-        if tgt and tgt != (self.x, self.y):
+        if not tgt or tgt == (self.x, self.y):
+            tgt = self._nearest_safe()
+        if tgt:
+            if self.metrics is not None:
+                self.metrics.inc("target_nearest_safe")
             return self._move(tgt)
-        alt = self._nearest_safe()
-        if alt:
-            return self._move(alt)
         # safe 모두 방문 → unknown 으로 ★ 변경
         unk = self._best_unknown()
+        if self.metrics is not None:
+            self.metrics.inc("target_best_unknown")
         return self._move(unk)
 
     # ──────────────────────────────────────────────────────────
-    #  KB 업데이트 (기존 로직 그대로)
+    #  KB 업데이트
+    #  확정 safe / pit / wumpus 는 propagation.Propagator 가 관측마다 증분 전파
     # ──────────────────────────────────────────────────────────
     def _update(self, p: Percept):
-        self.visited.add((self.x, self.y)); self.safe.add((self.x, self.y))
-        if not p.stench and not p.breeze:
-            for d in Dir:
-                ax, ay = self.x + d.dx, self.y + d.dy
-                if 1 <= ax <= 4 and 1 <= ay <= 4:
-                    self.safe.add((ax, ay))
+        pos = (self.x, self.y)
+        self.visited.add(pos)
+        (self.stench if p.stench else self.nostench).add(pos)
         if p.stench:
-            for d in Dir:
-                nx, ny = self.x + d.dx, self.y + d.dy
-                if 1 <= nx <= 4 and 1 <= ny <= 4:
-                    self.stench_dirs.add(d)
+            self.stench_dirs.update(DIRS[d] for d in self.board.grid.dirs_in[self.board.id(*pos)])
         if p.breeze:
-            self.breeze_cells.append((self.x, self.y))
-            if len(self.breeze_cells) >= 2:
-                inter = set.intersection(*[
-                    {(bx + d.dx, by + d.dy)
-                     for d in Dir if 1 <= bx + d.dx <= 4 and 1 <= by + d.dy <= 4}
-                    for bx, by in self.breeze_cells])
-                for pt in inter:
-                    if pt not in SAFE_STARTS:
-                        self.definite_pit.add(pt); self.safe.discard(pt)
+            self.breeze.add(pos)
         if p.scream:
             self.stench_dirs.clear(); self.pending_shot = None; self.force_forward = True
+        self.kb.observe(self.board.id(*pos), p.breeze, p.stench)
+        self._sync_kb()
+
+    def _sync_kb(self):
+        kb = self.kb
+        self.safe.bits |= kb.safe
+        self.definite_pit.bits = kb.pit.yes
+        self.definite_wumpus.bits = kb.wumpus.yes
+        self.frontier.sync(self.safe.bits, self.visited.bits,
+                           self._known_bits(), self.breeze.bits)
 
     # ──────────────────────────────────────────────────────────
     #  의사결정
@@ -167,19 +273,13 @@ class Agent:
 
         # 귀환 모드
         if self.returning:
-            if self.forced_turns > 0:
-                self.forced_turns -= 1
-                return "TurnLeft"
-            if (self.x, self.y) == (1, 1) and self.pop_idx < 0:
+            if (self.x, self.y) == (1, 1):
                 return "Climb"
-            if self.pop_idx >= 0:
-                rev = self.visit_act[self.pop_idx]; self.pop_idx -= 1
-                return {"F": "Forward", "L": "TurnRight", "R": "TurnLeft"}[rev]
-            return "TurnLeft"
+            return self._move((1, 1))
 
         # 정면 위험 회피
-        ahead = (self.x + self.dir.dx, self.y + self.dir.dy)
-        if ahead in (self.definite_pit | self.definite_wumpus | self.definite_obstacle):
+        ahead = self.board.id(self.x, self.y) + self.board.grid.delta[self.dir.code]
+        if (self._danger_bits() >> ahead) & 1:
             return "TurnLeft"
 
         # 탐험 모드
@@ -204,7 +304,7 @@ class Agent:
                 self.pending_shot = self.dir; self.shoot_stage = 0; return "Shoot"
 
         if ((self.x, self.y) == (1, 1) and not self._nearest_safe() and
-                not self._best_unknown() and not self.stench_dirs):
+                not self.board.interior & ~self._known_bits() and not self.stench_dirs):
             return "Climb"
 
         return self._plan(self._nearest_safe())
@@ -212,62 +312,77 @@ class Agent:
     # ──────────────────────────────────────────────────────────
     #  한 턴 실행
     # ──────────────────────────────────────────────────────────
-    def step(self, step: int) -> bool:
+    def step(self, step: int, act: Optional[str] = None) -> bool:
+        """act 를 주면 _decide 대신 그 행동을 실행 (rollout 의 첫 행동 등)"""
+        m = self.metrics
+        if m is not None:
+            m.inc("steps"); t0 = perf_counter()
         self.performance -= 1
         p = self.world.get_percept(self.x, self.y)
+        if m is not None:
+            t1 = perf_counter(); m.add_time("percept", t1 - t0); t0 = t1
         self._update(p)
-        act = self._decide(p)
-
-        # 회전 루프 방지
-        if act in ("TurnLeft", "TurnRight"):
-            self.spin_count += 1
-            if self.spin_count >= 4:
+        if m is not None:
+            t1 = perf_counter(); m.add_time("update", t1 - t0); t0 = t1
+        if act is None:
+            act = self._decide(p)
+
+            # 회전 루프 방지
+            if act in ("TurnLeft", "TurnRight"):
+                self.spin_count += 1
+                if self.spin_count >= 4:
+                    self.spin_count = 0
+                    ax, ay = self.x + self.dir.dx, self.y + self.dir.dy
+                    act = "TurnRight" if self.world.is_wall(ax, ay) else "Forward"
+                    if m is not None:
+                        m.inc("spin_override")
+            else:
                 self.spin_count = 0
-                ax, ay = self.x + self.dir.dx, self.y + self.dir.dy
-                act = "TurnRight" if self.world.grid[ay][ax] == "W" else "Forward"
-        else:
-            self.spin_count = 0
+        elif act == "Shoot":
+            self.pending_shot = self.dir
+        if m is not None:
+            t1 = perf_counter(); m.add_time("decide", t1 - t0); t0 = t1
 
         # ── 실제 행동 실행 ────────────────────────────────────
         if act == "Forward":
-            if not self.returning:
-                self.visit_act.append("F")
-            self.prev_dir = self.dir.right().right()
+            self.prev_dir = self.dir.back()
             nx, ny, newp = self.world.forward(self.x, self.y, self.dir)
             ahead = (self.x + self.dir.dx, self.y + self.dir.dy)
             if newp.bump:
                 self.definite_obstacle.add(ahead)
+                if m is not None:
+                    m.inc("bump")
             else:
                 self.x, self.y = nx, ny
             p |= newp
 
         elif act == "TurnLeft":
-            if not self.returning:
-                self.visit_act.append("L")
             self.dir = self.dir.left()
 
         elif act == "TurnRight":
-            if not self.returning:
-                self.visit_act.append("R")
             self.dir = self.dir.right()
 
         elif act == "Grab":
             self.has_gold = True
             self.returning = True
-            self.forced_turns = 2
-            self.pop_idx = len(self.visit_act) - 1
-            self.world.tile_state[self.y][self.x]["gold"] = False
+            self.world.take_gold(self.x, self.y)
 
         elif act == "Shoot" and self.pending_shot:
             d = self.pending_shot
             self.pending_shot = None
             self.arrows -= 1
-            p.scream = self.world.shoot(self.x, self.y, d)
+            if self.world.shoot(self.x, self.y, d):
+                p |= Percept.SCREAM
+                self.stench.clear()             # 남은 stench 의 출처를 알 수 없음
+                self.kb.scream(); self._sync_kb()
 
             # ──────────────────────────────────────────────
             #  명중 시 → 다음 턴 전진
             #  빗나감 시 → 시퀀스 사격이면 turn_after_shoot 생략
             # ──────────────────────────────────────────────
+            if m is not None:
+                m.inc("shots"); m.inc("shot_hit" if p.scream else "shot_miss")
+                m.inc(f"shot_seq{SHOT_NO.get(self.shoot_stage, 0)}")
             if p.scream:
                 self.force_forward = True
             else:
@@ -278,7 +393,10 @@ class Agent:
         elif act == "Climb":
             if self.has_gold:
                 self.performance += 1000
-            self._log(step, act, p)
+            if m is not None:
+                m.inc("climb"); m.add_time("exec", perf_counter() - t0)
+            if self.trace is not None:
+                self._log(step, act, p)
             return False
 
         # 사망 판정
@@ -286,17 +404,27 @@ class Agent:
                 self.world.tile_has_live_wumpus(self.x, self.y))
         if dead:
             self.performance -= 30
-            self.visit_act.clear(); self.returning = False
-            self.pop_idx = -1; self.shoot_stage = 0; self.forced_turns = 0
+            self.returning = False; self.shoot_stage = 0
+            i = self.board.id(self.x, self.y)
             if self.world.tile_has_pit(self.x, self.y):
-                self.definite_pit.add((self.x, self.y))
+                self.kb.fact(i, pit=True)
+                if m is not None:
+                    m.inc("death_pit")
             if self.world.tile_has_live_wumpus(self.x, self.y):
-                self.definite_wumpus.add((self.x, self.y))
+                self.kb.fact(i, wumpus=True)
+                if m is not None:
+                    m.inc("death_wumpus")
             self.safe.discard((self.x, self.y))
+            self._sync_kb()
+        if m is not None:
+            t1 = perf_counter(); m.add_time("exec", t1 - t0); t0 = t1
 
         # 로그
-        self._log(step, act if not dead else act + "(DEAD)", p)
+        if self.trace is not None:
+            self._log(step, act, p, dead)
         self.prev = (self.x, self.y)
+        if m is not None:
+            m.add_time("log", perf_counter() - t0)
         return not dead
 
     # ──────────────────────────────────────────────────────────
@@ -304,16 +432,15 @@ class Agent:
     # ──────────────────────────────────────────────────────────
     def reset_position(self):
         self.x, self.y, self.dir = 1, 1, Dir.E
-        self.arrows = 3; self.has_gold = False; self.performance = 0
+        self.arrows = self.start_arrows; self.has_gold = False; self.performance = 0
         self.returning = False; self.pending_shot = None
         self.turn_after_shoot = False; self.force_forward = False
-        self.forced_turns = 0; self.shoot_stage = 0
+        self.shoot_stage = 0
         self.prev = (1, 1); self.prev_dir = None; self.spin_count = 0
-        self.visit_act.clear(); self.pop_idx = -1
 
-    def print_history(self):
+    def print_history(self, history: Optional[List[dict]] = None):
         print("\n===== Trace =====")
-        for h in self.history:
+        for h in self.history if history is None else history:
             print(f"{h['step']:03d} | {h['act']:<14} | Pos{h['pos']} | "
                   f"Dir {h['dir']:<2} | {h['percept']}")
         print("================================================")
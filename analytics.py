@@ -0,0 +1,361 @@
+"""
+analytics.py
+────────────────────────────────────────────────────────────────────────────
+• 대량 실행 trace 열 지향(columnar) 분석
+  - main --trace-dir 로 저장한 시드별 binary trace(<seed>.wtr)를 필드별 연속 배열(열)로 이어 붙임
+    · 고정 폭 RECORD 에서 확장 슬라이스 body[k::RECORD.size] 로 열을 바로 뽑음
+      (레코드 단위 파이썬 루프 없음)
+    · step = uint32, x / y = uint16 (리틀 엔디언 원시 바이트 → memoryview 형 변환),
+      행동 코드 / 방향 / percept = bytes, 시드 j 의 행 = [offsets[j], offsets[j+1])
+  - save(dir) / Columns.open(dir) : 열별 원시 파일 + meta.json, 다시 열 때는 mmap (재파싱 없음)
+  - 집계는 C 수준 연산으로
+    · bytes.translate : 행동 코드 / percept 비트 → 0/1 마스크
+    · 큰 정수 AND     : 마스크 교집합
+    · compress + Counter : 칸별 / 코드별 group-by 합계, bytes.count / find : 시드 구간 합 · 검색
+  - 결과 : 칸별 heatmap (사망 / 회전 / 낭비 회전 / 빗나간 사격 시퀀스 / 방문),
+    행동 히스토그램 (성공 · 실패 시드), 사격 시퀀스 명중률, 성공 · 실패별 스텝 수 분포, 시드별 요약
+    → main.print_world_debug 와 같은 텍스트 격자로 출력
+  - 성공 여부 / 스텝 수 : results jsonl(main --jsonl) 을 join 하면 그 값,
+    없으면 trace 에서 추정 (마지막 사망 뒤 반짝이는 칸에서 Grab, (1,1) 에서 끝남;
+    헤더의 on_stuck 이 stop / recover 이고 한도 전에 실패로 끝났으면 순환 감지 → 스텝 수는 한도
+    (Episode.record 와 같음), 헤더에 한도가 없는 v1 trace 는 기록된 스텝까지만)
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterable, List, Optional
+import glob
+import json
+import mmap
+import os
+import re
+import sys
+
+from setting import ACTIONS, ACT_CODE, Percept
+from tracelog import DEAD, RECORD, read_header
+
+FORWARD, TURN_LEFT, TURN_RIGHT, GRAB, SHOOT, CLIMB = (ACT_CODE[a] for a in ACTIONS)
+
+# (열 이름, RECORD 안 바이트 위치, 형 코드) — tracelog.RECORD "<IBHHBB" 와 같은 배치
+FIELDS = (("step", 0, "I"), ("act", 4, "B"), ("x", 5, "H"), ("y", 7, "H"),
+          ("dir", 9, "B"), ("percept", 10, "B"))
+WIDTH = {"B": 1, "H": 2, "I": 4}
+
+
+def _table(pred) -> bytes:
+    """바이트 값 → 0/1 변환표 (bytes.translate 용)"""
+    return bytes(1 if pred(b) else 0 for b in range(256))
+
+
+PLAIN = bytes(b & ~DEAD for b in range(256))            # 행동 코드에서 DEAD 비트 제거
+DEAD_T = _table(lambda b: b & DEAD)
+TURN_T = _table(lambda b: b in (TURN_LEFT, TURN_RIGHT))
+SHOOT_T = _table(lambda b: b == SHOOT)
+GRAB_T = _table(lambda b: b == GRAB)
+SCREAM_T = _table(lambda b: b & Percept.SCREAM)
+GLITTER_T = _table(lambda b: b & Percept.GLITTER)
+TURNS = bytes((TURN_LEFT, TURN_RIGHT))
+
+
+def _and(a: bytes, b: bytes) -> bytes:
+    """0/1 마스크 교집합 (정수 AND 한 번)"""
+    return (int.from_bytes(a, "little") & int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def _column(body: bytes, off: int, code: str) -> bytes:
+    """레코드 묶음 body 에서 한 필드의 원시 바이트 열 (리틀 엔디언)"""
+    w, r = WIDTH[code], RECORD.size
+    if w == 1:
+        return body[off::r]
+    out = bytearray(len(body) // r * w)
+    for k in range(w):
+        out[k::w] = body[off + k::r]
+    return bytes(out)
+
+
+def _typed(raw, code: str):
+    """원시 바이트 열 → 정수 시퀀스 (리틀 엔디언 기계에서는 복사 없는 memoryview)"""
+    if code == "B":
+        return bytes(raw)
+    if sys.byteorder == "little":
+        return memoryview(raw).cast(code)
+    a = array(code, bytes(raw))
+    a.byteswap()
+    return a
+
+
+# ──────────────────────────────────────────────────────────────────────────
+class Columns:
+    """trace 열 묶음 (행 = 레코드 하나)"""
+
+    def __init__(self, size: int, seeds: List[int], offsets: List[int], raw: Dict[str, object],
+                 limits: Optional[List[int]] = None):
+        self.size = size
+        self.seeds = seeds                      # 시드 (헤더에 없으면 -1)
+        self.offsets = offsets                  # 길이 len(seeds)+1
+        self.limits = limits or [0] * len(seeds)    # 순환 감지 실행의 스텝 한도 (off / v1 은 0)
+        self.raw = raw                          # 열 이름 → 원시 바이트 (save 용)
+        self.step, self.x, self.y = (_typed(raw[k], c) for k, _, c in FIELDS if c != "B")
+        self.code = bytes(raw["act"])           # DEAD 비트 포함
+        self.act = self.code.translate(PLAIN)
+        self.dead = self.code.translate(DEAD_T)
+        self.dir = bytes(raw["dir"])
+        self.percept = bytes(raw["percept"])
+        self.got = _and(self.act.translate(GRAB_T), self.percept.translate(GLITTER_T))   # 반짝이는 칸에서 Grab
+        self.results: Dict[int, dict] = {}      # join() 한 시드별 실행 기록
+        self._outcomes: Optional[List[dict]] = None
+
+    def __len__(self) -> int:
+        return len(self.act)
+
+    # ── 읽기 / 저장 ──────────────────────────────────────────
+    @classmethod
+    def load(cls, paths: Iterable[str]) -> "Columns":
+        """binary trace 파일들 → 열 (모두 같은 size 여야 함)"""
+        cols = {k: bytearray() for k, _, _ in FIELDS}
+        seeds, offsets, limits, size, n = [], [0], [], None, 0
+        for path in paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            head, start = read_header(data, path)
+            sz = head["size"]
+            if size is None:
+                size = sz
+            elif sz != size:
+                raise ValueError(f"{path}: size {sz} ≠ {size}")
+            body = data[start:]
+            body = body[:len(body) - len(body) % RECORD.size]
+            for k, off, code in FIELDS:
+                cols[k] += _column(body, off, code)
+            n += len(body) // RECORD.size
+            seeds.append(-1 if head["seed"] is None else head["seed"])
+            offsets.append(n)
+            limits.append((head["limit"] or 0) if head["on_stuck"] != "off" else 0)
+        return cls(size or 4, seeds, offsets, cols, limits)
+
+    @classmethod
+    def from_dir(cls, trace_dir: str) -> "Columns":
+        """<trace_dir>/*.wtr 를 시드(파일 이름) 순으로"""
+        def key(p):
+            stem = os.path.splitext(os.path.basename(p))[0]
+            return (0, int(stem), "") if stem.isdigit() else (1, 0, stem)
+        paths = sorted(glob.glob(os.path.join(trace_dir, "*.wtr")), key=key)
+        if not paths:
+            raise ValueError(f"{trace_dir}: *.wtr 파일이 없음")
+        return cls.load(paths)
+
+    def save(self, path: str):
+        """열별 원시 파일(<열>.col) + meta.json"""
+        os.makedirs(path, exist_ok=True)
+        for k, _, _ in FIELDS:
+            with open(os.path.join(path, f"{k}.col"), "wb") as f:
+                f.write(self.raw[k])
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(dict(size=self.size, rows=len(self), seeds=self.seeds,
+                           offsets=self.offsets, limits=self.limits), f)
+
+    @classmethod
+    def open(cls, path: str) -> "Columns":
+        """save 한 폴더를 mmap 으로 (x / y / step 은 파일을 직접 가리키는 memoryview)"""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        raw = {}
+        for k, _, _ in FIELDS:
+            with open(os.path.join(path, f"{k}.col"), "rb") as f:
+                raw[k] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if meta["rows"] else b""
+        return cls(meta["size"], meta["seeds"], meta["offsets"], raw, meta.get("limits"))
+
+    def join(self, records: Iterable[dict]) -> "Columns":
+        """시드별 실행 기록(tournament / main --jsonl 형식)으로 성공 여부 · 스텝 수를 덮어씀"""
+        self.results.update((r["seed"], r) for r in records)
+        self._outcomes = None
+        return self
+
+    # ── 시드 단위 ────────────────────────────────────────────
+    def _infer(self, j: int) -> dict:
+        a, b = self.offsets[j], self.offsets[j + 1]
+        if a == b:
+            return dict(success=False, steps=0)
+        last_death = self.dead.rfind(1, a, b)
+        got = self.got.find(1, last_death + 1 if last_death >= 0 else a, b) >= 0
+        end_ok = (self.x[b - 1], self.y[b - 1]) == (1, 1) and not self.dead[b - 1] \
+            and self.act[b - 1] != CLIMB
+        success = got and end_ok
+        steps = b - a if success else max(b - a, self.limits[j])      # 순환 감지로 끝남 → 한도까지
+        return dict(success=success, steps=steps)
+
+    def outcomes(self) -> List[dict]:
+        """시드 순서대로 {success, steps} (join 한 기록 우선)"""
+        if self._outcomes is None:
+            self._outcomes = [self.results.get(s) or self._infer(j)
+                              for j, s in enumerate(self.seeds)]
+        return self._outcomes
+
+    def rows(self, success: bool) -> bytes:
+        """성공(또는 실패) 시드에 속한 행 마스크"""
+        out = bytearray(len(self))
+        for j, o in enumerate(self.outcomes()):
+            if bool(o["success"]) == success:
+                a, b = self.offsets[j], self.offsets[j + 1]
+                out[a:b] = b"\x01" * (b - a)
+        return bytes(out)
+
+    def _seed_of(self, i: int) -> int:
+        return bisect_right(self.offsets, i) - 1
+
+    # ── 집계 ─────────────────────────────────────────────────
+    def heatmap(self, mask: Optional[bytes] = None) -> Counter:
+        """칸 (x, y) → mask 가 켜진 행 수 (mask 없으면 전체 = 방문 heatmap)"""
+        cells = zip(self.x, self.y)
+        return Counter(compress(cells, mask) if mask is not None else cells)
+
+    def deaths(self) -> Counter:
+        return self.heatmap(self.dead)
+
+    def turns(self) -> Counter:
+        return self.heatmap(self.act.translate(TURN_T))
+
+    def wasted_turns(self) -> Counter:
+        """한 칸에서 연속 회전 중 최소 회전 수(순 회전량 기준)를 넘는 만큼, 그 칸에 합산"""
+        out: Counter = Counter()
+        act, offsets = self.act, self.offsets
+        runs = re.compile(rb"[%c%c]{2,}" % (TURN_LEFT, TURN_RIGHT))
+        for j in range(len(self.seeds)):        # 시드 구간마다 따로 → 연속 회전이 에피소드를 넘지 않음
+            for m in runs.finditer(act, offsets[j], offsets[j + 1]):
+                a, b = m.span()
+                right = act.count(TURN_RIGHT, a, b)
+                net = (2 * right - (b - a)) % 4
+                waste = (b - a) - min(net, 4 - net)
+                if waste:
+                    out[self.x[a], self.y[a]] += waste
+        return out
+
+    def actions(self, mask: Optional[bytes] = None) -> Dict[str, int]:
+        """행동 이름 → 횟수 (mask 가 켜진 행만)"""
+        c = Counter(compress(self.act, mask) if mask is not None else self.act)
+        return {name: c[k] for k, name in enumerate(ACTIONS)}
+
+    def shot_sequences(self) -> dict:
+        """사격 시퀀스 = 같은 시드에서 회전만 사이에 둔 연속 사격 (stench 3-회 사격 등).
+        → 시퀀스 수 / 빗나간 시퀀스 수 / n 번째 사격별 명중 · 시도 / 빗나간 시퀀스 칸"""
+        act, shots = self.act, self.act.translate(SHOOT_T)
+        scream = self.percept.translate(SCREAM_T)
+        seqs = missed = 0
+        by_no: Counter = Counter()
+        hit_no: Counter = Counter()
+        miss_cells: Counter = Counter()
+        prev, no, hit, cell = -1, 0, False, None
+        i = shots.find(1)
+        while i >= 0:
+            same = (prev >= 0 and self._seed_of(prev) == self._seed_of(i)
+                    and not act[prev + 1:i].translate(None, TURNS))
+            if not same:
+                if prev >= 0 and not hit:
+                    missed += 1; miss_cells[cell] += 1
+                seqs += 1; no, hit, cell = 0, False, (self.x[i], self.y[i])
+            no += 1
+            by_no[no] += 1
+            if scream[i]:
+                hit = True; hit_no[no] += 1
+            prev = i
+            i = shots.find(1, i + 1)
+        if prev >= 0 and not hit:
+            missed += 1; miss_cells[cell] += 1
+        return dict(sequences=seqs, missed=missed, shots=sum(by_no.values()),
+                    hits=sum(hit_no.values()), by_no=dict(sorted(by_no.items())),
+                    hits_by_no=dict(sorted(hit_no.items())), miss_cells=miss_cells)
+
+    def step_distribution(self, width: int = 10) -> Dict[bool, Counter]:
+        """성공 여부 → {구간 시작 스텝: 시드 수}"""
+        out: Dict[bool, Counter] = {True: Counter(), False: Counter()}
+        for o in self.outcomes():
+            out[bool(o["success"])][o["steps"] // width * width] += 1
+        return out
+
+    def seed_summary(self) -> List[dict]:
+        """시드별 요약 (행동 수 · 사망 · 회전 · 사격 · 명중, 성공 여부 / 스텝 수)"""
+        shots = self.act.translate(SHOOT_T)
+        hits = _and(shots, self.percept.translate(SCREAM_T))
+        turns = self.act.translate(TURN_T)
+        out = []
+        for j, (s, o) in enumerate(zip(self.seeds, self.outcomes())):
+            a, b = self.offsets[j], self.offsets[j + 1]
+            out.append(dict(seed=s, success=bool(o["success"]), steps=o["steps"], records=b - a,
+                            deaths=self.dead.count(1, a, b), turns=turns.count(1, a, b),
+                            shots=shots.count(1, a, b), hits=hits.count(1, a, b)))
+        return out
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  텍스트 출력 (main.print_world_debug 형식)
+# ──────────────────────────────────────────────────────────────────────────
+def render(counts: Counter, size: int, title: str) -> str:
+    w = max(len(str(size)), len(str(max(counts.values(), default=0))))
+    lw = len(str(size))
+    lines = [f"\n📍 {title} " + "-" * max(4, 36 - len(title))]
+    for y in range(size, 0, -1):
+        row = [str(counts.get((x, y), 0) or ".") for x in range(1, size + 1)]
+        lines.append(f"{y:>{lw}} | " + " ".join(c.rjust(w) for c in row))
+    lines.append(" " * (lw + 3) + " ".join(str(x).rjust(w) for x in range(1, size + 1)))
+    lines.append(f"합계: {sum(counts.values())}")
+    return "\n".join(lines)
+
+
+def render_histogram(hist: Dict, title: str, width: int = 40) -> str:
+    top = max(hist.values(), default=0) or 1
+    kw = max((len(str(k)) for k in hist), default=1)
+    lines = [f"\n{title}"]
+    for k, v in hist.items():
+        lines.append(f"  {str(k):>{kw}} {v:>8} " + "#" * round(v / top * width))
+    return "\n".join(lines)
+
+
+def report(cols: Columns, width: int = 10) -> str:
+    out = [f"시드 {len(cols.seeds)} 개, 기록 {len(cols)} 건, size {cols.size}"]
+    n = cols.size
+    out.append(render(cols.deaths(), n, "사망 칸"))
+    out.append(render(cols.turns(), n, "회전 칸"))
+    out.append(render(cols.wasted_turns(), n, "낭비 회전 칸"))
+    shots = cols.shot_sequences()
+    out.append(render(shots["miss_cells"], n, "빗나간 사격 시퀀스 칸"))
+    seqs = shots["sequences"] or 1
+    out.append(f"\n사격 시퀀스 {shots['sequences']} 개 중 빗나감 {shots['missed']} "
+               f"({shots['missed'] / seqs:.1%}), 사격 {shots['shots']} / 명중 {shots['hits']}")
+    for k, v in shots["by_no"].items():
+        out.append(f"  {k} 번째 사격 : {shots['hits_by_no'].get(k, 0)} / {v} 명중")
+    for ok in (True, False):
+        rows = cols.rows(ok)
+        out.append(render_histogram(cols.actions(rows), f"행동 ({'성공' if ok else '실패'} 시드)"))
+    dist = cols.step_distribution(width)
+    for ok in (True, False):
+        d = dist[ok]
+        hist = {f"{k}-{k + width - 1}": d[k] for k in sorted(d)}
+        out.append(render_histogram(hist, f"스텝 수 분포 ({'성공' if ok else '실패'} {sum(d.values())} 시드)"))
+    return "\n".join(out)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="trace 열 지향 분석 (heatmap / 행동 히스토그램 / 사격 / 스텝 분포)")
+    ap.add_argument("source", help="binary trace 폴더 (*.wtr) 또는 --save 로 만든 열 폴더 (meta.json)")
+    ap.add_argument("--results", help="main --jsonl 시드별 기록 (성공 여부 · 스텝 수)")
+    ap.add_argument("--save", help="열 폴더로 저장 (다음부터 source 로 mmap)")
+    ap.add_argument("--seeds-out", help="시드별 요약 jsonl 저장 경로")
+    ap.add_argument("--bin", type=int, default=10, help="스텝 수 분포 구간 폭")
+    args = ap.parse_args()
+    is_cols = os.path.exists(os.path.join(args.source, "meta.json"))
+    cols = Columns.open(args.source) if is_cols else Columns.from_dir(args.source)
+    if args.results:
+        with open(args.results) as f:
+            cols.join(json.loads(line) for line in f if line.strip())
+    if args.save:
+        cols.save(args.save)
+    print(report(cols, args.bin))
+    if args.seeds_out:
+        with open(args.seeds_out, "w") as f:
+            for rec in cols.seed_summary():
+                f.write(json.dumps(rec) + "\n")
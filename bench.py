@@ -0,0 +1,400 @@
+"""
+bench.py
+────────────────────────────────────────────────────────────────────────────
+• 성능 벤치마크
+  - suite   : 고정 시드 집합 × 격자 크기별 측정 → JSON
+    · world_ctor        World() 생성 속도
+    · world_batch       worldgen.generate(seeds).worlds() 일괄 생성 속도 (world_ctor 보다 빨라야 함)
+    · percept / forward / shoot   World 연산 처리량
+    · step_update / step_decide / step_exec   Agent.step 구간별 지연 (_update / _decide / 행동 실행)
+    · best_unknown / nearest_safe 목표 선택 비용 (에피소드 중 실제 상태에서)
+    · episodes          에피소드 처리량 (trace off)
+    각 항목은 한 번 예열(버림)한 뒤 repeat 번 재서 가장 좋은 값 사용. 한 번 재는 시간이
+    min_time 보다 짧으면 그만큼 여러 번 돌려 평균 (짧은 측정의 타이머 / 스케줄링 잡음 제거),
+    noise = (하위 사분위 - 최솟값) / 최솟값 도 함께 기록
+  - merge   : 따로 돌린 suite 결과 여러 개 → 기준선 (항목별 최고값, spread = 실행 간 차이)
+    같은 기계에서도 프로세스마다 속도가 달라 기준선은 여러 번 돌려 만듦
+  - compare : 결과 JSON 을 기준선(baseline)과 비교해 threshold 이상 나빠진 항목 표시
+    (나빠진 항목이 있으면 종료 코드 1). 나빠진 정도는 비율로 — 처리량은 기준선/새값 - 1,
+    지연은 새값/기준선 - 1 (처리량이 절반이면 지연이 두 배인 것과 같은 +100%)
+    항목별 판정 비율은 threshold 와 기준선의 NOISE_K × noise, SPREAD_K × spread 중 큰 값
+    → 잡음이 큰 항목은 그만큼 너그럽게, 단 잡음 여유는 MAX_SLACK 까지
+    · suite --baseline 은 REGRESSION 이 나온 크기만 새 프로세스에서 confirm 번까지 다시 재서
+      항목별 최고값으로 다시 비교 (한 프로세스만 느리게 도는 경우를 걸러냄)
+  - risk    : unknown 목표 선택 방식(heuristic / exact) 비교 — 성공률 / 사망률 / 스텝당 시간
+  - `python bench.py suite --out bench.json --baseline bench_baseline.json`
+  - 기준선 갱신 : suite --out 을 3 번 → `python bench.py merge r1.json r2.json r3.json --out bench_baseline.json`
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from math import ceil
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from setting import World, Dir
+from agent import Agent
+from episode import Episode
+from worldgen import generate
+
+MODES = ("heuristic", "exact")
+SIZES = (4, 8, 16)
+SEEDS = range(200)
+MIN_TIME = 0.02                                 # 초, 측정 한 번의 최소 시간
+BUDGET = 0.5                                    # 초, 항목별 측정 시간 (repeat 번은 넘어도 채움)
+NOISE_K = 3.0
+SPREAD_K = 1.5
+MAX_SLACK = 0.25                                # 잡음 / 편차로 늘려주는 판정 비율의 상한
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  측정 유틸
+# ──────────────────────────────────────────────────────────────────────────
+def _best(fn: Callable[[], float], repeat: int, min_time: float = MIN_TIME,
+          budget: float = BUDGET) -> Tuple[float, float]:
+    """fn() 이 돌려준 소요 시간의 (최솟값, noise). 첫 호출은 예열 겸 반복 횟수 보정 (버림),
+    측정 한 번 = min_time 을 넘기도록 fn 을 loops 번 돌린 평균 (timeit 처럼 측정 중 GC 끔).
+    repeat 번 이상, 모두 합쳐 budget 초가 될 때까지 (최대 100 번) 재서 최솟값이 안정되게"""
+    loops = max(1, ceil(min_time / max(fn(), 1e-9)))
+    out: List[float] = []
+    end = time.perf_counter() + budget
+    while len(out) < max(1, repeat) or (time.perf_counter() < end and len(out) < 100):
+        gc.collect(); gc.disable()
+        try:
+            out.append(sum(fn() for _ in range(loops)) / loops)
+        finally:
+            gc.enable()
+    return min(out), _noise(out)
+
+
+def _noise(samples: List[float]) -> float:
+    """최솟값 근처의 흩어짐 : (하위 사분위 - 최솟값) / 최솟값"""
+    s = sorted(samples)
+    return (s[len(s) // 4] - s[0]) / s[0] if s[0] > 0 else 0.0
+
+
+def _rate(n: int, dt: float) -> float:
+    return n / dt if dt > 0 else float("inf")
+
+
+def _entry(value: float, unit: str, higher: bool, noise: float = 0.0) -> dict:
+    return dict(value=round(value, 3), unit=unit, higher_is_better=higher, noise=round(noise, 4))
+
+
+def _rate_entry(n: int, best: Tuple[float, float], unit: str) -> dict:
+    """(최소 시간, noise) → 처리량 항목"""
+    return _entry(_rate(n, best[0]), unit, True, best[1])
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  World
+# ──────────────────────────────────────────────────────────────────────────
+def bench_world(size: int, seeds: List[int], repeat: int, min_time: float = MIN_TIME) -> Dict[str, dict]:
+    def ctor():
+        t = time.perf_counter()
+        for s in seeds:
+            World(s, size)
+        return time.perf_counter() - t
+
+    def batch():
+        t = time.perf_counter()
+        for _ in generate(seeds, size).worlds():
+            pass
+        return time.perf_counter() - t
+
+    worlds = [World(s, size) for s in seeds]
+    cells = [(x, y) for x in range(1, size + 1) for y in range(1, size + 1)]
+    dirs = list(Dir)
+
+    def percept():
+        t = time.perf_counter()
+        for w in worlds:
+            get = w.get_percept
+            for x, y in cells:
+                get(x, y)
+        return time.perf_counter() - t
+
+    def forward():
+        t = time.perf_counter()
+        for w in worlds:
+            fwd = w.forward
+            for x, y in cells:
+                for d in dirs:
+                    fwd(x, y, d)
+        return time.perf_counter() - t
+
+    snaps = [w.snapshot() for w in worlds]
+
+    def shoot():
+        dt = 0.0
+        for w, snap in zip(worlds, snaps):
+            t = time.perf_counter()
+            sh = w.shoot
+            for x, y in cells:
+                for d in dirs:
+                    sh(x, y, d)
+            dt += time.perf_counter() - t
+            w.restore(snap)                     # 죽은 wumpus 되살리기 (시간 제외)
+        return dt
+
+    n_ops = len(worlds) * len(cells)
+    return {
+        "world_ctor": _rate_entry(len(seeds), _best(ctor, repeat, min_time), "worlds/s"),
+        "world_batch": _rate_entry(len(seeds), _best(batch, repeat, min_time), "worlds/s"),
+        "percept": _rate_entry(n_ops, _best(percept, repeat, min_time), "ops/s"),
+        "forward": _rate_entry(n_ops * 4, _best(forward, repeat, min_time), "ops/s"),
+        "shoot": _rate_entry(n_ops * 4, _best(shoot, repeat, min_time), "ops/s"),
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  Agent
+# ──────────────────────────────────────────────────────────────────────────
+def _timed(agent: Agent, name: str, acc: Dict[str, float]):
+    """agent.name 을 소요 시간을 acc[name] 에 더하는 래퍼로 교체 (인스턴스 속성)"""
+    fn = getattr(agent, name)
+
+    def wrapper(*a):
+        t = time.perf_counter()
+        r = fn(*a)
+        acc[name] += time.perf_counter() - t
+        return r
+    setattr(agent, name, wrapper)
+
+
+def bench_agent(size: int, seeds: List[int], limit: int, repeat: int,
+                min_time: float = MIN_TIME) -> Dict[str, dict]:
+    worlds = list(generate(seeds, size).worlds())
+
+    def episodes():
+        t = time.perf_counter()
+        for w in worlds:
+            Episode.from_world(w.fork(), limit, "off").run()
+        return time.perf_counter() - t
+
+    # 구간별 지연 : _update / _decide 를 감싸고 나머지를 행동 실행으로 (첫 회는 예열로 버림)
+    samples: Dict[str, List[float]] = {}
+    for rep in range(max(1, repeat) + 1):
+        acc = dict(_update=0.0, _decide=0.0, step=0.0, best_unknown=0.0, nearest_safe=0.0)
+        steps = calls = 0
+        gc.collect(); gc.disable()
+        for w in worlds:
+            ep = Episode.from_world(w.fork(), limit, "off")
+            ag = ep.agent
+            _timed(ag, "_update", acc)
+            _timed(ag, "_decide", acc)
+            while not ep.done:
+                t = time.perf_counter()
+                ep.advance()
+                acc["step"] += time.perf_counter() - t
+                steps += 1
+                # 목표 선택 비용 : 지금 상태에서 따로 호출 (메모 없이 처음 계산하도록 버전 올림)
+                ag.frontier.version += 1
+                t = time.perf_counter(); ag._nearest_safe()
+                acc["nearest_safe"] += time.perf_counter() - t
+                t = time.perf_counter(); ag._best_unknown()
+                acc["best_unknown"] += time.perf_counter() - t
+                calls += 1
+        gc.enable()
+        cur = dict(step_update=acc["_update"] / steps, step_decide=acc["_decide"] / steps,
+                   step_exec=(acc["step"] - acc["_update"] - acc["_decide"]) / steps,
+                   best_unknown=acc["best_unknown"] / calls,
+                   nearest_safe=acc["nearest_safe"] / calls)
+        if rep:
+            for k, v in cur.items():
+                samples.setdefault(k, []).append(v)
+
+    out = {"episodes": _rate_entry(len(worlds), _best(episodes, repeat, min_time), "episodes/s")}
+    for k, v in samples.items():
+        out[k] = _entry(min(v) * 1e6, "us", False, _noise(v))
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  suite / compare
+# ──────────────────────────────────────────────────────────────────────────
+def suite(sizes: Iterable[int] = SIZES, seeds: Iterable[int] = SEEDS,
+          limit: int = 120, repeat: int = 5, min_time: float = MIN_TIME) -> dict:
+    seeds = list(seeds)
+    results: Dict[str, dict] = {}
+    for n in sizes:
+        for k, v in {**bench_world(n, seeds, repeat, min_time),
+                     **bench_agent(n, seeds, limit, repeat, min_time)}.items():
+            results[f"{k}/{n}"] = v
+    meta = dict(python=platform.python_version(), machine=platform.machine(),
+                processor=platform.processor(), sizes=list(sizes),
+                seeds=f"{seeds[0]}-{seeds[-1]}" if seeds else "", n_seeds=len(seeds),
+                limit=limit, repeat=repeat, min_time=min_time,
+                time=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    return dict(meta=meta, results=results)
+
+
+def compare(new: dict, base: dict, threshold: float = 0.10, noise_k: float = NOISE_K) -> List[dict]:
+    """항목별 변화율. 나빠진 비율이 max(threshold, min(MAX_SLACK, 기준선 잡음 여유)) 를 넘으면 regression=True.
+    판정 비율은 기준선 값만으로 정함 (새 결과가 시끄럽다고 기준이 느슨해지지 않음)"""
+    rows = []
+    for key, cur in new["results"].items():
+        ref = base["results"].get(key)
+        if ref is None or not ref["value"]:
+            continue
+        change = cur["value"] / ref["value"] - 1
+        if cur["higher_is_better"]:
+            worse = ref["value"] / cur["value"] - 1 if cur["value"] else float("inf")
+        else:
+            worse = change
+        slack = max(noise_k * ref.get("noise", 0.0), SPREAD_K * ref.get("spread", 0.0))
+        limit = max(threshold, min(MAX_SLACK, slack))
+        rows.append(dict(key=key, unit=cur["unit"], base=ref["value"], new=cur["value"],
+                         change=round(change, 4), threshold=round(limit, 4), regression=worse > limit))
+    return rows
+
+
+def merge(runs: List[dict]) -> dict:
+    """suite 결과 여러 개 → 항목별 최고값 + spread (최악 실행이 최고값보다 나쁜 비율)"""
+    results: Dict[str, dict] = {}
+    for key, first in runs[0]["results"].items():
+        entries = [r["results"][key] for r in runs if key in r["results"]]
+        values = [e["value"] for e in entries]
+        best, worst = (max(values), min(values)) if first["higher_is_better"] else (min(values), max(values))
+        spread = (1 - worst / best if first["higher_is_better"] else worst / best - 1) if best else 0.0
+        results[key] = dict(first, value=best, noise=max(e.get("noise", 0.0) for e in entries),
+                            spread=round(spread, 4))
+    return dict(meta=dict(runs[0]["meta"], runs=len(runs)), results=results)
+
+
+def confirm(res: dict, base: dict, threshold: float = 0.10, tries: int = 2) -> dict:
+    """REGRESSION 항목이 있는 격자 크기만 새 프로세스에서 다시 suite → 항목별 최고값 결과"""
+    meta = res["meta"]
+    for _ in range(tries):
+        sizes = sorted({int(r["key"].rsplit("/", 1)[1]) for r in compare(res, base, threshold)
+                        if r["regression"]})
+        if not sizes:
+            break
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "rerun.json")
+            subprocess.run([sys.executable, os.path.abspath(__file__), "suite",
+                            "--sizes", ",".join(map(str, sizes)), "--seeds", meta["seeds"],
+                            "--limit", str(meta["limit"]), "--repeat", str(meta["repeat"]),
+                            "--min-time", str(meta["min_time"]), "--out", out],
+                           check=True, stdout=subprocess.DEVNULL)
+            with open(out) as f:
+                rerun = json.load(f)
+        res = dict(merge([res, rerun]), meta=meta)
+    return res
+
+
+def print_compare(rows: List[dict]):
+    print(f"{'benchmark':<22} {'baseline':>12} {'current':>12} {'change':>8} {'limit':>6}")
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['key']:<22} {r['base']:>12.3f} {r['new']:>12.3f} {r['change']*100:>+7.1f}%"
+              f" {r['threshold']*100:>5.0f}%{flag}  ({r['unit']})")
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  risk : unknown 목표 선택 방식 비교
+# ──────────────────────────────────────────────────────────────────────────
+def bench_risk(seeds: Iterable[int], limit: int = 120, size: int = 4,
+               mode: str = "exact") -> dict:
+    """한 방식으로 seeds 를 실행 (월드 생성 시간 제외) → 집계"""
+    worlds = list(generate(list(seeds), size).worlds())
+    steps = deaths = succ = perf = 0
+    t0 = time.perf_counter()
+    for w in worlds:
+        ep = Episode.from_world(w, limit, "off", risk=mode).run()
+        steps += ep.step_no; deaths += ep.deaths
+        succ += ep.success; perf += ep.agent.performance
+    dt = time.perf_counter() - t0
+    n = len(worlds) or 1
+    return dict(mode=mode, size=size, episodes=len(worlds), successes=succ,
+                success_rate=round(succ / n, 4), deaths=deaths,
+                deaths_per_episode=round(deaths / n, 4),
+                mean_performance=round(perf / n, 4), steps=steps,
+                us_per_step=round(dt / max(1, steps) * 1e6, 2), seconds=round(dt, 3))
+
+
+def compare_risk(seeds: Iterable[int], limit: int = 120, size: int = 4,
+                 modes: Iterable[str] = MODES) -> List[dict]:
+    seeds = list(seeds)
+    return [bench_risk(seeds, limit, size, m) for m in modes]
+
+
+if __name__ == "__main__":
+    import argparse
+    from tournament import parse_seeds
+    ap = argparse.ArgumentParser(description="성능 벤치마크")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    s = sub.add_parser("suite", help="전체 측정 → JSON")
+    s.add_argument("--sizes", default=",".join(map(str, SIZES)), help="격자 크기 (쉼표 구분)")
+    s.add_argument("--seeds", default="0-199", help="시드 범위/목록")
+    s.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    s.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수 (최고값 사용)")
+    s.add_argument("--min-time", type=float, default=MIN_TIME, help="측정 한 번의 최소 시간(초)")
+    s.add_argument("--out", help="결과 JSON 저장 경로")
+    s.add_argument("--baseline", help="비교할 기준선 JSON")
+    s.add_argument("--threshold", type=float, default=0.10, help="regression 판정 비율")
+    s.add_argument("--confirm", type=int, default=2, help="REGRESSION 크기를 새 프로세스에서 다시 잴 횟수")
+
+    mg = sub.add_parser("merge", help="suite 결과 여러 개 → 기준선")
+    mg.add_argument("runs", nargs="+")
+    mg.add_argument("--out", required=True, help="기준선 JSON 저장 경로")
+
+    c = sub.add_parser("compare", help="결과 JSON 두 개 비교")
+    c.add_argument("current")
+    c.add_argument("baseline")
+    c.add_argument("--threshold", type=float, default=0.10, help="regression 판정 비율")
+
+    r = sub.add_parser("risk", help="unknown 목표 선택 방식 비교")
+    r.add_argument("--seeds", default="0-1999", help="시드 범위/목록 (예: 0-999,1234)")
+    r.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    r.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    r.add_argument("--modes", default=",".join(MODES), help="비교할 방식 (쉼표 구분)")
+
+    args = ap.parse_args()
+    if args.cmd == "risk":
+        rows = compare_risk(parse_seeds(args.seeds), args.limit, args.size, args.modes.split(","))
+        print(f"{'mode':<10} {'succ%':>7} {'deaths/ep':>10} {'perf':>9} {'us/step':>9}")
+        for row in rows:
+            print(f"{row['mode']:<10} {row['success_rate']*100:>6.2f}% {row['deaths_per_episode']:>10.4f} "
+                  f"{row['mean_performance']:>9.3f} {row['us_per_step']:>9.2f}")
+        sys.exit(0)
+
+    if args.cmd == "merge":
+        runs = []
+        for path in args.runs:
+            with open(path) as f:
+                runs.append(json.load(f))
+        with open(args.out, "w") as f:
+            json.dump(merge(runs), f, indent=1)
+        sys.exit(0)
+
+    if args.cmd == "suite":
+        res = suite([int(v) for v in args.sizes.split(",")], parse_seeds(args.seeds),
+                    args.limit, args.repeat, args.min_time)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(res, f, indent=1)
+        base_path: Optional[str] = args.baseline
+        if not base_path:
+            for k, v in res["results"].items():
+                print(f"{k:<22} {v['value']:>12.3f}  {v['unit']}")
+            sys.exit(0)
+        with open(base_path) as f:
+            res = confirm(res, json.load(f), args.threshold, args.confirm)
+    else:
+        with open(args.current) as f:
+            res = json.load(f)
+        base_path = args.baseline
+    with open(base_path) as f:
+        base = json.load(f)
+    rows = compare(res, base, args.threshold)
+    print_compare(rows)
+    sys.exit(1 if any(r["regression"] for r in rows) else 0)
@@ -0,0 +1,398 @@
+"""
+cluster.py
+────────────────────────────────────────────────────────────────────────────
+• 여러 호스트에 걸친 배치 실행 (coordinator 1 + worker N, TCP)
+  - 메시지 = 한 줄 JSON (worker → coordinator : hello / get / done / fail / ping,
+    coordinator → worker : config / chunk / stop)
+  - 시드를 chunksize 묶음으로 나눠 대기열에 두고, worker 가 get 을 보낼 때마다 한 묶음씩 줌 (pull)
+    · worker 는 hello 에 slots(프로세스 풀 크기) / prefetch 를 알리고 그만큼 get 을 미리 보내 두고,
+      coordinator 는 worker 마다 실행 중 묶음을 slots + prefetch 개까지만 줌
+      tournament.run_chunk 로 실행한 결과를 압축 행 [seed, success, steps, deaths,
+      performance, arrows_used, stuck] 으로 돌려보냄
+  - work stealing : 대기열이 비면, 놀고 있는 worker 에게 다른 worker 가 오래 잡고 있는 묶음
+    (완료 묶음 평균 시간 × steal_after 초과)을 한 벌 더 줌 → 먼저 온 결과를 쓰고 나머지는 버림
+  - worker 사망 : 연결이 끊기거나 lease 초 동안 아무 메시지(ping 포함)가 없으면
+    그 worker 가 잡고 있던 묶음을 대기열 맨 앞으로 되돌림
+  - serve() 는 결과를 묶음 번호 순 = 시드 순으로 흘려보내는 제너레이터
+    (앞 묶음이 끝나는 대로 내보내고 버림 → 밀린 묶음만 메모리에 남음) → tournament.summarize 로 집계
+  - 한 대에서 시험 : `python cluster.py serve --seeds 0-99999 --local 4`
+    (worker 프로세스 4 개를 로컬 노드 대신 띄움, --slow 로 일부러 느린 노드 흉내)
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from collections import deque
+from functools import partial
+from typing import Deque, Dict, Iterator, List, Optional, Set
+import json
+import multiprocessing as mp
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from tournament import run_chunk
+
+COLS = ("seed", "success", "steps", "deaths", "performance", "arrows_used", "stuck")
+
+
+def _line(msg: dict) -> bytes:
+    return (json.dumps(msg, separators=(",", ":")) + "\n").encode()
+
+
+def pack(records: List[dict]) -> List[list]:
+    """tournament 기록 → 압축 행"""
+    return [[r["seed"], int(r["success"]), r["steps"], r["deaths"], r["performance"],
+             r["arrows_used"], r.get("stuck")] for r in records]
+
+
+def unpack(rows: List[list], on_stuck: str) -> List[dict]:
+    """압축 행 → tournament 기록 (on_stuck off 면 stuck 없음)"""
+    out = []
+    for row in rows:
+        rec = dict(zip(COLS, row))
+        rec["success"] = bool(rec["success"])
+        if on_stuck == "off":
+            del rec["stuck"]
+        out.append(rec)
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  coordinator
+# ──────────────────────────────────────────────────────────────────────────
+class _Peer:
+    def __init__(self, conn: socket.socket, addr):
+        self.conn = conn
+        self.name = f"{addr[0]}:{addr[1]}"
+        self.buf = bytearray()
+        self.want = 0                           # 아직 답하지 않은 get 수
+        self.slots = 0                          # 동시에 줄 묶음 수 (hello 의 slots + prefetch)
+        self.chunks: Set[int] = set()           # 실행 중인 묶음
+        self.last_seen = time.monotonic()
+        self.done = 0
+
+
+class Coordinator:
+    def __init__(self, seeds: List[int], limit: int = 120, size: int = 4, on_stuck: str = "stop",
+                 chunksize: int = 500, host: str = "0.0.0.0", port: int = 0,
+                 lease: float = 30.0, steal_after: float = 2.0, max_copies: int = 2):
+        """steal_after : 완료 묶음 평균 시간의 몇 배를 넘겨 잡고 있으면 다른 worker 에게도 줄지,
+        max_copies : 한 묶음을 동시에 실행할 최대 worker 수"""
+        seeds = list(seeds)
+        self.chunks = [seeds[i:i + chunksize] for i in range(0, len(seeds), chunksize)]
+        self.config = dict(limit=limit, size=size, on_stuck=on_stuck)
+        self.lease, self.steal_after, self.max_copies = lease, steal_after, max_copies
+        self.pending: Deque[int] = deque(range(len(self.chunks)))
+        self.running: Dict[int, Dict[_Peer, float]] = {}    # 묶음 → {worker: 시작 시각}
+        self.finished: Set[int] = set()
+        self.results: Dict[int, List[dict]] = {}            # 끝났지만 아직 내보내지 않은 묶음
+        self.durations: List[float] = []
+        self.failures: Dict[int, int] = {}
+        self.stats = dict(reissued=0, stolen=0, duplicates=0, workers_lost=0)
+        self.peers: Dict[socket.socket, _Peer] = {}
+        self.sock = socket.create_server((host, port))
+        self.address = self.sock.getsockname()[:2]
+        self.sel = selectors.DefaultSelector()
+
+    # ── 이벤트 루프 ──────────────────────────────────────────
+    def serve(self, progress=None) -> Iterator[dict]:
+        """모든 묶음이 끝날 때까지 시드 순 기록을 내보냄. progress(coordinator) 는 묶음 완료마다"""
+        self.sel.register(self.sock, selectors.EVENT_READ)
+        head = 0                                # 다음에 내보낼 묶음
+        try:
+            while len(self.finished) < len(self.chunks):
+                for key, _ in self.sel.select(0.5):
+                    if key.fileobj is self.sock:
+                        conn, addr = self.sock.accept()
+                        self.peers[conn] = _Peer(conn, addr)
+                        self.sel.register(conn, selectors.EVENT_READ)
+                    else:
+                        peer = self.peers.get(key.fileobj)
+                        if peer is not None and self._read(peer) and progress:
+                            progress(self)
+                now = time.monotonic()
+                for peer in [p for p in self.peers.values() if now - p.last_seen > self.lease]:
+                    self._drop(peer)
+                self._dispatch(now)
+                while head in self.results:
+                    yield from self.results.pop(head)
+                    head += 1
+        finally:
+            for peer in list(self.peers.values()):
+                self._send(peer, dict(op="stop"))
+                self._drop(peer, lost=False)
+            self.sel.close()
+            self.sock.close()
+        for k in range(head, len(self.chunks)):
+            yield from self.results.pop(k)
+
+    def _read(self, peer: _Peer) -> bool:
+        """수신 처리. 새로 끝난 묶음이 있으면 True"""
+        try:
+            data = peer.conn.recv(1 << 16)
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(peer)
+            return False
+        peer.last_seen = time.monotonic()
+        peer.buf += data
+        finished = False
+        while True:
+            i = peer.buf.find(b"\n")
+            if i < 0:
+                return finished
+            msg = json.loads(peer.buf[:i])
+            del peer.buf[:i + 1]
+            finished |= self._handle(peer, msg)
+
+    def _handle(self, peer: _Peer, msg: dict) -> bool:
+        op = msg["op"]
+        if op == "hello":
+            peer.name = msg.get("name", peer.name)
+            peer.slots = msg.get("slots", 1) + msg.get("prefetch", 0)
+            self._send(peer, dict(op="config", lease=self.lease, **self.config))
+        elif op == "get":
+            peer.want += 1
+        elif op == "done":
+            k = msg["id"]
+            peer.chunks.discard(k)
+            runs = self.running.pop(k, {})
+            for other in runs:
+                if other is not peer:
+                    other.chunks.discard(k)
+            if k in self.finished:
+                self.stats["duplicates"] += 1
+                return False
+            self.finished.add(k)
+            self.results[k] = unpack(msg["recs"], self.config["on_stuck"])
+            if peer in runs:
+                self.durations.append(time.monotonic() - runs[peer])
+            peer.done += 1
+            return True
+        elif op == "fail":
+            k = msg["id"]
+            peer.chunks.discard(k)
+            self.failures[k] = self.failures.get(k, 0) + 1
+            if self.failures[k] >= 3:
+                raise RuntimeError(f"묶음 {k} 실행 실패 ({peer.name}): {msg.get('error')}")
+            self._release(k, peer)
+        return False                            # ping : last_seen 갱신만
+
+    def _send(self, peer: _Peer, msg: dict):
+        try:
+            peer.conn.sendall(_line(msg))
+        except OSError:
+            pass                                # 다음 recv 에서 끊김 처리
+
+    # ── 배분 ─────────────────────────────────────────────────
+    def _next(self, peer: _Peer, now: float) -> Optional[int]:
+        for i, k in enumerate(self.pending):
+            if peer not in self.running.get(k, {}):
+                del self.pending[i]             # 이 worker 가 이미 실행 중인 묶음은 대기열에 그대로
+                return k
+        if not self.durations:
+            return None
+        slow = self.steal_after * sum(self.durations) / len(self.durations)
+        best = None
+        for k, runs in self.running.items():
+            if k in self.finished or peer in runs or len(runs) >= self.max_copies:
+                continue
+            start = min(runs.values())
+            if now - start > slow and (best is None or start < best[0]):
+                best = (start, k)
+        if best is not None:
+            self.stats["stolen"] += 1
+            return best[1]
+        return None
+
+    def _dispatch(self, now: float):
+        for peer in list(self.peers.values()):
+            while peer.want and len(peer.chunks) < peer.slots:
+                k = self._next(peer, now)
+                if k is None:
+                    break
+                peer.want -= 1
+                peer.chunks.add(k)
+                self.running.setdefault(k, {})[peer] = now
+                self._send(peer, dict(op="chunk", id=k, seeds=self.chunks[k]))
+
+    def _release(self, k: int, peer: _Peer):
+        runs = self.running.get(k)
+        if runs is not None:
+            runs.pop(peer, None)
+            if not runs:
+                del self.running[k]
+        if k not in self.finished and k not in self.running:
+            self.pending.appendleft(k)
+            self.stats["reissued"] += 1
+
+    def _drop(self, peer: _Peer, lost: bool = True):
+        """worker 연결 정리, 잡고 있던 묶음은 대기열로"""
+        if self.peers.pop(peer.conn, None) is None:
+            return
+        try:
+            self.sel.unregister(peer.conn)
+        except (KeyError, ValueError):
+            pass
+        peer.conn.close()
+        for k in list(peer.chunks):
+            self._release(k, peer)
+        peer.chunks.clear()
+        if lost:
+            self.stats["workers_lost"] += 1
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  worker
+# ──────────────────────────────────────────────────────────────────────────
+def _run(seeds: List[int], config: dict, delay: float) -> List[list]:
+    if delay:
+        time.sleep(delay)
+    return pack(run_chunk(seeds, **config))
+
+
+def run_worker(host: str, port: int, workers: Optional[int] = None, name: Optional[str] = None,
+               prefetch: int = 1, delay: float = 0.0) -> int:
+    """coordinator 에 붙어 stop 을 받거나 연결이 끊길 때까지 묶음 실행 → 실행한 묶음 수.
+    ping 은 coordinator lease 의 1/3 간격, delay : 묶음마다 일부러 쉬는 초 (느린 노드 흉내, 시험용)"""
+    workers = workers or os.cpu_count() or 1
+    sock = socket.create_connection((host, port))
+    rfile = sock.makefile("rb")
+    lock = threading.Lock()
+    stop = threading.Event()
+    count = [0]
+
+    def send(msg: dict):
+        with lock:
+            try:
+                sock.sendall(_line(msg))
+            except OSError:
+                stop.set()
+
+    def done(k: int, rows: List[list]):
+        count[0] += 1
+        send(dict(op="done", id=k, recs=rows))
+        send(dict(op="get"))
+
+    def failed(k: int, err: BaseException):
+        send(dict(op="fail", id=k, error=repr(err)))
+        send(dict(op="get"))
+
+    def beat():
+        while not stop.wait(heartbeat):
+            send(dict(op="ping"))
+
+    send(dict(op="hello", name=name or f"{socket.gethostname()}:{os.getpid()}", slots=workers,
+              prefetch=prefetch))
+    config = json.loads(rfile.readline())
+    config.pop("op")
+    heartbeat = config.pop("lease") / 3
+    job = partial(_run, config=config, delay=delay)
+    pool = mp.Pool(workers) if workers > 1 else None
+    threading.Thread(target=beat, daemon=True).start()
+    try:
+        for _ in range(workers + prefetch):
+            send(dict(op="get"))
+        for line in rfile:
+            msg = json.loads(line)
+            if msg["op"] == "stop":
+                break
+            if msg["op"] != "chunk":
+                continue
+            k = msg["id"]
+            if pool is None:
+                try:
+                    done(k, job(msg["seeds"]))
+                except Exception as e:
+                    failed(k, e)
+            else:
+                pool.apply_async(job, (msg["seeds"],), callback=partial(done, k),
+                                 error_callback=partial(failed, k))
+    finally:
+        stop.set()
+        if pool is not None:
+            pool.terminate()
+        sock.close()
+    return count[0]
+
+
+def spawn_local(address, n: int, workers: int = 1, slow: int = 0,
+                delay: float = 1.0) -> List[subprocess.Popen]:
+    """한 대에서 노드 대신 쓸 worker 프로세스 n 개 (앞의 slow 개는 묶음마다 delay 초 지연)"""
+    host, port = address
+    host = "127.0.0.1" if host in ("0.0.0.0", "") else host
+    procs = []
+    for i in range(n):
+        cmd = [sys.executable, os.path.abspath(__file__), "work", f"{host}:{port}",
+               "--workers", str(workers), "--name", f"local{i}"]
+        if i < slow:
+            cmd += ["--delay", str(delay)]
+        procs.append(subprocess.Popen(cmd))
+    return procs
+
+
+if __name__ == "__main__":
+    import argparse
+    from tournament import parse_seeds, summarize
+    ap = argparse.ArgumentParser(description="coordinator / worker 분산 배치 실행")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sv = sub.add_parser("serve", help="coordinator : 시드를 나눠 주고 결과 집계")
+    sv.add_argument("--seeds", required=True, help="시드 범위 (예: 0-999999)")
+    sv.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    sv.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    sv.add_argument("--on-stuck", default="stop", choices=["off", "stop", "recover"])
+    sv.add_argument("--chunksize", type=int, default=500, help="묶음당 시드 수")
+    sv.add_argument("--host", default="0.0.0.0")
+    sv.add_argument("--port", type=int, default=5577)
+    sv.add_argument("--lease", type=float, default=30.0, help="이 초 동안 소식 없는 worker 는 사망 처리")
+    sv.add_argument("--steal-after", type=float, default=2.0, help="평균 묶음 시간의 몇 배부터 다른 worker 에게도 줄지")
+    sv.add_argument("--local", type=int, default=0, help="로컬 worker 프로세스 수 (한 대 시험용)")
+    sv.add_argument("--local-workers", type=int, default=1, help="로컬 worker 당 프로세스 풀 크기")
+    sv.add_argument("--slow", type=int, default=0, help="로컬 worker 중 느린 노드 수 (묶음마다 1 초 지연)")
+    sv.add_argument("--jsonl", help="시드별 기록 저장 경로")
+    wk = sub.add_parser("work", help="worker : coordinator 에 붙어 묶음 실행")
+    wk.add_argument("connect", help="coordinator 주소 host:port")
+    wk.add_argument("--workers", type=int, help="프로세스 풀 크기 (기본: 전체 코어)")
+    wk.add_argument("--name", help="worker 이름 (기본: 호스트:pid)")
+    wk.add_argument("--delay", type=float, default=0.0, help="묶음마다 지연 초 (시험용)")
+    args = ap.parse_args()
+
+    if args.cmd == "work":
+        host, _, port = args.connect.rpartition(":")
+        try:
+            n = run_worker(host, int(port), args.workers, args.name, delay=args.delay)
+        except (ConnectionError, OSError) as e:
+            raise SystemExit(f"연결 실패: {e}")
+        print(f"worker 종료 : 묶음 {n} 개 실행", file=sys.stderr)
+    else:
+        co = Coordinator(parse_seeds(args.seeds), args.limit, args.size, args.on_stuck,
+                         args.chunksize, args.host, args.port, args.lease, args.steal_after)
+        print(f"coordinator {co.address[0]}:{co.address[1]} : 묶음 {len(co.chunks)} 개", file=sys.stderr)
+        procs = spawn_local(co.address, args.local, args.local_workers, args.slow)
+        t = time.perf_counter()
+        f = open(args.jsonl, "w") if args.jsonl else None
+
+        def stream():
+            """시드 순으로 받는 대로 저장하며 집계 (전체 기록을 메모리에 두지 않음)"""
+            for r in co.serve():
+                if f is not None:
+                    f.write(json.dumps(r) + "\n")
+                yield r
+
+        try:
+            out = summarize(stream())
+        finally:
+            if f is not None:
+                f.close()
+            for p in procs:
+                try:
+                    p.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    p.kill()
+        out.update(co.stats, elapsed=round(time.perf_counter() - t, 3))
+        print(json.dumps(out))
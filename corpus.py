@@ -0,0 +1,151 @@
+"""
+corpus.py
+────────────────────────────────────────────────────────────────────────────
+• 미리 생성한 월드 배치를 담는 고정 폭 바이너리 파일 (mmap 으로 인덱스 접근)
+  - 헤더 32바이트 : magic 'WUMPCORP' | version u16 | size u16 | record u16 |
+                    mode u16 | count u64 | base u64
+    · mode 0 → k 번째 시드 = base + k
+    · mode 1 → k 번째 시드 = stream_seed(base, k)
+  - 레코드 : pit 비트 | wumpus 비트 | gold 칸 번호 u32
+    · 비트/번호 j = (x-1)*size + (y-1)  (내부 칸만, 비트 바이트 수 = ceil(size²/8))
+  - 모든 실행이 같은 기준 월드 집합을 쓰고, 워커는 생성 없이 k 번째 월드를 읽음
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from functools import partial
+from typing import Iterable, List, Optional, Tuple
+import mmap
+import multiprocessing as mp
+import os
+import struct
+
+from setting import World, stream_seed
+from worldgen import generate
+
+MAGIC = b"WUMPCORP"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHHQQ")
+PLAIN, STREAM = 0, 1
+
+
+def _bits(size: int) -> int:
+    return (size * size + 7) // 8
+
+
+def record_size(size: int) -> int:
+    return 2 * _bits(size) + 4
+
+
+def corpus_seed(mode: int, base: int, k: int) -> int:
+    return base + k if mode == PLAIN else stream_seed(base, k)
+
+
+def _pack_chunk(seeds: List[int], size: int) -> bytes:
+    """시드 묶음 → 레코드 바이트열"""
+    batch = generate(seeds, size)
+    b, nb = batch.board, _bits(size)
+    out = bytearray()
+    for k in range(len(batch)):
+        pits, wumpi, (gx, gy) = batch.layout(k)
+        for cells in (pits, wumpi):
+            m = 0
+            for x, y in cells:
+                m |= 1 << ((x - 1) * size + y - 1)
+            out += m.to_bytes(nb, "little")
+        out += struct.pack("<I", (gx - 1) * size + gy - 1)
+    return bytes(out)
+
+
+def build(path: str, count: int, size: int = 4, base: int = 0, mode: int = PLAIN,
+          workers: Optional[int] = None, chunk: int = 50_000):
+    """count 개 월드를 생성해 path 에 기록 (청크 단위로 프로세스 풀에 분배)"""
+    starts = range(0, count, chunk)
+    seed_chunks = ([corpus_seed(mode, base, k) for k in range(s, min(s + chunk, count))]
+                   for s in starts)
+    job = partial(_pack_chunk, size=size)
+    workers = workers or os.cpu_count() or 1
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, record_size(size), mode, count, base))
+        if workers == 1 or len(starts) < 2:
+            for data in map(job, seed_chunks):
+                f.write(data)
+        else:
+            with mp.Pool(workers) as pool:
+                for data in pool.imap(job, seed_chunks):
+                    f.write(data)
+
+
+class Corpus:
+    """mmap 으로 연 코퍼스. corpus[k] / corpus.world(k) 로 k 번째 월드"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, ver, self.size, self.record, self.mode, self.count, self.base = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or ver != VERSION:
+            raise ValueError(f"{path}: 코퍼스 파일 형식이 아님")
+        if self.record != record_size(self.size) or \
+           len(self._mm) < HEADER.size + self.count * self.record:
+            raise ValueError(f"{path}: 레코드 크기/개수가 맞지 않음")
+        self._nb = _bits(self.size)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def seed(self, k: int) -> int:
+        return corpus_seed(self.mode, self.base, k)
+
+    def layout(self, k: int) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]], Tuple[int, int]]:
+        if not 0 <= k < self.count:
+            raise IndexError(k)
+        n, nb = self.size, self._nb
+        off = HEADER.size + k * self.record
+        mm = self._mm
+        layers = []
+        for j in range(2):
+            m = int.from_bytes(mm[off + j * nb: off + (j + 1) * nb], "little")
+            cells = []
+            while m:
+                low = m & -m
+                i = low.bit_length() - 1
+                cells.append((i // n + 1, i % n + 1))
+                m ^= low
+            layers.append(cells)
+        (g,) = struct.unpack_from("<I", mm, off + 2 * nb)
+        return layers[0], layers[1], (g // n + 1, g % n + 1)
+
+    def world(self, k: int) -> World:
+        pits, wumpi, gold = self.layout(k)
+        return World.from_layout(self.size, pits, wumpi, gold, seed=self.seed(k))
+
+    __getitem__ = world
+
+    def worlds(self, indices: Iterable[int]):
+        for k in indices:
+            yield self.world(k)
+
+    def close(self):
+        self._mm.close(); self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="월드 코퍼스 생성")
+    ap.add_argument("path")
+    ap.add_argument("--count", type=int, default=10_000_000, help="월드 수")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    ap.add_argument("--base", type=int, default=0, help="시작 시드 (stream 모드는 스트림 키)")
+    ap.add_argument("--stream", action="store_true", help="카운터 기반 시드 스트림 사용")
+    ap.add_argument("--workers", type=int, help="프로세스 수 (기본: 전체 코어)")
+    args = ap.parse_args()
+    build(args.path, args.count, args.size, args.base,
+          STREAM if args.stream else PLAIN, args.workers)
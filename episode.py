@@ -0,0 +1,146 @@
+"""
+episode.py
+────────────────────────────────────────────────────────────────────────────
+• World + Agent 한 판(에피소드) 진행 루프
+  - main.py 의 스텝 루프(사망 → reset_position, 금 들고 (1,1) 도착 → 종료)를
+    한 곳에 모아 콘솔 실행 / 배치 실행이 같은 규칙을 쓰도록 함
+  - on_stuck : loopguard 로 새 지식 없는 순환 감지 시
+    · "stop"    → 남은 스텝을 주기에서 계산해 바로 종료 (기록은 끝까지 돌린 것과 같음)
+    · "recover" → loopguard.recovery_action 으로 전환, 새 지식이 생기면 원래 정책,
+                  회복 중 다시 순환하면 stop 과 같이 종료
+    · "off"     → 감지 안 함 (기본, replay / GUI)
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from setting import World
+from agent import Agent
+from tracelog import make_trace
+from metrics import Metrics
+from loopguard import LoopGuard, cycle_tail, recovery_action
+
+
+@dataclass
+class Episode:
+    world: World
+    agent: Agent
+    limit: int = 120
+    seed: Optional[int] = None
+
+    step_no: int = 0
+    deaths: int = 0
+    arrows_used: int = 0
+    done: bool = False
+    on_stuck: str = "off"                       # off / stop / recover
+    stuck: Optional[int] = None                 # 순환을 확정한 스텝
+
+    guard: Optional[LoopGuard] = field(default=None, init=False, repr=False)
+    events: List[Tuple[bool, int]] = field(default_factory=list, init=False, repr=False)
+    recovering: bool = field(default=False, init=False)
+
+    def __post_init__(self):
+        if self.on_stuck not in ("off", "stop", "recover"):
+            raise ValueError(f"on_stuck: {self.on_stuck!r} (off / stop / recover)")
+        if self.on_stuck != "off":
+            self.guard = LoopGuard()
+
+    @classmethod
+    def from_seed(cls, seed: Optional[int], limit: int = 120, size: int = 4,
+                  trace: str = "list", trace_path: Optional[str] = None,
+                  risk: str = "exact", metrics: bool = False, on_stuck: str = "off") -> "Episode":
+        return cls.from_world(World(seed, size), limit, trace, trace_path, risk, metrics, on_stuck)
+
+    @classmethod
+    def from_world(cls, world: World, limit: int = 120,
+                   trace: str = "list", trace_path: Optional[str] = None,
+                   risk: str = "exact", metrics: bool = False, on_stuck: str = "off") -> "Episode":
+        """trace: tracelog 모드 (off / list / ring / binary), risk: Agent unknown 목표 선택 방식,
+        metrics: Agent.step 계측 (record() 에 "metrics" 스냅샷 포함), on_stuck: 순환 처리"""
+        sink = make_trace(trace, trace_path, world.size, world.seed, limit=limit,
+                          on_stuck=on_stuck, risk=risk, params=world.params)
+        ag = Agent(world, trace=sink, risk=risk, metrics=Metrics() if metrics else None)
+        return cls(world, ag, limit, world.seed, done=limit <= 0, on_stuck=on_stuck)
+
+    @property
+    def success(self) -> bool:
+        ag = self.agent
+        return ag.has_gold and (ag.x, ag.y) == (1, 1)
+
+    # ──────────────────────────────────────────────────────────
+    #  한 스텝 진행 (main.py 루프와 동일한 규칙)
+    # ──────────────────────────────────────────────────────────
+    def advance(self, act: Optional[str] = None) -> bool:
+        """act 를 주면 에이전트 판단 대신 그 행동 (rollout.play 등)"""
+        ag = self.agent
+        if act is None and self.recovering:
+            act = recovery_action(ag)
+        self.step_no += 1
+        arrows = ag.arrows
+        alive = ag.step(self.step_no, act)
+        used = arrows - ag.arrows
+        self.arrows_used += used
+        if alive and self.success:
+            self.done = True
+        elif not alive:
+            self.deaths += 1
+            ag.reset_position()
+        if self.step_no >= self.limit:
+            self.done = True
+        if self.guard is not None and not self.done:
+            self.events.append((alive, used))
+            first = self.guard.check(ag, self.step_no)
+            if self.guard.changed:
+                self.recovering = False
+            if first is not None:
+                self._on_loop(first)
+        return alive
+
+    def _on_loop(self, first: int):
+        """스텝 first 직후와 같은 상태로 돌아옴 → 회복 전환 또는 남은 스텝 계산 후 종료"""
+        if self.on_stuck == "recover" and not self.recovering:
+            self.recovering = True
+            self.guard.seen.clear()             # 회복 정책 구간만 비교
+            return
+        ag = self.agent
+        deaths, arrows, ag.performance = cycle_tail(self.events, first, self.limit - self.step_no,
+                                                    ag.performance)
+        self.deaths += deaths
+        self.arrows_used += arrows
+        self.stuck = self.step_no
+        self.step_no = self.limit
+        self.done = True
+
+    def run(self) -> "Episode":
+        while not self.done:
+            self.advance()
+        if self.agent.trace is not None:
+            self.agent.trace.close()
+        return self
+
+    def snapshot(self) -> tuple:
+        g = None if self.guard is None else \
+            (self.guard.snapshot(), tuple(self.events), self.recovering, self.stuck)
+        return (self.step_no, self.deaths, self.arrows_used, self.done,
+                self.world.snapshot(), self.agent.snapshot(), g)
+
+    def restore(self, snap: tuple):
+        self.step_no, self.deaths, self.arrows_used, self.done, w, a, g = snap
+        self.world.restore(w)
+        self.agent.restore(a)
+        if g is not None:
+            gs, events, self.recovering, self.stuck = g
+            self.guard.restore(gs)
+            self.events = list(events)
+
+    def record(self) -> dict:
+        rec = dict(seed=self.seed, success=self.success, steps=self.step_no,
+                   deaths=self.deaths, performance=self.agent.performance,
+                   arrows_used=self.arrows_used)
+        if self.guard is not None:
+            rec["stuck"] = self.stuck
+        if self.agent.metrics is not None:
+            rec["metrics"] = self.agent.metrics.snapshot()
+        return rec
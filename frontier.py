@@ -0,0 +1,91 @@
+"""
+frontier.py
+────────────────────────────────────────────────────────────────────────────
+• 탐색 목표 선택용 프런티어 인덱스
+  - Agent._update 끝에서 sync() 로 KB 비트마스크를 넘겨받아, 상태가 바뀐 칸과
+    그 이웃의 점수만 다시 계산
+  - unknown 칸 : (-점수, id) 최대 힙 + 지연 삭제 → best_unknown 은 amortised O(log n)
+  - 미방문 safe : 마스크로 유지, 에이전트 위치가 움직이므로 거리 최소값은
+    (위치, KB 버전) 단위로 메모 → 한 스텝 안의 반복 호출은 O(1)
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from heapq import heappush, heappop
+from typing import Dict, List, Optional, Tuple
+
+from kb import Board
+
+
+class Frontier:
+    def __init__(self, board: Board):
+        self.board = board
+        self.heap: List[Tuple[float, int]] = []
+        self.score: Dict[int, float] = {}
+        self.safe = self.visited = self.known = self.breeze = 0
+        self.open_safe = 0                      # safe & ~visited
+        self.version = 0
+        self._memo_key: Optional[tuple] = None
+        self._memo: Optional[Tuple[int, int]] = None
+
+    # ──────────────────────────────────────────────────────────
+    #  KB 변경 반영
+    # ──────────────────────────────────────────────────────────
+    def sync(self, safe: int, visited: int, known: int, breeze: int):
+        d_score = (safe ^ self.safe) | (breeze ^ self.breeze)
+        d_known = known ^ self.known
+        if not (d_score or d_known or visited != self.visited):
+            return
+        self.safe, self.visited, self.known, self.breeze = safe, visited, known, breeze
+        self.open_safe = safe & ~visited
+        self.version += 1
+
+        b = self.board
+        unknown = b.interior & ~known
+        # 점수 = 인접 safe 비율 + breeze 인접 보너스 → safe/breeze 가 바뀐 칸의 이웃만 재계산
+        for i in b.ids((b.spread(d_score) | d_known) & unknown):
+            nb = b.nbr(i)
+            s = (nb & safe).bit_count() / 4 + (0.5 if nb & breeze else 0)
+            if s == self.score.get(i, 0.0) and not (d_known >> i) & 1:
+                continue
+            self.score[i] = s
+            if s > 0:
+                heappush(self.heap, (-s, i))
+
+    def fork(self) -> "Frontier":
+        f = Frontier.__new__(Frontier)
+        f.__dict__.update(self.__dict__)
+        f.heap, f.score = list(self.heap), dict(self.score)
+        return f
+
+    # ──────────────────────────────────────────────────────────
+    #  질의
+    # ──────────────────────────────────────────────────────────
+    def best_unknown(self) -> Optional[int]:
+        """점수 최대 unknown 칸 id (동점이면 id 작은 쪽 = 스캔 순서)"""
+        unknown = self.board.interior & ~self.known
+        heap, score = self.heap, self.score
+        while heap:
+            s, i = heap[0]
+            if (unknown >> i) & 1 and score.get(i) == -s:
+                return i
+            heappop(heap)                       # 이미 알려졌거나 점수가 바뀐 항목
+        if unknown:
+            return (unknown & -unknown).bit_length() - 1
+        return None
+
+    def nearest_safe(self, x: int, y: int, exclude: int) -> Optional[Tuple[int, int]]:
+        """미방문 safe 중 (x, y) 에서 맨해튼 거리 최소.
+        동점이면 시작 칸에서 먼 쪽 (y 큰 쪽, 다음 x 큰 쪽)"""
+        key = (x, y, exclude, self.version)
+        if key == self._memo_key:
+            return self._memo
+        b = self.board
+        best, bkey = None, None
+        for i in b.ids(self.open_safe & ~exclude):
+            cx, cy = b.xy(i)
+            k = (abs(cx - x) + abs(cy - y), -cy, -cx)
+            if bkey is None or k < bkey:
+                best, bkey = (cx, cy), k
+        self._memo_key, self._memo = key, best
+        return best
@@ -0,0 +1,257 @@
+"""
+inference.py
+────────────────────────────────────────────────────────────────────────────
+• 프런티어 칸의 P(pit), P(wumpus) 계산 (위험 이동 선택용)
+  - 모델 : setting.sample_layout 의 생성 사전확률 (World 생성 파라미터, 기본 HAZARD_PROB)
+    · wumpus ~ wumpus_prob, pit ~ pit_prob*(1-wumpus_prob) (같은 칸 wumpus 면 pit 없음)
+    · 종류별 개수 상한(max_pits / max_wumpi) 을 전체 개수 제약으로 반영
+    · 상한이 스캔 순서로 채워지는 효과와 pit/wumpus 간 상관은 무시 (층별 독립)
+  - 관측 : 방문 칸의 breeze 유/무 → pit 층, stench 유/무 → wumpus 층
+    · "없음" 관측 → 이웃 전부 0,  "있음" 관측 → 이웃 중 최소 하나 1
+  - 제약을 공유하는 변수끼리 연결 요소로 나눠 각각 열거(백트래킹)하고,
+    요소별 "개수 k 인 해의 수" 다항식을 곱해 상한을 적용
+    · 요소 열거 결과는 (변수, 제약) 서명으로 메모 → 바뀌지 않은 요소는 재사용
+    · 상한은 항상 적용. approx_cap=True 일 때만 "상한이 사실상 안 걸리는" 층
+      (나머지 칸 수 r 에서 r*p + 6*sqrt(r*p*(1-p)+1) + 요소 변수 수 < 상한)을 요소별 독립으로
+      근사 → 상한 초과 확률 ε ≤ e^-6 (Bernstein 부등식), 칸별 확률 절대 오차 ≤ ε ≈ 0.0025
+  - 변수 수 / 작업 예산(열거 노드 수, 한 번 호출의 두 층 합계)을 넘으면 None → 호출 측이 휴리스틱으로 대체
+    · 메모에서 꺼낸 요소도 처음 열거할 때 든 노드 수를 그대로 차감
+      → 결과가 메모 상태 · 기계 속도와 무관 (같은 KB 면 같은 답, replay 재현 가능)
+  - 개수 상한은 호출마다 받음 (Agent 는 KB 상한 — wumpus 사살 뒤 줄어든 값 — 을 넘김)
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from math import exp, lgamma, log, log1p, sqrt
+from typing import Dict, List, Optional, Tuple
+
+from kb import Board
+from setting import HAZARD_PROB
+
+Poly = List[float]
+
+
+class _Expired(Exception):
+    """열거 도중 작업 예산 초과"""
+
+
+def _mul(a: Poly, b: Poly, cap: int) -> Poly:
+    """다항식 곱 (cap 차수까지)"""
+    out = [0.0] * min(len(a) + len(b) - 1, cap + 1)
+    for i, x in enumerate(a):
+        if x == 0.0 or i > cap:
+            continue
+        for j in range(min(len(b), cap + 1 - i)):
+            out[i + j] += x * b[j]
+    return out
+
+
+def _below(a: Poly, b: Poly, u: int) -> float:
+    """Σ_{i+j ≤ u} a_i b_j  — 곱을 만들지 않고 b 의 누적합으로"""
+    cb, acc = [], 0.0
+    for x in b[:u + 1]:
+        acc += x; cb.append(acc)
+    last = len(cb) - 1
+    return sum(x * cb[min(u - i, last)] for i, x in enumerate(a[:u + 1]))
+
+
+def components(clauses: List[int]) -> List[Tuple[int, List[int]]]:
+    """칸을 공유하는 절끼리 묶기 → [(요소 칸 마스크, 절 목록)]"""
+    comps: List[Tuple[int, List[int]]] = []
+    for c in clauses:
+        merged, group = c, [c]
+        rest = []
+        for cm, cg in comps:
+            if cm & merged:
+                merged |= cm; group += cg
+            else:
+                rest.append((cm, cg))
+        rest.append((merged, group))
+        comps = rest
+    return comps
+
+
+def _binom(r: int, p: float, top: int) -> Poly:
+    """Binomial(r, p) 확률 0..top (로그 공간에서 계산 → 큰 r 에서도 넘침 없음)"""
+    lp, lq, lr = log(p), log1p(-p), lgamma(r + 1)
+    return [exp(lr - lgamma(j + 1) - lgamma(r - j + 1) + j * lp + (r - j) * lq)
+            for j in range(min(r, top) + 1)]
+
+
+class Inference:
+    def __init__(self, board: Board, cap: int, max_vars: int = 22, max_nodes: int = 10000, *,
+                 wumpus_cap: Optional[int] = None, pit_prob: float = HAZARD_PROB,
+                 wumpus_prob: float = HAZARD_PROB, approx_cap: bool = False):
+        """cap : pit 개수 상한 (wumpus_cap 생략 시 wumpus 도 같은 상한). risks 호출 때 바꿀 수 있음
+        approx_cap : 상한이 거의 안 걸리는 층은 상한 없이 계산 (절대 오차 ≤ e^-6, 모듈 설명)"""
+        self.board = board
+        self.pit_cap = cap
+        self.wumpus_cap = cap if wumpus_cap is None else wumpus_cap
+        self.max_vars = max_vars
+        self.max_nodes = max_nodes                      # 한 번 호출의 작업 예산 (열거 노드 수)
+        self.approx_cap = approx_cap
+        self.memo: Dict[tuple, Tuple[List[int], List[List[int]], int]] = {}
+        self.pit_prob, self.wumpus_prob = pit_prob, wumpus_prob     # 생성 파라미터 그대로
+        self.p_wumpus = wumpus_prob
+        self.p_pit = pit_prob * (1 - wumpus_prob)
+
+    # ──────────────────────────────────────────────────────────
+    #  요소 열거 : W[k] = 해 중 1 이 k 개인 것의 수, Wi[v][k] = 그중 변수 v 가 1
+    # ──────────────────────────────────────────────────────────
+    def _enumerate(self, vars_: Tuple[int, ...], cons: Tuple[int, ...], work: List[int]):
+        """work[0] = 남은 노드 수 (든 만큼 차감). 넘기면 _Expired (메모에 남기지 않음)"""
+        key = (vars_, cons)
+        hit = self.memo.get(key)
+        if hit is not None:
+            work[0] -= hit[2]
+            if work[0] < 0:
+                raise _Expired
+            return hit[0], hit[1]
+        limit = work[0]
+        m = len(vars_)
+        # 제약별 마지막 변수 위치 → 그 변수를 정할 때 검사
+        due: List[List[int]] = [[] for _ in range(m)]
+        for c in cons:
+            due[c.bit_length() - 1].append(c)
+        W = [0] * (m + 1)
+        Wi = [[0] * (m + 1) for _ in range(m)]
+        nodes = [0]
+
+        def rec(i: int, assign: int, k: int):
+            nodes[0] += 1
+            if nodes[0] > limit:
+                work[0] = -1
+                raise _Expired
+            if i == m:
+                W[k] += 1
+                a = assign
+                while a:
+                    low = a & -a
+                    Wi[low.bit_length() - 1][k] += 1
+                    a ^= low
+                return
+            for bit in (0, 1):
+                a = assign | (bit << i)
+                if all(a & c for c in due[i]):
+                    rec(i + 1, a, k + bit)
+
+        rec(0, 0, 0)
+        work[0] -= nodes[0]
+        if len(self.memo) > 4096:
+            self.memo.clear()
+        self.memo[key] = (W, Wi, nodes[0])
+        return W, Wi
+
+    # ──────────────────────────────────────────────────────────
+    #  한 층 (pit 또는 wumpus)
+    # ──────────────────────────────────────────────────────────
+    def layer(self, p: float, cap: int, free: int, known: int, pos_obs: int, neg_obs: int,
+              work: List[int]) -> Optional[Dict[int, float]]:
+        """free 칸 각각의 P(해당 위험) — 실패(예산 초과) 시 None
+        cap     : 이 종류의 개수 상한
+        free    : 상태 모르는 칸,   known : 확정된 칸
+        pos_obs : 감각 '있음' 관측 칸, neg_obs : '없음' 관측 칸"""
+        b = self.board
+        zero = b.spread(neg_obs) & free                 # '없음' 관측 이웃은 0
+        var_mask = free & ~zero
+        cons: List[int] = []
+        for o in b.ids(pos_obs):
+            nb = b.nbr(o)
+            if nb & known:
+                continue                                # 이미 확정 칸으로 설명됨
+            c = nb & var_mask
+            if c:
+                cons.append(c)                          # 비면 모순 관측 → 무시
+
+        comps = components(cons)                        # 제약 공유로 연결 요소 나누기
+        rest_mask = var_mask
+        for cm, _ in comps:
+            rest_mask &= ~cm
+        r = rest_mask.bit_count()
+        cap -= known.bit_count()
+
+        out: Dict[int, float] = {i: 0.0 for i in b.ids(zero)}
+        polys: List[Poly] = []
+        marg: List[Tuple[List[int], List[Poly]]] = []
+        for cm, group in comps:
+            vids = tuple(b.ids(cm))
+            if len(vids) > self.max_vars:
+                return None
+            idx = {v: j for j, v in enumerate(vids)}
+            local = []
+            for c in group:
+                lm = 0
+                for v in b.ids(c):
+                    lm |= 1 << idx[v]
+                local.append(lm)
+            try:
+                W, Wi = self._enumerate(vids, tuple(sorted(set(local))), work)
+            except _Expired:
+                return None
+            m = len(vids)
+            wt = [p ** k * (1 - p) ** (m - k) for k in range(m + 1)]
+            polys.append([W[k] * wt[k] for k in range(m + 1)])
+            marg.append((list(vids), [[Wi[j][k] * wt[k] for k in range(m + 1)] for j in range(m)]))
+
+        deg = sum(len(q) - 1 for q in polys)
+        loose = self.approx_cap and r * p + 6 * sqrt(r * p * (1 - p) + 1) + deg < cap
+        if not (cap < 0 or cap >= deg + r or loose):
+            if self._capped(out, p, polys, marg, rest_mask, r, cap):
+                return out
+        # 상한이 안 걸림 (approx_cap 이면 사실상 안 걸림, 또는 확정 칸과 상한이 모순) → 요소별 독립
+        for (vids, pis), q in zip(marg, polys):
+            z = sum(q)
+            for v, pi in zip(vids, pis):
+                out[v] = sum(pi) / z if z else 0.0
+        for i in b.ids(rest_mask):
+            out[i] = p
+        return out
+
+    def _capped(self, out: Dict[int, float], p: float, polys: List[Poly],
+                marg: List[Tuple[List[int], List[Poly]]], rest_mask: int, r: int, cap: int) -> bool:
+        """전체 개수 ≤ cap 조건부 주변확률을 out 에 기록. 조건을 만족하는 배치가 없으면 False"""
+        n = len(polys)
+        # prefix/suffix 곱 → 요소 c 를 뺀 나머지 곱 (나머지 칸 이항분포는 prefix 맨 앞)
+        pre: List[Poly] = [_binom(r, p, cap)]
+        for q in polys:
+            pre.append(_mul(pre[-1], q, cap))
+        suf: List[Poly] = [[1.0]] * (n + 1)
+        for c in range(n - 1, -1, -1):
+            suf[c] = _mul(polys[c], suf[c + 1], cap)
+        z = sum(pre[n])
+        if z <= 0:
+            return False
+        for c, (vids, pis) in enumerate(marg):
+            # 요소 안에서 k 개 → 나머지는 cap-k 개 이하 : H(u) = Σ_{i+j ≤ u} pre_i suf_j
+            h = [_below(pre[c], suf[c + 1], cap - k) if cap >= k else 0.0
+                 for k in range(len(pis[0]))]
+            for v, pi in zip(vids, pis):
+                out[v] = sum(x * hk for x, hk in zip(pi, h)) / z
+        if r:
+            # 나머지 칸 하나가 위험 → 그 칸 1 개 + 나머지 r-1 칸 이항분포
+            one = [0.0] + [p * x for x in _binom(r - 1, p, cap - 1)] if cap >= 1 else [0.0]
+            pr = _below(one, suf[0], cap) / z
+            for i in self.board.ids(rest_mask):
+                out[i] = pr
+        return True
+
+    # ──────────────────────────────────────────────────────────
+    #  두 층 합친 위험도
+    # ──────────────────────────────────────────────────────────
+    def risks(self, safe: int, visited: int, pit: int, wumpus: int,
+              breeze: int, stench: int, nostench: int, *, pit_cap: Optional[int] = None,
+              wumpus_cap: Optional[int] = None) -> Optional[Dict[int, Tuple[float, float]]]:
+        """상태 모르는 칸 id → (P(pit), P(wumpus)).  예산/변수 한도 초과 시 None
+        pit_cap / wumpus_cap : 지금의 개수 상한 (생략 시 생성 때 상한)"""
+        b = self.board
+        work = [self.max_nodes]
+        free = b.interior & ~safe & ~pit & ~wumpus
+        pp = self.layer(self.p_pit, self.pit_cap if pit_cap is None else pit_cap,
+                        free, pit, breeze, visited & ~breeze, work)
+        if pp is None:
+            return None
+        pw = self.layer(self.p_wumpus, self.wumpus_cap if wumpus_cap is None else wumpus_cap,
+                        free, wumpus, stench, nostench, work)
+        if pw is None:
+            return None
+        return {i: (pp[i], pw[i]) for i in b.ids(free)}
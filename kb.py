@@ -0,0 +1,140 @@
+"""
+kb.py
+────────────────────────────────────────────────────────────────────────────
+• 비트보드 지식 베이스
+  - 벽 테두리를 포함한 (size+2)x(size+2) 격자의 칸 하나 = 정수 비트 하나
+    · id(x, y) = x * stride + y  (stride = size+2, x 우선 → 비트 순서 = (x, y) 스캔 순서)
+    · 테두리(벽) 덕분에 이웃 이동은 시프트만으로 끝나고 줄 넘김이 생기지 않음
+  - CellSet : Set[Tuple[int,int]] 자리에 그대로 쓰는 비트마스크 집합
+    (in / add / discard / | & - / 반복 / len) — 합집합·포함·"모든 unknown" 이
+    정수 연산 한 번
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from topology import grid
+
+
+class Board:
+    """격자 크기별 상수 (stride, 내부 마스크, 칸별 이웃 마스크)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.grid = g = grid(size)             # 방향 표 / 칸별 이웃 (topology)
+        self.stride = s = g.stride
+        self.cells = g.cells
+        self.interior = 0
+        for x in range(1, size + 1):
+            self.interior |= ((1 << size) - 1) << (x * s + 1)
+        self._nbr: List[Optional[int]] = [None] * self.cells   # 칸별 이웃 마스크 (처음 쓸 때 계산)
+
+    def id(self, x: int, y: int) -> int:
+        return x * self.stride + y
+
+    def xy(self, i: int) -> Tuple[int, int]:
+        return divmod(i, self.stride)
+
+    def valid(self, x: int, y: int) -> bool:
+        """벽 테두리까지 포함해 표현 가능한 좌표인지"""
+        return 0 <= x < self.stride and 0 <= y < self.stride
+
+    def nbr(self, i: int) -> int:
+        """칸 i 의 상하좌우 이웃 마스크 (벽 칸 포함)"""
+        m = self._nbr[i]
+        if m is None:
+            m = self._nbr[i] = self.spread(1 << i) & ((1 << self.cells) - 1)
+        return m
+
+    def spread(self, m: int) -> int:
+        """m 의 모든 칸을 상하좌우로 한 칸씩 번진 마스크 (m 자신 제외 아님)"""
+        s = self.stride
+        return (m << s) | (m >> s) | (m << 1) | (m >> 1)
+
+    def mask(self, cells: Iterable[Tuple[int, int]]) -> int:
+        m = 0
+        for x, y in cells:
+            m |= 1 << (x * self.stride + y)
+        return m
+
+    def ids(self, m: int) -> Iterator[int]:
+        """켜진 비트 id 를 오름차순으로"""
+        while m:
+            low = m & -m
+            yield low.bit_length() - 1
+            m ^= low
+
+
+class CellSet:
+    """(x, y) 집합 인터페이스를 가진 비트마스크"""
+    __slots__ = ("board", "bits")
+
+    def __init__(self, board: Board, cells: Iterable[Tuple[int, int]] = (), bits: int = 0):
+        self.board = board
+        self.bits = bits | board.mask(cells)
+
+    # ── 집합 인터페이스 ─────────────────────────────────
+    def __contains__(self, p) -> bool:
+        x, y = p
+        b = self.board
+        return b.valid(x, y) and (self.bits >> (x * b.stride + y)) & 1 == 1
+
+    def add(self, p: Tuple[int, int]):
+        self.bits |= 1 << self.board.id(*p)
+
+    def discard(self, p: Tuple[int, int]):
+        if self.board.valid(*p):
+            self.bits &= ~(1 << self.board.id(*p))
+
+    def remove(self, p: Tuple[int, int]):
+        if p not in self:
+            raise KeyError(p)
+        self.discard(p)
+
+    def clear(self):
+        self.bits = 0
+
+    def update(self, cells: Iterable[Tuple[int, int]]):
+        self.bits |= cells.bits if isinstance(cells, CellSet) else self.board.mask(cells)
+
+    def copy(self) -> "CellSet":
+        return CellSet(self.board, bits=self.bits)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        xy = self.board.xy
+        for i in self.board.ids(self.bits):
+            yield xy(i)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    # ── 집합 연산 ───────────────────────────────────────
+    def _other(self, o) -> int:
+        return o.bits if isinstance(o, CellSet) else self.board.mask(o)
+
+    def __or__(self, o):  return CellSet(self.board, bits=self.bits | self._other(o))
+    def __and__(self, o): return CellSet(self.board, bits=self.bits & self._other(o))
+    def __sub__(self, o): return CellSet(self.board, bits=self.bits & ~self._other(o))
+    __ror__, __rand__ = __or__, __and__
+
+    def __ior__(self, o):
+        self.bits |= self._other(o); return self
+
+    def __isub__(self, o):
+        self.bits &= ~self._other(o); return self
+
+    def __eq__(self, o) -> bool:
+        if isinstance(o, CellSet):
+            return self.bits == o.bits
+        if isinstance(o, (set, frozenset)):
+            return set(self) == o
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CellSet({sorted(self)})"
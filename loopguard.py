@@ -0,0 +1,126 @@
+"""
+loopguard.py
+────────────────────────────────────────────────────────────────────────────
+• 제자리 순환(stuck) 감지
+  - 에이전트 결정에 쓰이는 상태(위치 · 방향 · 화살 · 제어 플래그 · 사격 단계 ...)의
+    Zobrist 해시를 스텝마다 바뀐 필드만 XOR 로 갱신
+  - KB 서명(visited / safe / 확정 pit·wumpus / 장애물 / breeze / stench 마스크,
+    Propagator yes/no, 남은 wumpus 수)이 바뀌면 새 지식 → 본 해시 표를 비움
+    → 같은 해시가 다시 나오면 "새 지식 없이 같은 상태로 돌아옴" = 순환
+    · 탐험 중에는 KB 가 거의 매 스텝 바뀌므로 QUIET 스텝 연속으로 안 바뀐 뒤부터만 해시
+  - 에이전트는 결정적이므로 순환 이후는 같은 구간의 반복 :
+    cycle_tail 로 남은 스텝의 사망 수 / 화살 / 점수를 바로 계산 (끝까지 돌린 것과 같은 기록)
+  - recovery_action : 순환을 깨기 위한 대체 행동 (위험 최소 unknown 으로 이동)
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+import random
+
+FIELDS = ("x", "y", "dir", "arrows", "has_gold", "returning", "pending_shot",
+          "turn_after_shoot", "force_forward", "shoot_stage", "prev", "prev_dir", "spin_count")
+
+QUIET = 4                                       # KB 가 이만큼 안 바뀌어야 해시 시작
+
+_KEYS: Dict[tuple, int] = {}
+_RNG = random.Random(0x2F0B)                    # 키는 프로세스마다 같은 순서로 만들어짐
+
+
+def _key(field: str, value) -> int:
+    k = _KEYS.get((field, value))
+    if k is None:
+        k = _KEYS[field, value] = _RNG.getrandbits(64)
+    return k
+
+
+def kb_signature(agent) -> tuple:
+    kb = agent.kb
+    return (agent.visited.bits, agent.safe.bits, agent.definite_obstacle.bits,
+            agent.breeze.bits, agent.stench.bits, kb.pit.yes, kb.pit.no,
+            kb.wumpus.yes, kb.wumpus.no, len(agent.world.wumpi))
+
+
+class LoopGuard:
+    def __init__(self):
+        self.vals: Dict[str, object] = {}
+        self.hash = 0
+        self.kb: Optional[tuple] = None
+        self.seen: Dict[int, int] = {}          # 해시 → 처음 본 스텝 (같은 KB 구간 안에서만)
+        self.changed = False                    # 마지막 check 에서 KB 가 바뀌었는지
+        self.quiet = 0                          # KB 가 안 바뀐 연속 스텝 수
+
+    def snapshot(self) -> tuple:
+        return dict(self.vals), self.hash, self.kb, dict(self.seen), self.changed, self.quiet
+
+    def restore(self, snap: tuple):
+        vals, self.hash, self.kb, seen, self.changed, self.quiet = snap
+        self.vals, self.seen = dict(vals), dict(seen)
+
+    def _rehash(self, agent) -> int:
+        h, vals = self.hash, self.vals
+        for f in FIELDS:
+            v = getattr(agent, f)
+            old = vals.get(f, vals)             # vals 자신 = 아직 없음 표시
+            if old is vals:
+                h ^= _key(f, v)
+            elif v != old:
+                h ^= _key(f, old) ^ _key(f, v)
+            else:
+                continue
+            vals[f] = v
+        # 드물게 바뀌는 컨테이너는 불변 값으로
+        for f, v in (("stench_dirs", frozenset(agent.stench_dirs)),
+                     ("start_targets", tuple(agent.start_targets))):
+            old = vals.get(f, vals)
+            if old is vals:
+                h ^= _key(f, v)
+            elif v != old:
+                h ^= _key(f, old) ^ _key(f, v)
+            vals[f] = v
+        self.hash = h
+        return h
+
+    def check(self, agent, step: int) -> Optional[int]:
+        """스텝 step 직후 상태 기록. 새 지식 없이 전에 본 상태면 그 스텝 번호"""
+        sig = kb_signature(agent)
+        self.changed = sig != self.kb
+        if self.changed:
+            self.kb = sig
+            self.seen.clear()
+            self.quiet = 0
+            return None
+        self.quiet += 1
+        if self.quiet < QUIET:
+            return None
+        h = self._rehash(agent)
+        first = self.seen.get(h)
+        if first is None:
+            self.seen[h] = step
+        return first
+
+
+def cycle_tail(events: List[Tuple[bool, int]], start: int, remaining: int,
+               performance: int) -> Tuple[int, int, int]:
+    """events[start:] 구간(한 주기)을 remaining 스텝 반복했을 때
+    → (추가 사망 수, 추가 화살 사용, 최종 performance).
+    events[k] = (k+1 번째 스텝 생존 여부, 쓴 화살). 사망(또는 Climb) 스텝은 reset_position 으로 점수 0"""
+    cycle = events[start:]
+    deaths = arrows = 0
+    for r in range(remaining):
+        alive, used = cycle[r % len(cycle)]
+        arrows += used
+        if alive:
+            performance -= 1
+        else:
+            deaths += 1
+            performance = 0
+    return deaths, arrows, performance
+
+
+def recovery_action(agent) -> str:
+    """순환 탈출 : 위험 최소 unknown 칸으로 (없으면 (1,1) 로 돌아가 Climb)"""
+    tgt = agent._best_unknown()
+    if tgt is None:
+        return "Climb" if (agent.x, agent.y) == (1, 1) else agent._move((1, 1))
+    return agent._move(tgt)
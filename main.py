@@ -1,46 +1,89 @@
-import argparse
+import argparse, contextlib, json, sys
 from setting import World
-from agent   import Agent
+from episode import Episode
 
 
 def print_world_debug(world: World):
+    n = world.size
+    w = len(str(n))
+    gold = world.grid.id(*world.gold_xy)
     print("\n📍 초기 맵 -----------------------------")
-    for y in range(4, 0, -1):
-        row = []
-        for x in range(1, 5):
-            if   (x, y) == world.gold_xy: row.append("G")
-            elif (x, y) in world.wumpi:   row.append("U")
-            elif (x, y) in world.pits:    row.append("P")
-            else:                         row.append(".")
-        print(f"{y} | " + " ".join(row))
-    print("    1 2 3 4")
+    for y, ids in world.grid.rows():
+        row = ["G" if i == gold else "U" if world.wumpus[i] else "P" if world.pit[i] else "."
+               for i in ids]
+        print(f"{y:>{w}} | " + " ".join(c.rjust(w) for c in row))
+    print(" " * (w + 3) + " ".join(str(x).rjust(w) for x in range(1, n + 1)))
     print(f"Gold:{world.gold_xy}  Wumpus:{sorted(world.wumpi)}  Pits:{sorted(world.pits)}\n")
 
 
-def main(seed=None, limit=120):
-    world = World(seed)
-    print_world_debug(world)
-
-    ag = Agent(world)
-    deaths = 0
-    for step in range(1, limit + 1):
-        alive = ag.step(step)
-        if alive and ag.has_gold and (ag.x, ag.y) == (1, 1):
-            break
-        if not alive:
-            deaths += 1
-            ag.reset_position()
+def main(seed=None, limit=120, size=4, trace="list", trace_path=None, metrics=False,
+         on_stuck="off"):
+    ep = Episode.from_seed(seed, limit, size, trace, trace_path, metrics=metrics, on_stuck=on_stuck)
+    print_world_debug(ep.world)
 
+    ag = ep.run().agent
     ag.print_history()
-    print(f"\n총 이동  : {len(ag.history)}")
-    print(f"죽은 횟수: {deaths}")
+    print(f"\n총 이동  : {ep.step_no}")
+    print(f"죽은 횟수: {ep.deaths}")
     print(f"점수     : {ag.performance}")
-    print("성공" if ag.has_gold and (ag.x, ag.y) == (1, 1) else "실패")
+    if ep.stuck is not None:
+        print(f"순환 감지: {ep.stuck} 스텝에서 종료 (이후 기록은 계산값)")
+    print("성공" if ep.success else "실패")
+    if ag.metrics is not None:
+        print("\n" + ag.metrics.report())
+
+
+def batch(seeds, limit=120, workers=None, jsonl=None, size=4, corpus=None, trace_dir=None,
+          metrics=False, on_stuck="stop", cache=None):
+    """출력 없이 여러 시드 실행 → 집계 통계 반환 (jsonl 지정 시 시드별 기록 저장).
+    corpus 를 주면 seeds 는 코퍼스 인덱스, trace_dir 를 주면 시드별 binary trace 저장,
+    metrics=True 면 통계에 워커 전체 합산 계측 포함, on_stuck 은 순환 처리 (off / stop / recover),
+    cache 를 주면 results_db 캐시에 없는 시드만 실행"""
+    from tournament import run_seeds, summarize
+
+    def stream(out):
+        for rec in run_seeds(seeds, limit, workers, size=size, corpus=corpus,
+                             trace_dir=trace_dir, metrics=metrics, on_stuck=on_stuck,
+                             cache=cache):
+            if out:
+                out.write(json.dumps(rec) + "\n")
+            yield rec
+
+    if jsonl is None:
+        return summarize(stream(None))
+    with (contextlib.nullcontext(sys.stdout) if jsonl == "-" else open(jsonl, "w")) as out:
+        return summarize(stream(out))
 
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--seed", type=int, help="랜덤 시드")
     ap.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    ap.add_argument("--seeds", help="배치 실행 시드 범위/목록 (예: 0-999,1234)")
+    ap.add_argument("--workers", type=int, help="배치 프로세스 수 (기본: 전체 코어)")
+    ap.add_argument("--jsonl", help="배치 시드별 기록 저장 경로 ('-' 는 stdout)")
+    ap.add_argument("--corpus", help="월드 코퍼스 파일 (--seeds 를 코퍼스 인덱스로 사용)")
+    ap.add_argument("--trace", default="list", choices=["off", "list", "ring", "binary"],
+                    help="단일 실행 trace 모드")
+    ap.add_argument("--trace-path", help="binary trace 파일 경로 (단일 실행)")
+    ap.add_argument("--trace-dir", help="배치 실행 시 시드별 binary trace 저장 폴더")
+    ap.add_argument("--metrics", action="store_true", help="Agent.step 구간 시간 / 결정 경로 카운터 출력")
+    ap.add_argument("--on-stuck", choices=["off", "stop", "recover"],
+                    help="새 지식 없는 순환 처리 (기본: 배치 stop, 단일 실행 off)")
+    ap.add_argument("--cache", help="배치 결과 캐시 파일 (results_db, 코드가 안 바뀐 시드는 재실행 안 함)")
     args = ap.parse_args()
-    main(args.seed, args.limit)
+    if args.seeds:
+        from tournament import parse_seeds
+        stats = batch(parse_seeds(args.seeds), args.limit, args.workers, args.jsonl,
+                      args.size, args.corpus, args.trace_dir, args.metrics, args.on_stuck or "stop",
+                      args.cache)
+        snap = stats.pop("metrics", None)
+        out = sys.stderr if args.jsonl == "-" else sys.stdout
+        print(json.dumps(stats, ensure_ascii=False), file=out)
+        if snap is not None:
+            from metrics import Metrics
+            print(Metrics().merge(snap).report(), file=out)
+    else:
+        main(args.seed, args.limit, args.size, args.trace, args.trace_path, args.metrics,
+             args.on_stuck or "off")
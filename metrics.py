@@ -0,0 +1,76 @@
+"""
+metrics.py
+────────────────────────────────────────────────────────────────────────────
+• Agent.step 계측 레지스트리
+  - Agent(metrics=Metrics()) 로 켜고, 기본값 None 이면 step 안의 `is not None`
+    검사만 남음 (trace 와 같은 방식)
+  - 구간 시간(초) : percept / update / decide / exec / log
+  - 카운터 : steps, spin_override, shots / shot_hit / shot_miss,
+             shot_seq1..3 (3-회 사격 시퀀스 몇 번째 사격인지), bump,
+             death_pit / death_wumpus, climb,
+             target_nearest_safe / target_best_unknown (_plan 이 고른 목표 출처)
+  - snapshot() → dict (에피소드 기록에 포함), merge() 로 워커 결과 합산
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Union
+
+PHASES = ("percept", "update", "decide", "exec", "log")
+
+
+class Metrics:
+    __slots__ = ("counts", "times")
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.times: Dict[str, float] = {}
+
+    def inc(self, name: str, k: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + k
+
+    def add_time(self, name: str, dt: float):
+        self.times[name] = self.times.get(name, 0.0) + dt
+
+    def reset(self):
+        self.counts.clear(); self.times.clear()
+
+    # ──────────────────────────────────────────────────────────
+    #  스냅샷 / 병합
+    # ──────────────────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        return dict(counts=dict(self.counts), times=dict(self.times))
+
+    def merge(self, other: Union["Metrics", dict]) -> "Metrics":
+        snap = other.snapshot() if isinstance(other, Metrics) else other
+        for k, v in snap["counts"].items():
+            self.counts[k] = self.counts.get(k, 0) + v
+        for k, v in snap["times"].items():
+            self.times[k] = self.times.get(k, 0.0) + v
+        return self
+
+    @classmethod
+    def merged(cls, snaps: Iterable[Union["Metrics", dict]]) -> "Metrics":
+        m = cls()
+        for s in snaps:
+            m.merge(s)
+        return m
+
+    # ──────────────────────────────────────────────────────────
+    #  출력
+    # ──────────────────────────────────────────────────────────
+    def report(self) -> str:
+        steps = max(1, self.counts.get("steps", 0))
+        total = sum(self.times.get(p, 0.0) for p in PHASES) or 1.0
+        lines = ["===== Metrics =====",
+                 f"{'phase':<10} {'total(s)':>10} {'us/step':>9} {'share':>7}"]
+        for p in PHASES:
+            t = self.times.get(p, 0.0)
+            lines.append(f"{p:<10} {t:>10.4f} {t / steps * 1e6:>9.2f} {t / total * 100:>6.1f}%")
+        lines.append("")
+        for k in sorted(self.counts):
+            lines.append(f"{k:<22} {self.counts[k]:>10}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"Metrics(counts={self.counts}, times={self.times})"
@@ -0,0 +1,223 @@
+"""
+oracle.py
+────────────────────────────────────────────────────────────────────────────
+• 전지(全知) 오라클 : 지도(World.pits / wumpi / gold_xy)를 다 아는 최적 행동열과 점수
+  - 비용은 Agent.step 과 같음 : 행동마다 -1, 금을 들고 (1,1) 에서 Climb +1000
+    (사망 -30 은 금을 잃고 (1,1) 로 돌아가므로 최적 경로에 나오지 않음)
+  - 상태 = (칸, 방향, 금 보유, 죽인 wumpus 집합, 남은 화살) 위 A* (모든 행동 비용 1,
+    휴리스틱 = wumpus 를 무시한 pit 회피 칸 거리 → 금 + Grab + 귀환, limit 을 넘을 상태는 버림)
+    · Forward : 벽 / pit / 살아 있는 wumpus 칸은 제외
+    · Shoot : 바로 앞 칸의 살아 있는 wumpus 에만 — 멀리서 쏘는 행동열은 그 wumpus 칸에 들어가기
+      직전으로 사격을 미뤄도 행동 수 · 화살 수가 같으므로 최적값은 그대로, 죽인 집합 분기만 줄어듦
+    · wumpus 를 모두 없애도 금에 못 가면 탐색 없이 바로 Climb
+    · 금을 들고 (1,1) 에 처음 닿으면 끝 → 점수 = 1000 - (행동 수 + Climb)
+    · limit 안에 못 닿으면 시작하자마자 Climb 한 -1 이 최선
+  - 배치(size, pits, wumpi, gold, 화살, limit)별로 결과를 메모 → 같은 배치가 다시 나오면 탐색 없음
+  - regret = 오라클 점수 - 에이전트 점수
+    · 에이전트 점수는 Agent.step 비용의 누적 합 (reset_position 이 performance 를 0 으로
+      되돌리므로 performance 대신 스텝마다 변화량을 더함, Climb 과 사망 구분)
+    · Episode 는 금을 들고 (1,1) 에 오면 Climb 없이 끝나므로 성공 시 빠진 Climb(+1000 -1)을 더함
+    · 순환 감지 구간 계산으로는 Climb / 사망을 구분할 수 없어 on_stuck="off" 로 끝까지 실행
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from heapq import heappop, heappush
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import multiprocessing as mp
+import os
+
+from setting import World
+from agent import Agent
+from episode import Episode
+from worldgen import generate
+from topology import E, LEFT, RIGHT, grid
+
+GOLD_BONUS = 1000
+DEATH_COST = 30
+
+
+@dataclass(frozen=True)
+class Plan:
+    score: int                                  # 최적 점수 (Climb 포함)
+    actions: Tuple[str, ...]                    # 최적 행동열 (마지막 Climb)
+
+    @property
+    def success(self) -> bool:
+        return self.score > 0
+
+
+_CACHE: Dict[tuple, Plan] = {}
+CLIMB_NOW = Plan(-1, ("Climb",))
+
+
+def layout_key(world: World, arrows: int = 3, limit: Optional[int] = None) -> tuple:
+    return (world.size, tuple(sorted(world.pits)), tuple(sorted(world.wumpi)),
+            tuple(world.gold_xy), arrows, limit)
+
+
+def solve(world: World, arrows: int = 3, limit: Optional[int] = None) -> Plan:
+    """월드 처음 배치의 최적 행동열 (배치별 메모). limit : Climb 전 행동 수 상한 (Episode limit)"""
+    key = layout_key(world, arrows, limit)
+    plan = _CACHE.get(key)
+    if plan is None:
+        plan = _CACHE[key] = _search(world, arrows, limit)
+    return plan
+
+
+def _search(world: World, arrows: int, limit: Optional[int]) -> Plan:
+    g = grid(world.size)
+    s, delta, wall, pit = g.stride, g.delta, world.wall, world.pit
+    wbit = {x * s + y: 1 << k for k, (x, y) in enumerate(sorted(world.wumpi))}
+    gold = g.id(*world.gold_xy)
+    start = g.start
+    to_gold, to_start = _distances(g, pit, gold), _distances(g, pit, start)
+    if start not in to_gold:
+        return CLIMB_NOW
+    back = to_start[gold] + 1                   # 금 칸에서 Grab + 귀환 하한
+    cap = limit if limit is not None else float("inf")
+
+    def h(i: int, has: bool) -> int:
+        """남은 행동 수 하한 (wumpus 를 무시한 칸 거리, 회전 무시) → 일관된 A* 휴리스틱"""
+        return to_start[i] if has else to_gold[i] + back
+
+    first = (start, E, False, 0, arrows)
+    best: Dict[tuple, int] = {first: 0}
+    parent: Dict[tuple, Optional[Tuple[tuple, str]]] = {first: None}
+    heap = [(h(start, False), 0, 0, first)]
+    tie = 0
+    while heap:
+        _, negn, _, st = heappop(heap)
+        n = -negn
+        if n > best[st]:
+            continue
+        i, d, has, dead, left = st
+        if has and i == start:
+            acts = ["Climb"]
+            while parent[st] is not None:
+                st, a = parent[st]
+                acts.append(a)
+            return Plan(GOLD_BONUS - n - 1, tuple(reversed(acts)))
+        nxt = [((i, d, True, dead, left), "Grab")] if i == gold and not has else []
+        nxt += [((i, LEFT[d], has, dead, left), "TurnLeft"),
+                ((i, RIGHT[d], has, dead, left), "TurnRight")]
+        j = i + delta[d]
+        b = wbit.get(j, 0)
+        if b and not b & dead:
+            if left:
+                nxt.append(((i, d, has, dead | b, left - 1), "Shoot"))
+        elif not wall[j] and not pit[j]:
+            nxt.append(((j, d, has, dead, left), "Forward"))
+        for ns, a in nxt:
+            f = n + 1 + h(ns[0], ns[2])
+            if f <= cap and n + 1 < best.get(ns, cap + 1):
+                best[ns] = n + 1
+                parent[ns] = (st, a)
+                tie += 1
+                heappush(heap, (f, -(n + 1), tie, ns))    # 같은 f 면 더 깊은 상태 먼저
+    return CLIMB_NOW
+
+
+def _distances(g, pit, goal: int) -> Dict[int, int]:
+    """pit 만 피한 (wumpus 무시) 칸 거리 goal → 각 칸"""
+    dist, q = {goal: 0}, deque([goal])
+    while q:
+        i = q.popleft()
+        for j in g.nbrs[i]:
+            if j not in dist and not pit[j]:
+                dist[j] = dist[i] + 1
+                q.append(j)
+    return dist
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  에이전트 점수 / regret
+# ──────────────────────────────────────────────────────────────────────────
+def agent_score(ep: Episode) -> int:
+    """에피소드를 끝까지 돌리며 Agent.step 비용을 누적 (빠진 Climb 포함)"""
+    ag, total = ep.agent, 0
+    while not ep.done:
+        pos, before = (ag.x, ag.y), ag.performance
+        if ep.advance():
+            total += ag.performance - before
+        elif pos == (1, 1):
+            total -= 1                          # 금 없이 Climb ((1,1) 옆은 안전 칸 → 사망 아님)
+        else:
+            total -= 1 + DEATH_COST
+    if ep.success:
+        total += GOLD_BONUS - 1
+    return total
+
+
+def regret_seed(world: World, limit: int = 120) -> dict:
+    plan = solve(world, 3, limit)               # Episode 가 월드를 바꾸기 전에
+    ep = Episode(world, Agent(world, trace=None), limit, world.seed, done=limit <= 0)
+    score = agent_score(ep)
+    return dict(seed=world.seed, success=ep.success, oracle_success=plan.success,
+                oracle=plan.score, oracle_steps=len(plan.actions), agent=score,
+                regret=plan.score - score, steps=ep.step_no, deaths=ep.deaths)
+
+
+def run_chunk(seeds: List[int], limit: int = 120, size: int = 4) -> List[dict]:
+    return [regret_seed(w, limit) for w in generate(seeds, size).worlds()]
+
+
+def run_seeds(seeds: Iterable[int], limit: int = 120, size: int = 4,
+              workers: Optional[int] = None) -> Iterator[dict]:
+    """시드 순서대로 regret 기록 (배치 메모는 프로세스별)"""
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    step = max(1, min(1000, len(seeds) // (workers * 8)))
+    chunks = [seeds[i:i + step] for i in range(0, len(seeds), step)]
+    job = partial(run_chunk, limit=limit, size=size)
+    if workers == 1 or len(chunks) < 2:
+        for recs in map(job, chunks):
+            yield from recs
+        return
+    with mp.Pool(workers) as pool:
+        for recs in pool.imap(job, chunks):
+            yield from recs
+
+
+def summarize(records: Iterable[dict], top: int = 10) -> dict:
+    recs = list(records)
+    n = max(len(recs), 1)
+    worst = sorted(recs, key=lambda r: -r["regret"])[:top]
+    return dict(episodes=len(recs), successes=sum(r["success"] for r in recs),
+                oracle_successes=sum(r["oracle_success"] for r in recs),
+                mean_oracle=sum(r["oracle"] for r in recs) / n,
+                mean_agent=sum(r["agent"] for r in recs) / n,
+                mean_regret=sum(r["regret"] for r in recs) / n,
+                worst=[(r["seed"], r["regret"]) for r in worst])
+
+
+if __name__ == "__main__":
+    import argparse, json
+    from tournament import parse_seeds
+    ap = argparse.ArgumentParser(description="전지 오라클 최적 점수 / 에이전트 regret")
+    ap.add_argument("--seed", type=int, help="한 시드의 최적 행동열 출력")
+    ap.add_argument("--seeds", help="시드 범위 (예: 0-9999) → regret 집계")
+    ap.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    ap.add_argument("--workers", type=int, help="프로세스 수 (기본: 전체 코어)")
+    ap.add_argument("--top", type=int, default=10, help="regret 큰 시드 몇 개 출력")
+    ap.add_argument("--jsonl", help="시드별 regret 기록 저장 경로 (regret 큰 순)")
+    args = ap.parse_args()
+    if args.seeds:
+        recs = list(run_seeds(parse_seeds(args.seeds), args.limit, args.size, args.workers))
+        if args.jsonl:
+            with open(args.jsonl, "w") as f:
+                for r in sorted(recs, key=lambda r: -r["regret"]):
+                    f.write(json.dumps(r) + "\n")
+        print(json.dumps(summarize(recs, args.top)))
+    else:
+        from main import print_world_debug
+        w = World(args.seed, args.size)
+        print_world_debug(w)
+        plan = solve(w, 3, args.limit)
+        print(f"최적 점수 : {plan.score}  ({len(plan.actions)} 행동)")
+        print(" ".join(plan.actions))
+        print(json.dumps(regret_seed(w, args.limit)))
@@ -0,0 +1,83 @@
+"""
+planner.py
+────────────────────────────────────────────────────────────────────────────
+• known-safe 칸 위의 최단 경로 계획 (회전 비용 포함)
+  - 상태 = (칸, 방향), Forward / TurnLeft / TurnRight 모두 비용 1 → 목표에서
+    거꾸로 BFS 한 번으로 거리장(distance field)을 만든다
+  - 거리장은 목표별로 캐시, 통행 가능 마스크(= KB)가 바뀔 때만 전부 무효화
+  - 다음 행동 = 거리가 1 줄어드는 행동 (Forward → TurnLeft → TurnRight 순)
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Optional
+
+from kb import Board
+
+ACTS = ("Forward", "TurnLeft", "TurnRight")
+
+
+class Planner:
+    def __init__(self, board: Board):
+        self.board = board
+        self.delta = board.grid.delta           # 방향 번호 E, S, W, N 의 id 변화량
+        self.passable = 0
+        self.fields: Dict[int, Dict[int, int]] = {}
+
+    def _field(self, target: int) -> Dict[int, int]:
+        """target 까지 남은 행동 수: dist[칸*4 + 방향]"""
+        f = self.fields.get(target)
+        if f is not None:
+            return f
+        delta, ok = self.delta, self.passable
+        f = {target * 4 + d: 0 for d in range(4)}
+        q = deque(f)
+        while q:
+            s = q.popleft()
+            c, d = divmod(s, 4)
+            nd = f[s] + 1
+            back = c - delta[d]
+            preds = (s + (1 if d < 3 else -3),       # (c, right(d)) 에서 TurnLeft
+                     s - (1 if d > 0 else -3))       # (c, left(d))  에서 TurnRight
+            if (ok >> back) & 1:
+                preds += (back * 4 + d,)             # (c-δ, d) 에서 Forward
+            for p in preds:
+                if p not in f:
+                    f[p] = nd
+                    q.append(p)
+        self.fields[target] = f
+        return f
+
+    def distance(self, passable: int, x: int, y: int, d: int,
+                 tx: int, ty: int) -> Optional[int]:
+        self.sync(passable)
+        b = self.board
+        return self._field(b.id(tx, ty)).get(b.id(x, y) * 4 + d)
+
+    def fork(self) -> "Planner":
+        """캐시된 거리장은 만든 뒤 바뀌지 않으므로 사전만 얕게 복사"""
+        p = Planner(self.board)
+        p.passable, p.fields = self.passable, dict(self.fields)
+        return p
+
+    def sync(self, passable: int):
+        if passable != self.passable:
+            self.passable = passable
+            self.fields.clear()
+
+    def next_action(self, passable: int, x: int, y: int, d: int,
+                    tx: int, ty: int) -> Optional[str]:
+        """(x, y, d) 에서 (tx, ty) 로 가는 최단 경로의 첫 행동. 경로가 없거나 이미 도착이면 None"""
+        self.sync(passable)
+        b = self.board
+        f = self._field(b.id(tx, ty))
+        c = b.id(x, y)
+        cur = f.get(c * 4 + d)
+        if not cur:
+            return None
+        nxt = (c + self.delta[d]) * 4 + d, c * 4 + (d - 1) % 4, c * 4 + (d + 1) % 4
+        for act, s in zip(ACTS, nxt):
+            if f.get(s) == cur - 1:
+                return act
+        return None
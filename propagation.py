@@ -0,0 +1,183 @@
+"""
+propagation.py
+────────────────────────────────────────────────────────────────────────────
+• 증분 제약 전파 KB (pit 층 / wumpus 층)
+  - 칸마다 층별 상태 : yes(확정 위험) / no(확정 없음) / 모름 → 비트마스크 두 개
+  - 관측 하나가 들어올 때 바뀐 칸에서만 전파
+    · 살아서 선 칸          → 두 층 모두 no
+    · breeze / stench 없음  → 이웃 전부 no           (부정 정보)
+    · breeze / stench 있음  → 절(clause) "이웃 중 최소 하나 yes"
+  - 절은 watched literal 두 개로 감시 : 감시 칸이 no 가 되면 그 절만 다시 보고,
+    다른 감시 칸을 못 찾으면 남은 하나가 yes (unit propagation)
+  - 생성 규칙도 제약으로 사용
+    · 한 칸에 pit / wumpus 가 같이 있지 않음 → 한 층 yes 면 다른 층 no
+    · 종류별 상한(max_pits / max_wumpi) 에 닿으면 그 층의 나머지 칸 전부 no
+  - wumpus 사살(scream) 시 어느 wumpus 가 죽었는지 모르므로
+    wumpus 층의 yes 와 절을 버리고 no 만 유지, wumpus 상한은 하나 낮춤
+  - snapshot / restore 는 층별 (yes, no, 절, 모순 수, 상한) → scream 이전으로 되감으면 상한도 복원
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+
+from kb import Board
+
+
+class Layer:
+    """한 종류 위험(pit 또는 wumpus)의 yes/no 마스크 + watched-literal 절"""
+
+    def __init__(self, board: Board, cap: int):
+        self.board = board
+        self.cap = cap
+        self.yes = 0
+        self.no = 0
+        self.clauses: List[int] = []                # 절 = 후보 칸 마스크
+        self.watched: List[List[int]] = []          # 절마다 감시 칸 두 개
+        self.watch: Dict[int, List[int]] = {}       # 칸 id → 그 칸을 감시하는 절 번호
+        self.conflicts = 0                          # 만족 불가 절 (관측 모순)
+
+    def fork(self) -> "Layer":
+        l = Layer.__new__(Layer)
+        l.__dict__.update(self.__dict__)
+        l.clauses = list(self.clauses)
+        l.watched = [w[:] for w in self.watched]
+        l.watch = {i: ks[:] for i, ks in self.watch.items()}
+        return l
+
+    @staticmethod
+    def _low(m: int) -> int:
+        return (m & -m).bit_length() - 1
+
+    def add_clause(self, mask: int, queue: list):
+        mask &= self.board.interior
+        if mask & self.yes:
+            return                                  # 이미 만족
+        live = mask & ~self.no
+        if not live:
+            self.conflicts += 1
+            return
+        a = self._low(live)
+        rest = live ^ (1 << a)
+        if not rest:                                # 후보 하나 → 바로 yes
+            queue.append((self, a, True))
+            return
+        b = self._low(rest)
+        k = len(self.clauses)
+        self.clauses.append(mask)
+        self.watched.append([a, b])
+        self.watch.setdefault(a, []).append(k)
+        self.watch.setdefault(b, []).append(k)
+
+    def on_no(self, i: int, queue: list):
+        """칸 i 가 no 로 바뀜 → i 를 감시하던 절만 갱신"""
+        for k in self.watch.pop(i, ()):
+            mask = self.clauses[k]
+            if mask & self.yes:
+                continue                            # 만족된 절
+            a, b = self.watched[k]
+            other = b if a == i else a
+            spare = mask & ~self.no & ~(1 << other)
+            if spare:
+                j = self._low(spare)
+                self.watched[k] = [other, j]
+                self.watch.setdefault(j, []).append(k)
+            elif (self.no >> other) & 1:
+                self.conflicts += 1
+            else:
+                queue.append((self, other, True))   # unit
+
+
+class Propagator:
+    """Agent 의 KB : observe / fact / scream 으로 갱신, safe / pit.yes / wumpus.yes 로 조회"""
+
+    def __init__(self, board: Board, cap: int, wumpus_cap: Optional[int] = None):
+        """cap : pit 개수 상한 (wumpus_cap 생략 시 wumpus 도 같은 상한)"""
+        self.board = board
+        self.pit = Layer(board, cap)
+        self.wumpus = Layer(board, cap if wumpus_cap is None else wumpus_cap)
+
+    @property
+    def safe(self) -> int:
+        return self.pit.no & self.wumpus.no
+
+    # ──────────────────────────────────────────────────────────
+    #  입력
+    # ──────────────────────────────────────────────────────────
+    def observe(self, i: int, breeze: bool, stench: bool):
+        """칸 i 에 살아서 서서 breeze / stench 유무를 봄"""
+        nb = self.board.nbr(i) & self.board.interior
+        q: list = [(self.pit, i, False), (self.wumpus, i, False)]
+        for layer, on in ((self.pit, breeze), (self.wumpus, stench)):
+            if on:
+                layer.add_clause(nb, q)
+            else:
+                q.extend((layer, c, False) for c in self.board.ids(nb & ~layer.no))
+        self._run(q)
+
+    def fact(self, i: int, pit: Optional[bool] = None, wumpus: Optional[bool] = None):
+        """칸 i 의 확정 사실 (시작 칸, 사망 칸 등)"""
+        q: list = []
+        if pit is not None:
+            q.append((self.pit, i, pit))
+        if wumpus is not None:
+            q.append((self.wumpus, i, wumpus))
+        self._run(q)
+
+    def scream(self):
+        """wumpus 하나가 죽음 → 위치 정보는 버리고 남은 wumpus 상한을 하나 낮춤"""
+        w = self.wumpus
+        w.yes = 0
+        w.cap = max(0, w.cap - 1)
+        w.clauses.clear(); w.watched.clear(); w.watch.clear()
+
+    # ──────────────────────────────────────────────────────────
+    #  전파
+    # ──────────────────────────────────────────────────────────
+    def _run(self, q: list):
+        interior = self.board.interior
+        while q:
+            layer, i, val = q.pop()
+            bit = 1 << i
+            if val:
+                if layer.yes & bit:
+                    continue
+                if layer.no & bit:
+                    layer.conflicts += 1
+                    continue
+                layer.yes |= bit
+                other = self.wumpus if layer is self.pit else self.pit
+                q.append((other, i, False))                     # 겹침 금지
+                if layer.yes.bit_count() >= layer.cap:          # 상한 도달
+                    rest = interior & ~layer.yes & ~layer.no
+                    q.extend((layer, c, False) for c in self.board.ids(rest))
+            else:
+                if layer.no & bit:
+                    continue
+                if layer.yes & bit:
+                    layer.conflicts += 1
+                    continue
+                layer.no |= bit
+                layer.on_no(i, q)
+
+    # ──────────────────────────────────────────────────────────
+    #  스냅샷 / 복사
+    # ──────────────────────────────────────────────────────────
+    def fork(self) -> "Propagator":
+        p = Propagator.__new__(Propagator)
+        p.board = self.board
+        p.pit, p.wumpus = self.pit.fork(), self.wumpus.fork()
+        return p
+
+    def snapshot(self) -> Tuple:
+        return tuple((l.yes, l.no, tuple(l.clauses), l.conflicts, l.cap)
+                     for l in (self.pit, self.wumpus))
+
+    def restore(self, snap: Tuple):
+        for l, (yes, no, clauses, conflicts, cap) in zip((self.pit, self.wumpus), snap):
+            l.yes, l.no, l.conflicts, l.cap = yes, no, conflicts, cap
+            l.clauses, l.watched, l.watch = [], [], {}
+            q: list = []
+            for m in clauses:
+                l.add_clause(m, q)
+            self._run(q)
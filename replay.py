@@ -0,0 +1,186 @@
+"""
+replay.py
+────────────────────────────────────────────────────────────────────────────
+• 기록된 실행을 임의 스텝으로 되감기 / 빨리감기
+  - 에이전트는 월드가 같으면 결정적이므로, 시드(또는 binary trace 헤더)로 월드를
+    다시 만들고 스텝을 재실행해 상태를 복원
+  - every 스텝마다 Episode.snapshot() 체크포인트 저장 → seek(n) 은 n 이하의
+    가장 가까운 체크포인트에서 복원 후 남은 스텝만 재실행
+  - trace 와 함께 열면 재실행한 행동을 기록과 비교해 어긋나면 ReplayMismatch
+    · 헤더의 스텝 한도 / on_stuck / risk / 생성 파라미터로 기록 때와 같은 Episode 를 만듦
+      (on_stuck="stop" 은 기록이 순환 확정 스텝에서 끝나도 남은 스텝을 계산해 한도까지)
+  - wumpus_gui.py 의 스크럽(←/→), 분석 스크립트의 state_at / states_at 에서 사용
+  - verify : 새로 돌린 기록을 기대값으로 끝까지 간 뒤 매 스텝 뒤로 되감으며 재실행
+    (scream / 사망 이전으로 되감는 경우 포함) → 스텝마다 에이전트 상태(KB 포함)와
+    끝 기록을 앞으로만 진행한 새 실행과 비교
+    `python replay.py --seeds 0-59 --size 5 --every 7 [--on-stuck stop|recover]`
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from bisect import bisect_right
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence
+import multiprocessing as mp
+import os
+
+from setting import World
+from agent import Agent
+from episode import Episode
+from tracelog import ListTrace, RingTrace, Record, read_trace, row
+
+
+class ReplayMismatch(RuntimeError):
+    """재실행 결과가 기록된 trace 와 다름 (에이전트 코드가 바뀐 경우 등)"""
+
+
+class Replay:
+    def __init__(self, world: World, limit: int = 120, every: int = 16,
+                 expected: Optional[Sequence[Record]] = None, on_stuck: str = "off",
+                 risk: str = "exact"):
+        self.ep = Episode(world, Agent(world, trace=None, risk=risk), limit, world.seed,
+                          done=limit <= 0, on_stuck=on_stuck)
+        self.every = max(1, every)
+        self.expected = expected
+        self.log = ListTrace()                  # 처음 실행한 스텝의 기록
+        self._last = RingTrace(1)               # 다시 실행하는 스텝의 마지막 기록 (검증용)
+        self.furthest = 0
+        self.end: Optional[int] = None          # 에피소드가 끝난 스텝 (알게 되면)
+        self.checkpoints: Dict[int, tuple] = {0: self.ep.snapshot()}
+        self._steps: List[int] = [0]
+
+    @classmethod
+    def from_seed(cls, seed: int, size: int = 4, limit: int = 120, every: int = 16) -> "Replay":
+        return cls(World(seed, size), limit, every)
+
+    @classmethod
+    def from_trace(cls, path: str, every: int = 16) -> "Replay":
+        head, recs = read_trace(path)
+        if head["seed"] is None:
+            raise ValueError(f"{path}: 시드가 기록되지 않은 trace 는 재현할 수 없음")
+        recs = list(recs)
+        limit = len(recs) if head["limit"] is None else head["limit"]      # v1 : 기록 길이
+        return cls(World(head["seed"], head["size"], **head["params"]), limit, every, recs,
+                   head["on_stuck"], head["risk"])
+
+    # ──────────────────────────────────────────────────────────
+    #  이동
+    # ──────────────────────────────────────────────────────────
+    @property
+    def step(self) -> int:
+        return self.ep.step_no
+
+    def _advance(self):
+        ep = self.ep
+        fresh = ep.step_no >= self.furthest
+        sink = self.log if fresh else self._last
+        ep.agent.trace = sink
+        ep.advance()
+        n = ep.step_no                          # stop 으로 끝나면 한도로 건너뜀
+        if self.expected is not None:
+            got = sink.buf[-1]
+            want = tuple(self.expected[got[0] - 1]) if got[0] <= len(self.expected) else None
+            if got != want:
+                raise ReplayMismatch(f"step {got[0]}: 재실행 {row(got)} ≠ 기록 "
+                                     f"{row(want) if want else '없음'}")
+        if n % self.every == 0 and n not in self.checkpoints:
+            self.checkpoints[n] = ep.snapshot()
+            self._steps.insert(bisect_right(self._steps, n), n)
+        self.furthest = max(self.furthest, n)
+        if ep.done:
+            self.end = n
+
+    def seek(self, n: int) -> Episode:
+        """스텝 n 실행 직후 상태로 이동 (n=0 은 시작 상태). 에피소드가 먼저 끝나면 끝에서 멈춤"""
+        n = max(0, n if self.end is None else min(n, self.end))
+        ep = self.ep
+        c = self._steps[bisect_right(self._steps, n) - 1]
+        if not c <= ep.step_no <= n:
+            ep.restore(self.checkpoints[c])
+        while ep.step_no < n and not ep.done:
+            self._advance()
+        return ep
+
+    def forward(self, k: int = 1) -> Episode:
+        return self.seek(self.step + k)
+
+    def back(self, k: int = 1) -> Episode:
+        return self.seek(self.step - k)
+
+    # ──────────────────────────────────────────────────────────
+    #  상태 요약
+    # ──────────────────────────────────────────────────────────
+    def state(self, n: Optional[int] = None) -> dict:
+        ep = self.seek(self.step if n is None else n)
+        ag, w = ep.agent, ep.world
+        return dict(seed=ep.seed, step=ep.step_no, pos=(ag.x, ag.y), dir=ag.dir.name,
+                    arrows=ag.arrows, has_gold=ag.has_gold, performance=ag.performance,
+                    deaths=ep.deaths, done=ep.done, success=ep.success,
+                    visited=sorted(ag.visited), safe=sorted(ag.safe),
+                    definite_pit=sorted(ag.definite_pit),
+                    definite_wumpus=sorted(ag.definite_wumpus),
+                    wumpi=sorted(w.wumpi))
+
+
+def state_at(path: str, n: int, every: int = 16) -> dict:
+    """binary trace 파일 하나의 스텝 n 상태"""
+    return Replay.from_trace(path, every).state(n)
+
+
+def states_at(paths: Iterable[str], n: int, workers: Optional[int] = None) -> List[dict]:
+    """여러 trace 의 스텝 n 상태를 프로세스 풀로 병렬 계산"""
+    paths = list(paths)
+    job = partial(state_at, n=n)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) < 2:
+        return list(map(job, paths))
+    with mp.Pool(workers) as pool:
+        return pool.map(job, paths, chunksize=max(1, len(paths) // (workers * 8)))
+
+
+def _fingerprint(ep: Episode) -> tuple:
+    """비교용 상태 : 에이전트 상태 / 관측 마스크 + KB 층별 yes · no · 상한 (절 목록 순서는 제외)"""
+    ag, kb = ep.agent, ep.agent.kb
+    return (tuple(getattr(ag, k) for k in ag._STATE), tuple(getattr(ag, k).bits for k in ag._KB),
+            tuple((l.yes, l.no, l.cap) for l in (kb.pit, kb.wumpus)), ep.deaths, ep.recovering)
+
+
+def verify(seed: int, size: int = 4, limit: int = 120, every: int = 16,
+           on_stuck: str = "off") -> Optional[str]:
+    """시드 하나의 되감기 검사. 어긋나면 설명 문자열, 같으면 None"""
+    ref = Episode.from_seed(seed, limit, size, on_stuck=on_stuck)
+    snaps = [_fingerprint(ref)]                 # 스텝 n 직후 상태 (앞으로만 진행)
+    while not ref.done:
+        ref.advance()
+        snaps.append(_fingerprint(ref))
+    recs = list(ref.agent.trace.buf)
+    r = Replay(World(seed, size), limit, every, recs, on_stuck)
+    try:
+        r.seek(len(recs))
+        for n in range(len(recs), -1, -1):      # 끝에서 한 스텝씩 뒤로 (체크포인트 복원 + 재실행)
+            if _fingerprint(r.seek(n)) != snaps[n]:
+                return f"seed {seed}: seek({n}) 상태가 새 실행과 다름"
+        ep = r.seek(limit)
+    except ReplayMismatch as e:
+        return f"seed {seed}: {e}"
+    if ep.record() != ref.record():
+        return f"seed {seed}: 끝 상태 {ep.record()} ≠ 새 실행 {ref.record()}"
+    return None
+
+
+if __name__ == "__main__":
+    import argparse
+    from tournament import parse_seeds
+    ap = argparse.ArgumentParser(description="되감기(seek) 재실행이 새 실행과 같은지 검사")
+    ap.add_argument("--seeds", default="0-59", help="시드 범위/목록")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    ap.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    ap.add_argument("--every", type=int, default=7, help="체크포인트 간격")
+    ap.add_argument("--on-stuck", default="off", choices=["off", "stop", "recover"], help="순환 처리")
+    args = ap.parse_args()
+    bad = [m for m in (verify(s, args.size, args.limit, args.every, args.on_stuck)
+                       for s in parse_seeds(args.seeds)) if m]
+    for m in bad:
+        print(m)
+    print(f"mismatch {len(bad)}")
+    raise SystemExit(1 if bad else 0)
@@ -0,0 +1,176 @@
+"""
+results_db.py
+────────────────────────────────────────────────────────────────────────────
+• 시드별 실행 결과 캐시 (SQLite 파일 하나)
+  - 키 = (에이전트 코드 해시, 월드 생성기 해시, size, seed, limit, policy)
+    · 에이전트 해시 : 결과에 영향을 주는 소스(AGENT_FILES) 내용의 sha1
+    · 생성기 해시   : 배치를 정하는 소스(GEN_FILES) 내용의 sha1
+    · policy       : Episode on_stuck (off / stop / recover)
+    → wumpus_gui.py · README 등만 바뀌면 키가 그대로라 다시 돌리지 않음
+  - tournament.run_seeds(cache=...) : 캐시에 없는 시드만 실행 후 저장
+  - 조회 : successes / failing (현재 버전), regressed (두 버전 사이 성공 → 실패), versions
+  - `python results_db.py failing` 처럼 명령행에서 바로 조회
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import os
+import sqlite3
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+AGENT_FILES = ("agent.py", "episode.py", "kb.py", "frontier.py", "planner.py",
+               "inference.py", "propagation.py", "loopguard.py", "setting.py", "topology.py",
+               "tournament.py")
+GEN_FILES = ("setting.py", "topology.py", "worldgen.py")
+DEFAULT_DB = "results.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    agent TEXT, gen TEXT, size INTEGER, seed INTEGER, step_limit INTEGER, policy TEXT,
+    success INTEGER, steps INTEGER, deaths INTEGER, performance INTEGER,
+    arrows_used INTEGER, stuck INTEGER,
+    PRIMARY KEY (agent, gen, size, seed, step_limit, policy)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_outcome
+    ON results (agent, gen, size, step_limit, policy, success);
+CREATE TABLE IF NOT EXISTS versions (
+    agent TEXT, gen TEXT, first_seen REAL, PRIMARY KEY (agent, gen)
+);
+"""
+_COLS = ("success", "steps", "deaths", "performance", "arrows_used", "stuck")
+
+
+@lru_cache(maxsize=None)
+def code_hash(files: Tuple[str, ...]) -> str:
+    h = hashlib.sha1()
+    for name in files:
+        h.update(name.encode())
+        with open(os.path.join(HERE, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+def agent_version() -> str:
+    return code_hash(AGENT_FILES)
+
+
+def gen_version() -> str:
+    return code_hash(GEN_FILES)
+
+
+class ResultsDB:
+    def __init__(self, path: str = DEFAULT_DB, size: int = 4, limit: int = 120,
+                 policy: str = "stop", agent: Optional[str] = None, gen: Optional[str] = None):
+        """size / limit / policy / 버전은 조회 · 저장의 기본 키 (agent, gen 생략 시 현재 코드)"""
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+        self.size, self.limit, self.policy = size, limit, policy
+        self.agent = agent or agent_version()
+        self.gen = gen or gen_version()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _key(self, agent: Optional[str] = None) -> tuple:
+        return (agent or self.agent, self.gen, self.size, self.limit, self.policy)
+
+    # ──────────────────────────────────────────────────────────
+    #  읽기 / 쓰기
+    # ──────────────────────────────────────────────────────────
+    def get(self, seeds: Iterable[int]) -> Dict[int, dict]:
+        """캐시에 있는 시드 → 기록 (tournament 기록과 같은 형식, policy off 면 stuck 없음)"""
+        seeds = list(seeds)
+        out: Dict[int, dict] = {}
+        q = ("SELECT seed, " + ", ".join(_COLS) + " FROM results WHERE agent=? AND gen=? "
+             "AND size=? AND step_limit=? AND policy=? AND seed IN ({})")
+        for i in range(0, len(seeds), 500):             # SQLite 변수 개수 한도
+            part = seeds[i:i + 500]
+            for seed, success, *rest in self.db.execute(q.format(",".join("?" * len(part))),
+                                                        (*self._key(), *part)):
+                rec = dict(seed=seed, success=bool(success),
+                           **dict(zip(_COLS[1:-1], rest[:-1])))
+                if self.policy != "off":
+                    rec["stuck"] = rest[-1]
+                out[seed] = rec
+        return out
+
+    def put(self, records: Iterable[dict]):
+        agent, gen, size, limit, policy = self._key()
+        rows = [(agent, gen, size, r["seed"], limit, policy, int(r["success"]), r["steps"],
+                 r["deaths"], r["performance"], r["arrows_used"], r.get("stuck"))
+                for r in records]
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO results VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+            self.db.execute("INSERT OR IGNORE INTO versions VALUES (?,?,?)", (agent, gen, time.time()))
+
+    # ──────────────────────────────────────────────────────────
+    #  조회
+    # ──────────────────────────────────────────────────────────
+    def _seeds(self, success: int, agent: Optional[str] = None) -> List[int]:
+        return [s for s, in self.db.execute(
+            "SELECT seed FROM results WHERE agent=? AND gen=? AND size=? AND step_limit=? "
+            "AND policy=? AND success=? ORDER BY seed", (*self._key(agent), success))]
+
+    def successes(self, agent: Optional[str] = None) -> List[int]:
+        return self._seeds(1, agent)
+
+    def failing(self, agent: Optional[str] = None) -> List[int]:
+        return self._seeds(0, agent)
+
+    def regressed(self, old: str, new: Optional[str] = None) -> List[int]:
+        """old 버전에서 성공했지만 new(기본: 현재) 버전에서 실패한 시드 (둘 다 기록이 있는 것만)"""
+        return [s for s, in self.db.execute(
+            "SELECT a.seed FROM results a JOIN results b "
+            "ON a.gen=b.gen AND a.size=b.size AND a.seed=b.seed "
+            "AND a.step_limit=b.step_limit AND a.policy=b.policy "
+            "WHERE a.agent=? AND b.agent=? AND a.gen=? AND a.size=? AND a.step_limit=? "
+            "AND a.policy=? AND a.success=1 AND b.success=0 ORDER BY a.seed",
+            (old, new or self.agent, *self._key()[1:]))]
+
+    def versions(self) -> List[Tuple[str, str, float, int, int]]:
+        """(agent, gen, 처음 저장 시각, 기록 수, 성공 수) — 오래된 순"""
+        return list(self.db.execute(
+            "SELECT v.agent, v.gen, v.first_seen, COUNT(r.seed), COALESCE(SUM(r.success), 0) "
+            "FROM versions v LEFT JOIN results r ON r.agent=v.agent AND r.gen=v.gen "
+            "GROUP BY v.agent, v.gen ORDER BY v.first_seen"))
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="결과 캐시 조회")
+    ap.add_argument("query", choices=["versions", "successes", "failing", "regressed"])
+    ap.add_argument("old", nargs="?", help="regressed : 비교할 이전 에이전트 버전 (기본: 현재 직전 버전)")
+    ap.add_argument("--db", default=DEFAULT_DB, help="캐시 파일 경로")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    ap.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    ap.add_argument("--policy", default="stop", choices=["off", "stop", "recover"],
+                    help="실행 시 on_stuck")
+    ap.add_argument("--agent", help="에이전트 버전 (기본: 현재 코드)")
+    args = ap.parse_args()
+    with ResultsDB(args.db, args.size, args.limit, args.policy, args.agent) as db:
+        if args.query == "versions":
+            for agent, gen, t, n, ok in db.versions():
+                mark = " *" if agent == db.agent else ""
+                print(f"{agent} {gen} {time.strftime('%Y-%m-%d %H:%M', time.localtime(t))} "
+                      f"{ok}/{n}{mark}")
+        elif args.query == "regressed":
+            old = args.old
+            if old is None:
+                prev = [a for a, *_ in db.versions() if a != db.agent]
+                if not prev:
+                    raise SystemExit("비교할 이전 버전이 없음")
+                old = prev[-1]
+            print(" ".join(map(str, db.regressed(old))))
+        else:
+            print(" ".join(map(str, getattr(db, args.query)())))
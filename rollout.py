@@ -0,0 +1,259 @@
+"""
+rollout.py
+────────────────────────────────────────────────────────────────────────────
+• Monte-Carlo 롤아웃 플래너 (Agent._decide 위의 한 수 앞보기)
+  - sample_layout_kb : 에이전트 KB 와 맞는 숨은 배치(pit / wumpus / gold) 샘플링
+    · Propagator 의 yes / no 는 고정, 남은 칸은 생성 사전확률
+      (wumpus 먼저 wumpus_prob, pit 은 wumpus 없는 칸에 pit_prob — 월드 생성 파라미터)
+    · breeze / stench 절은 연결 요소별 기각 샘플링, 종류별 상한은 전체 기각
+      (wumpus 상한은 scream 마다 하나씩 낮아진 KB 상한)
+    · gold 는 아직 보지 못한 칸 중 균등 (지금 칸이 glitter 면 그 칸)
+  - rollout : Agent.fork(가상 월드) 로 분기 → 첫 행동을 강제한 뒤 기본 정책으로
+    horizon 스텝 진행, 가치 = -스텝 - 30×사망 + 1000×성공(또는 금 들고 Climb)
+  - RolloutPlanner.best_action : 샘플 월드마다 모든 후보 행동을 롤아웃해 평균 가치 최대 행동.
+    시간 예산 안에서 프로세스 풀(workers>1) 또는 현재 프로세스로 반복
+    · 워커에는 실제 월드를 빼고 보냄 (숨은 상태는 샘플로만 접근)
+    · 생성 파라미터(World.params)는 공개 정보 → 샘플링 / 가상 월드에 그대로 전달
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import multiprocessing as mp
+import os
+import random
+import time
+
+from setting import World, SAFE_STARTS
+from agent import Agent
+from episode import Episode
+from inference import components
+
+Layout = Tuple[List[Tuple[int, int]], List[Tuple[int, int]], Tuple[int, int]]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  KB 와 맞는 숨은 상태 샘플링
+# ──────────────────────────────────────────────────────────────────────────
+def _sample_layer(board, rng: random.Random, p: float, yes: int, no: int,
+                  clauses: List[int], tries: int) -> Optional[int]:
+    free = board.interior & ~yes & ~no
+    m = yes
+    constrained = 0
+    for cm, group in components([c & free for c in clauses if not c & yes]):
+        constrained |= cm
+        cells = list(board.ids(cm))
+        for _ in range(tries):
+            got = 0
+            for i in cells:
+                if rng.random() < p:
+                    got |= 1 << i
+            if all(got & c for c in group):
+                break
+        else:
+            return None
+        m |= got
+    for i in board.ids(free & ~constrained):
+        if rng.random() < p:
+            m |= 1 << i
+    return m
+
+
+def sample_layout_kb(agent: Agent, rng: random.Random, glitter: bool = False,
+                     tries: int = 64, params: Optional[dict] = None) -> Optional[Layout]:
+    """agent 의 관측과 모순 없는 배치 하나 (tries 번 안에 못 찾으면 None).
+    params : 생성 파라미터 (World.params, 생략 시 agent.inference / KB 의 값)"""
+    b, kb, inf = agent.board, agent.kb, agent.inference
+    params = params or {}
+    pit_prob = params.get("pit_prob", inf.pit_prob)
+    wumpus_prob = params.get("wumpus_prob", inf.wumpus_prob)
+    pit_cap = min(kb.pit.cap, params.get("max_pits") or kb.pit.cap)
+    wumpus_cap = min(kb.wumpus.cap, params.get("max_wumpi") or kb.wumpus.cap)    # scream 반영
+    starts = b.mask(SAFE_STARTS)
+    for _ in range(tries):
+        wm = _sample_layer(b, rng, wumpus_prob, kb.wumpus.yes, kb.wumpus.no | kb.pit.yes | starts,
+                           kb.wumpus.clauses, tries)
+        if wm is None or wm.bit_count() > wumpus_cap:
+            continue
+        pm = _sample_layer(b, rng, pit_prob, kb.pit.yes, kb.pit.no | wm | starts,
+                           kb.pit.clauses, tries)
+        if pm is None or pm.bit_count() > pit_cap:
+            continue
+        here = b.id(agent.x, agent.y)
+        if glitter:
+            gold = here
+        else:
+            cand = list(b.ids(b.interior & ~starts & ~pm & ~wm & ~agent.visited.bits))
+            if not cand:
+                if not agent.has_gold:
+                    continue
+                cand = [here]
+            gold = rng.choice(cand)
+        return ([b.xy(i) for i in b.ids(pm)], [b.xy(i) for i in b.ids(wm)], b.xy(gold))
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────────────
+#  롤아웃
+# ──────────────────────────────────────────────────────────────────────────
+def rollout(agent: Agent, world: World, act: Optional[str], horizon: int) -> float:
+    """agent 를 world 로 분기해 act 부터 horizon 스텝 진행한 가치 (act=None 이면 처음부터 기본 정책)"""
+    ag = agent.fork(world)
+    value = 0.0
+    for t in range(horizon):
+        value -= 1
+        alive = ag.step(t + 1, act if t == 0 else None)
+        if not alive:
+            if world.tile_has_pit(ag.x, ag.y) or world.tile_has_live_wumpus(ag.x, ag.y):
+                value -= 30
+                ag.reset_position()
+                continue
+            return value + (1000 if ag.has_gold else 0)          # Climb
+        if ag.has_gold and (ag.x, ag.y) == (1, 1):
+            return value + 1000
+    return value
+
+
+def _job(args) -> Tuple[List[float], List[float], int]:
+    """워커 : 샘플 n 개 각각에서 모든 후보 행동 롤아웃
+    → (행동별 가치 합, 기본 행동(acts[0]) 대비 차이 제곱합, 샘플 수).
+    같은 샘플 월드(World.fork)를 모든 행동이 공유 → 행동 간 차이의 분산이 작음"""
+    agent, glitter, acts, seed, n, horizon, params = args
+    rng = random.Random(seed)
+    totals, sq, count = [0.0] * len(acts), [0.0] * len(acts), 0
+    for _ in range(n):
+        lay = sample_layout_kb(agent, rng, glitter, params=params)
+        if lay is None:
+            continue
+        pits, wumpi, gold = lay
+        w = World.from_layout(agent.board.size, pits, wumpi, gold, **params)
+        if agent.has_gold:
+            w.take_gold(*gold)
+        vals = [rollout(agent, w.fork(), act if j else None, horizon)
+                for j, act in enumerate(acts)]
+        for j, v in enumerate(vals):
+            totals[j] += v
+            sq[j] += (v - vals[0]) ** 2
+        count += 1
+    return totals, sq, count
+
+
+class RolloutPlanner:
+    def __init__(self, budget: float = 0.2, horizon: int = 40, workers: Optional[int] = 1,
+                 batch: int = 4, seed: int = 0, z: float = 2.0, margin: float = 5.0,
+                 params: Optional[dict] = None):
+        self.budget = budget                    # 초, 한 번 결정의 시간 예산
+        self.horizon = horizon
+        self.workers = workers or os.cpu_count() or 1
+        self.batch = batch                      # 작업 하나의 샘플 월드 수
+        self.rng = random.Random(seed)
+        self.z = z                              # 기본 행동을 바꾸는 유의 수준 (표준오차 배수)
+        self.margin = margin                    # 기본 행동을 바꾸는 최소 가치 차이
+        self.params = params                    # 생성 파라미터 (None → agent.world.params)
+        self._pool: Optional[mp.pool.Pool] = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate(); self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ──────────────────────────────────────────────────────────
+    def candidates(self, agent: Agent) -> List[str]:
+        """기본 정책의 행동을 맨 앞에 (롤아웃에서는 강제하지 않고 기본 정책 그대로 진행)"""
+        f = agent.fork()
+        p = f.world.get_percept(f.x, f.y)
+        f._update(p)
+        acts = [f._decide(p), "Forward", "TurnLeft", "TurnRight"]
+        if p.glitter and not agent.has_gold:
+            acts.append("Grab")
+        if agent.arrows > 0:
+            acts.append("Shoot")
+        if (agent.x, agent.y) == (1, 1):
+            acts.append("Climb")
+        return list(dict.fromkeys(acts))
+
+    def evaluate(self, agent: Agent) -> Dict[str, Tuple[float, float, int]]:
+        """후보 행동 → (평균 가치, 기본 행동 대비 차이의 표준오차, 샘플 수).
+        예산과 관계없이 작업 하나는 돌림"""
+        acts = self.candidates(agent)
+        glitter = agent.world.get_percept(agent.x, agent.y).glitter
+        params = self.params if self.params is not None else agent.world.params
+        shipped = agent.fork()
+        shipped.world = None                    # 실제 숨은 상태는 보내지 않음
+        totals, sq, count = [0.0] * len(acts), [0.0] * len(acts), 0
+        deadline = time.perf_counter() + self.budget
+
+        def job():
+            return shipped, glitter, acts, self.rng.getrandbits(64), self.batch, self.horizon, params
+
+        def add(res):
+            nonlocal count
+            t, q, n = res
+            for j in range(len(acts)):
+                totals[j] += t[j]; sq[j] += q[j]
+            count += n
+
+        first = True
+        if self.workers == 1:
+            while first or time.perf_counter() < deadline:
+                add(_job(job())); first = False
+        else:
+            if self._pool is None:
+                self._pool = mp.Pool(self.workers)
+            pending = deque()
+            while first or time.perf_counter() < deadline:
+                while len(pending) < self.workers:     # 작업자 수만큼만 띄움
+                    pending.append(self._pool.apply_async(_job, (job(),)))
+                add(pending.popleft().get()); first = False
+            # 예산 밖 작업은 기다리지 않고 버림 (최대 workers - 1 개, 돌던 것은 pool 에서 마저 끝남)
+        out = {}
+        for j, a in enumerate(acts):
+            if not count:
+                out[a] = (float("-inf"), 0.0, 0); continue
+            mean, d = totals[j] / count, (totals[j] - totals[0]) / count
+            var = max(0.0, sq[j] / count - d * d)
+            out[a] = (mean, (var / max(1, count - 1)) ** 0.5, count)
+        return out
+
+    def best_action(self, agent: Agent) -> Optional[str]:
+        """기본 정책보다 margin 이상, z 표준오차 이상 나은 행동. 없으면 None (기본 정책 그대로)"""
+        stats = self.evaluate(agent)
+        acts = list(stats)
+        base = stats[acts[0]][0]
+        best, bmean = None, base
+        for a in acts[1:]:
+            mean, se, _ = stats[a]
+            if mean - base > max(self.margin, self.z * se) and mean > bmean:
+                best, bmean = a, mean
+        return best
+
+
+def play(world: World, planner: RolloutPlanner, limit: int = 120) -> Episode:
+    """매 스텝 planner.best_action 으로 한 판 진행"""
+    ep = Episode(world, Agent(world, trace=None), limit, world.seed, done=limit <= 0)
+    while not ep.done:
+        ep.advance(planner.best_action(ep.agent))
+    return ep
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="롤아웃 플래너로 한 판 실행 (기본 정책과 비교)")
+    ap.add_argument("--seed", type=int, default=0, help="랜덤 시드")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    ap.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    ap.add_argument("--budget", type=float, default=0.2, help="결정당 시간 예산(초)")
+    ap.add_argument("--horizon", type=int, default=40, help="롤아웃 길이")
+    ap.add_argument("--workers", type=int, default=1, help="프로세스 수")
+    args = ap.parse_args()
+    base = Episode.from_seed(args.seed, args.limit, args.size, trace="off").run().record()
+    with RolloutPlanner(args.budget, args.horizon, args.workers) as pl:
+        ep = play(World(args.seed, args.size), pl, args.limit)
+    print("default :", base)
+    print("rollout :", ep.record())
@@ -1,128 +1,251 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Tuple, Set, List, Dict, Optional
+from typing import Tuple, Set, Optional
 import enum, random, time
 
+from topology import DX, DY, LEFT, RIGHT, BACK, Grid, grid
+
 # ─────────────────── Direction ───────────────────
+# 회전은 topology 의 방향 번호 표로 (code = 0..3 = E, S, W, N). code/dx/dy 는 멤버 속성
 class Dir(enum.Enum):
     E = (1, 0); S = (0, -1); W = (-1, 0); N = (0, 1)
-    def left (self):  return {Dir.E:Dir.N, Dir.N:Dir.W, Dir.W:Dir.S, Dir.S:Dir.E}[self]
-    def right(self):  return {Dir.E:Dir.S, Dir.S:Dir.W, Dir.W:Dir.N, Dir.N:Dir.E}[self]
-    @property
-    def dx(self): return self.value[0]
-    @property
-    def dy(self): return self.value[1]
+    def left (self):  return DIRS[LEFT[self.code]]
+    def right(self):  return DIRS[RIGHT[self.code]]
+    def back (self):  return DIRS[BACK[self.code]]
+
+DIRS=tuple(Dir)     # 방향 번호 → Dir
+for _c,_d in enumerate(DIRS): _d.code,_d.dx,_d.dy=_c,DX[_c],DY[_c]
 
 # ─────────────────── Percept ─────────────────────
-@dataclass
-class Percept:
-    stench: bool=False; breeze: bool=False; glitter: bool=False
-    bump:   bool=False; scream: bool=False
-    def __ior__(self,o:'Percept'):
-        self.stench|=o.stench; self.breeze|=o.breeze
-        self.glitter|=o.glitter; self.bump|=o.bump; self.scream|=o.scream; return self
+# 비트 플래그 정수. 32가지 조합을 PERCEPTS 에 미리 만들어 두고 재사용 (할당 없음)
+class Percept(int):
+    __slots__=()
+    STENCH,BREEZE,GLITTER,BUMP,SCREAM = 1,2,4,8,16
+    def __new__(cls,bits:int=0,*,stench=False,breeze=False,glitter=False,bump=False,scream=False):
+        return int.__new__(cls, bits|stench|breeze<<1|glitter<<2|bump<<3|scream<<4)
+    stench =property(lambda self: bool(self&1))
+    breeze =property(lambda self: bool(self&2))
+    glitter=property(lambda self: bool(self&4))
+    bump   =property(lambda self: bool(self&8))
+    scream =property(lambda self: bool(self&16))
+    def __or__(self,o:int)->'Percept': return PERCEPTS[int.__or__(self,o)]
+    __ror__=__or__
     def __repr__(self):
         return (f"S:{int(self.stench)} B:{int(self.breeze)} "
                 f"G:{int(self.glitter)} Bu:{int(self.bump)} Sc:{int(self.scream)}")
+    __str__=__repr__
+
+PERCEPTS=tuple(Percept(i) for i in range(32))
+
+# ─────────────────── Action ──────────────────────
+ACTIONS=("Forward","TurnLeft","TurnRight","Grab","Shoot","Climb")
+ACT_CODE={a:i for i,a in enumerate(ACTIONS)}
 
 # ─────────────────── World ───────────────────────
 WALL,PIT,WUMPUS,GOLD,EMPTY = "W","P","U","G","."
 SAFE_STARTS={(1,1),(1,2),(2,1)}
+HAZARD_PROB=0.1     # 칸별 pit / wumpus 배치 확률
+
+_M64=(1<<64)-1
+
+def stream_seed(base:int,k:int)->int:
+    """카운터 기반 시드 스트림: splitmix64(base, k) → k 번째 시드를 바로 계산"""
+    z=(base*0x9E3779B97F4A7C15+(k+1)*0x9E3779B97F4A7C15)&_M64
+    z=((z^(z>>30))*0xBF58476D1CE4E5B9)&_M64
+    z=((z^(z>>27))*0x94D049BB133111EB)&_M64
+    return z^(z>>31)
+
+def max_hazards(size:int)->int:
+    """pit/wumpus 종류별 최대 개수: 4x4(16칸)에 2개 → 면적 비례"""
+    return max(1, round(2*size*size/16))
+
+def sample_layout(rng,size:int,max_pits:int,max_wumpi:Optional[int]=None,
+                  pit_prob:float=HAZARD_PROB,wumpus_prob:float=HAZARD_PROB):
+    """(pits, wumpi, gold_xy) 배치 샘플링. rng 는 random.Random (또는 같은 인터페이스).
+    max_wumpi 를 생략하면 max_pits 와 같은 상한"""
+    if max_wumpi is None: max_wumpi=max_pits
+    pits:Set[Tuple[int,int]]=set(); wumpi:Set[Tuple[int,int]]=set()
+    span=range(1,size+1)
+    # 확률 배치: pit,wumpus 종류별 상한(기본 4x4 기준 2개, 면적 비례), 한 칸 겹침 금지
+    for x in span:
+        for y in span:
+            if (x,y) in SAFE_STARTS: continue
+            if rng.random()<wumpus_prob and len(wumpi)<max_wumpi:
+                wumpi.add((x,y))
+            if rng.random()<pit_prob and len(pits)<max_pits and (x,y) not in wumpi:
+                pits.add((x,y))
+    # Gold 1개
+    taken=SAFE_STARTS|wumpi|pits
+    cand=[(x,y) for x in span for y in span if (x,y) not in taken]
+    return pits,wumpi,rng.choice(cand)
 
 @dataclass
 class World:
     seed: Optional[int]=None
-    size:int=field(init=False,default=6)                 # 0,5 (벽포함)
+    size:int=4                                           # 한 변 칸 수 (벽 제외, 격자는 size+2)
+    # 생성 파라미터 (sweep 등에서 변경). 상한 None → setting.max_hazards(size)
+    pit_prob:float=HAZARD_PROB                           # 칸별 pit 확률 (wumpus 없는 칸에서)
+    wumpus_prob:float=HAZARD_PROB                        # 칸별 wumpus 확률
+    max_pits:Optional[int]=None
+    max_wumpi:Optional[int]=None
 
     pits:  Set[Tuple[int,int]]=field(init=False,default_factory=set)
     wumpi: Set[Tuple[int,int]]=field(init=False,default_factory=set)
     gold_xy: Tuple[int,int]=field(init=False)
-    tile_state: List[List[Dict[str,int|bool]]]=field(init=False)
+
+    # 평탄 배열 (칸 id = x*stride+y, 벽 테두리 포함)
+    grid:   Grid=field(init=False,repr=False)         # 크기별 위상 표 (topology.grid, 월드끼리 공유)
+    stride: int=field(init=False,repr=False)
+    wall:   bytearray=field(init=False,repr=False)
+    pit:    bytearray=field(init=False,repr=False)
+    wumpus: bytearray=field(init=False,repr=False)
+    stench: bytearray=field(init=False,repr=False)     # 인접 wumpus 수
+    breeze: bytearray=field(init=False,repr=False)     # 인접 pit 수
+    percept:bytearray=field(init=False,repr=False)     # 칸별 S|B|G 비트 (사격·Grab 시 갱신)
 
     wumpus_alive: bool=field(init=False,default=True)
+    rng: random.Random=field(init=False,repr=False,compare=False)   # 월드 전용 난수 (전역 random 미사용)
 
     def __post_init__(self):
-        random.seed(self.seed if self.seed is not None else time.time_ns()&0xFFFFFFFF)
+        self.rng=random.Random(self.seed if self.seed is not None else time.time_ns()&0xFFFFFFFF)
+        self._caps()
         self._generate()
 
+    @classmethod
+    def from_stream(cls,base:int,k:int,size:int=4,**params)->'World':
+        """시드 스트림 base 의 k 번째 월드 (앞선 월드를 만들 필요 없음)"""
+        return cls(stream_seed(base,k),size,**params)
+
+    @classmethod
+    def from_layout(cls,size:int,pits,wumpi,gold_xy:Tuple[int,int],seed:Optional[int]=None,
+                    pit_prob:float=HAZARD_PROB,wumpus_prob:float=HAZARD_PROB,
+                    max_pits:Optional[int]=None,max_wumpi:Optional[int]=None,
+                    layers:Optional[tuple]=None)->'World':
+        """이미 정해진 배치로 World 생성 (난수 생성 생략, worldgen 배치 등에서 사용).
+        생성 파라미터는 배치를 만든 값 (Agent 의 사전확률 / 상한으로 쓰임).
+        layers = (wall, pit, wumpus, stench, breeze, percept) 평탄 배열을 넘기면 _build 생략 (그대로 소유)"""
+        w=cls.__new__(cls)
+        w.seed,w.size=seed,size
+        w.pit_prob,w.wumpus_prob,w.max_pits,w.max_wumpi=pit_prob,wumpus_prob,max_pits,max_wumpi
+        w._caps()
+        w.pits,w.wumpi,w.gold_xy=set(pits),set(wumpi),tuple(gold_xy)
+        w.wumpus_alive=True                 # rng 는 처음 쓸 때 만듦 (__getattr__, 배치는 이미 정해짐)
+        if layers is None:
+            w._build()
+        else:
+            w.grid=grid(size); w.stride=w.grid.stride
+            w.wall,w.pit,w.wumpus,w.stench,w.breeze,w.percept=layers
+        return w
+
+    def __getattr__(self,name):
+        if name=="rng":
+            self.rng=random.Random(self.seed if self.seed is not None else time.time_ns()&0xFFFFFFFF)
+            return self.rng
+        raise AttributeError(name)
+
     # ───────── 지도 생성 ─────────
+    def _caps(self):
+        cap=max_hazards(self.size)
+        if self.max_pits is None: self.max_pits=cap
+        if self.max_wumpi is None: self.max_wumpi=cap
+
     def _generate(self):
-        # 격자 (벽)
-        self.grid=[[WALL]*self.size for _ in range(self.size)]
-        for y in range(1,5):
-            for x in range(1,5):
-                self.grid[y][x]=EMPTY
-
-        # 확률 배치: pit,wumpus <3, 한 칸 겹침 금지
-        for x in range(1,5):
-            for y in range(1,5):
-                if (x,y) in SAFE_STARTS: continue
-                if random.random()<0.1 and len(self.wumpi)<2:
-                    self.wumpi.add((x,y))
-                if random.random()<0.1 and len(self.pits)<2 and (x,y) not in self.wumpi:
-                    self.pits.add((x,y))
-        # Gold 1개
-        cand=[(x,y) for x in range(1,5) for y in range(1,5)
-              if (x,y) not in SAFE_STARTS|self.wumpi|self.pits]
-        self.gold_xy=random.choice(cand)
-
-        # 타일 메타데이터
-        self.tile_state=[[{
-            'stench':0,'breeze':0,
-            'pit':(x,y) in self.pits,
-            'wumpus':(x,y) in self.wumpi,
-            'gold':(x,y)==self.gold_xy
-        } for x in range(self.size)] for y in range(self.size)]
-
-        for wx,wy in self.wumpi: self._adjust_stench(wx,wy,+1)
-        for px,py in self.pits:  self._adjust_breeze(px,py,+1)
+        self.pits,self.wumpi,self.gold_xy=sample_layout(self.rng,self.size,self.max_pits,self.max_wumpi,
+                                                        self.pit_prob,self.wumpus_prob)
+        self._build()
+
+    def _build(self):
+        """pits/wumpi/gold_xy → 평탄 배열 + 감각 비트"""
+        g=self.grid=grid(self.size); s=self.stride=g.stride
+        self.wall=bytearray(1-v for v in g.inside); cells=g.cells
+        self.pit,self.wumpus=bytearray(cells),bytearray(cells)
+        self.stench,self.breeze,self.percept=bytearray(cells),bytearray(cells),bytearray(cells)
+        gx,gy=self.gold_xy
+        self.percept[gx*s+gy]=Percept.GLITTER
+        for wx,wy in self.wumpi: self.wumpus[wx*s+wy]=1; self._adjust_stench(wx,wy,+1)
+        for px,py in self.pits:  self.pit[px*s+py]=1;    self._adjust_breeze(px,py,+1)
+
+    @property
+    def max_hazards(self)->int:
+        """종류 구분 없는 상한 (호환용, 기본 설정에서는 max_pits == max_wumpi)"""
+        return max(self.max_pits,self.max_wumpi)
+
+    @property
+    def params(self)->dict:
+        """생성 파라미터 (World(seed, size, **params) 로 같은 분포)"""
+        return dict(pit_prob=self.pit_prob,wumpus_prob=self.wumpus_prob,
+                    max_pits=self.max_pits,max_wumpi=self.max_wumpi)
+
+    def in_bounds(self,x:int,y:int)->bool:
+        return 1<=x<=self.size and 1<=y<=self.size
+
+    def is_wall(self,x:int,y:int)->bool:
+        return self.wall[x*self.stride+y]==1
 
     # ───────── 감각 ─────────
     def get_percept(self,x:int,y:int)->Percept:
-        t=self.tile_state[y][x]
-        return Percept(stench=t['stench']>0, breeze=t['breeze']>0, glitter=t['gold'])
+        return PERCEPTS[self.percept[x*self.stride+y]]
 
     # ───────── 이동 ─────────
     def forward(self,x:int,y:int,d:Dir):
         nx,ny=x+d.dx,y+d.dy
-        if self.grid[ny][nx]==WALL:
-            p=self.get_percept(x,y); p.bump=True
-            return x,y,p
-        p=self.get_percept(nx,ny)
-        return nx,ny,p
+        s=self.stride
+        if self.wall[nx*s+ny]:
+            return x,y,PERCEPTS[self.percept[x*s+y]|Percept.BUMP]
+        return nx,ny,PERCEPTS[self.percept[nx*s+ny]]
 
     # ───────── 사격 ─────────
     def shoot(self,x:int,y:int,d:Dir)->bool:
-        cx,cy=x+d.dx,y+d.dy
-        while self.grid[cy][cx]!=WALL:
-            if (cx,cy) in self.wumpi:
+        s=self.stride; step=self.grid.delta[d.code]
+        i=x*s+y+step
+        while not self.wall[i]:
+            if self.wumpus[i]:
+                cx,cy=divmod(i,s)
+                self.wumpus[i]=0
                 self.wumpi.remove((cx,cy))
                 self._adjust_stench(cx,cy,-1)      # <- 스텐치 감소!
                 if not self.wumpi: self.wumpus_alive=False
                 return True
-            cx+=d.dx; cy+=d.dy
+            i+=step
         return False
 
+    # ───────── 스냅샷 (사격·Grab 으로 바뀌는 상태만) ─────────
+    def snapshot(self)->tuple:
+        return (frozenset(self.wumpi),bytes(self.wumpus),bytes(self.stench),
+                bytes(self.percept),self.wumpus_alive)
+
+    def restore(self,snap:tuple):
+        wumpi,self.wumpus[:],self.stench[:],self.percept[:],self.wumpus_alive=snap
+        self.wumpi=set(wumpi)
+
+    def fork(self)->'World':
+        """독립적으로 진행할 수 있는 복사본. 바뀌지 않는 배열(wall/pit/breeze)·pits·rng 는 공유"""
+        w=World.__new__(World)
+        w.__dict__.update(self.__dict__)
+        w.wumpi=set(self.wumpi)
+        w.wumpus,w.stench,w.percept=bytearray(self.wumpus),bytearray(self.stench),bytearray(self.percept)
+        return w
+
+    # ───────── Gold ─────────
+    def take_gold(self,x:int,y:int):
+        self.percept[x*self.stride+y]&=~Percept.GLITTER
+
     # ───────── 위험 체크 ─────────
-    def tile_has_pit(self,x,y):         return (x,y) in self.pits
-    def tile_has_live_wumpus(self,x,y): return (x,y) in self.wumpi
+    def tile_has_pit(self,x,y):         return self.pit[x*self.stride+y]==1
+    def tile_has_live_wumpus(self,x,y): return self.wumpus[x*self.stride+y]==1
 
     # ───────── 내부 유틸 ─────────
     def _adjust_stench(self,wx:int,wy:int,delta:int):
-        for d in Dir:
-            ax,ay=wx+d.dx, wy+d.dy
-            if 1<=ax<=4 and 1<=ay<=4:
-                self.tile_state[ay][ax]['stench']+=delta
-                if self.tile_state[ay][ax]['stench']<0:
-                    self.tile_state[ay][ax]['stench']=0
+        self._adjust(self.stench,Percept.STENCH,wx,wy,delta)
 
     def _adjust_breeze(self,px:int,py:int,delta:int):
-        for d in Dir:
-            ax,ay=px+d.dx, py+d.dy
-            if 1<=ax<=4 and 1<=ay<=4:
-                self.tile_state[ay][ax]['breeze']+=delta
-                if self.tile_state[ay][ax]['breeze']<0:
-                    self.tile_state[ay][ax]['breeze']=0
+        self._adjust(self.breeze,Percept.BREEZE,px,py,delta)
+
+    def _adjust(self,counter:bytearray,bit:int,cx:int,cy:int,delta:int):
+        for i in self.grid.nbrs[cx*self.stride+cy]:
+            v=max(0,counter[i]+delta); counter[i]=v
+            if v: self.percept[i]|=bit
+            else: self.percept[i]&=~bit
 
     # 호환용 별칭 (통합 전 코드에서서 world.gold 사용)
     @property
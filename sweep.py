@@ -0,0 +1,229 @@
+"""
+sweep.py
+────────────────────────────────────────────────────────────────────────────
+• 파라미터 스윕용 순차 표본 평가기
+  - 설정(Config) = 생성 파라미터(pit_prob / wumpus_prob / max_pits / max_wumpi, size)
+                  + 에이전트 설정(arrows / limit)
+  - 라운드마다 살아 있는 설정 전부에 같은 시드 묶음(batch)을 프로세스 풀로 실행
+    (설정끼리 같은 시드 → 비교 잡음 감소)
+  - 설정별 종료 조건
+    · converged : 성공률 Wilson 구간 반폭 ≤ rate_tol 이고 평균 performance 구간 반폭 ≤ perf_tol
+    · dominated : 다른 설정의 목표 지표(objective) 하한이 이 설정의 상한보다 큼
+    · budget    : max_seeds 소진
+  - `python sweep.py --grid pit_prob=0.05,0.1,0.15 --grid arrows=1,3` 처럼 격자로 실행
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, asdict, field, replace
+from itertools import product
+from math import sqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+import multiprocessing as mp
+import os
+
+from setting import HAZARD_PROB
+from agent import Agent
+from episode import Episode
+from worldgen import generate
+
+
+@dataclass(frozen=True)
+class Config:
+    size: int = 4
+    limit: int = 120
+    arrows: int = 3
+    pit_prob: float = HAZARD_PROB
+    wumpus_prob: float = HAZARD_PROB
+    max_pits: Optional[int] = None          # None → setting.max_hazards(size)
+    max_wumpi: Optional[int] = None
+
+    def label(self) -> str:
+        base = Config()
+        return " ".join(f"{k}={v}" for k, v in asdict(self).items()
+                        if v != getattr(base, k)) or "default"
+
+
+@dataclass
+class Stats:
+    n: int = 0
+    successes: int = 0
+    perf_sum: float = 0.0
+    perf_sq: float = 0.0
+    status: str = "running"                 # running / converged / dominated / budget
+
+    def add(self, results: Iterable[Tuple[bool, int]]):
+        for ok, perf in results:
+            self.n += 1
+            self.successes += ok
+            self.perf_sum += perf
+            self.perf_sq += perf * perf
+
+    @property
+    def rate(self) -> float:
+        return self.successes / self.n if self.n else 0.0
+
+    @property
+    def perf(self) -> float:
+        return self.perf_sum / self.n if self.n else 0.0
+
+    def rate_ci(self, z: float) -> Tuple[float, float]:
+        """Wilson score 구간"""
+        n = self.n
+        if not n:
+            return 0.0, 1.0
+        p = self.rate
+        d = 1 + z * z / n
+        c = (p + z * z / (2 * n)) / d
+        h = z * sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / d
+        return max(0.0, c - h), min(1.0, c + h)
+
+    def perf_ci(self, z: float) -> Tuple[float, float]:
+        n = self.n
+        if n < 2:
+            return float("-inf"), float("inf")
+        var = max(0.0, (self.perf_sq - self.perf_sum ** 2 / n) / (n - 1))
+        h = z * sqrt(var / n)
+        return self.perf - h, self.perf + h
+
+
+def run_config(args: Tuple[Config, List[int]]) -> List[Tuple[bool, int]]:
+    """워커 : 설정 하나로 시드 묶음 실행 → [(성공, performance)]"""
+    cfg, seeds = args
+    batch = generate(seeds, cfg.size, cfg.pit_prob, cfg.wumpus_prob, cfg.max_pits, cfg.max_wumpi)
+    out = []
+    for w in batch.worlds():
+        ep = Episode(w, Agent(w, arrows=cfg.arrows, trace=None), cfg.limit, w.seed,
+                     done=cfg.limit <= 0, on_stuck="stop").run()
+        out.append((ep.success, ep.agent.performance))
+    return out
+
+
+@dataclass
+class Sweep:
+    configs: List[Config]
+    batch: int = 200                        # 라운드당 설정별 시드 수
+    min_seeds: int = 400                    # 이보다 적으면 멈추지 않음
+    max_seeds: int = 20000
+    rate_tol: float = 0.01                  # 성공률 구간 반폭 목표
+    perf_tol: float = 5.0                   # 평균 performance 구간 반폭 목표
+    z: float = 1.96
+    objective: str = "success"              # dominated 판정 지표 : success / performance
+    workers: Optional[int] = None
+    stats: Dict[Config, Stats] = field(init=False)
+
+    def __post_init__(self):
+        if self.objective not in ("success", "performance"):
+            raise ValueError(f"objective: {self.objective!r} (success / performance)")
+        self.stats = {c: Stats() for c in self.configs}
+
+    def _ci(self, s: Stats) -> Tuple[float, float]:
+        return s.rate_ci(self.z) if self.objective == "success" else s.perf_ci(self.z)
+
+    def _update_status(self):
+        live = [c for c, s in self.stats.items() if s.status == "running"]
+        best_lo = max(self._ci(s)[0] for s in self.stats.values() if s.n >= self.min_seeds) \
+            if any(s.n >= self.min_seeds for s in self.stats.values()) else None
+        for c in live:
+            s = self.stats[c]
+            if s.n < self.min_seeds:
+                continue
+            lo, hi = s.rate_ci(self.z)
+            plo, phi = s.perf_ci(self.z)
+            if best_lo is not None and self._ci(s)[1] < best_lo:
+                s.status = "dominated"
+            elif (hi - lo) / 2 <= self.rate_tol and (phi - plo) / 2 <= self.perf_tol:
+                s.status = "converged"
+            elif s.n >= self.max_seeds:
+                s.status = "budget"
+
+    def run(self, progress=None) -> "Sweep":
+        """모든 설정이 멈출 때까지 라운드 반복. progress(round, sweep) 가 있으면 라운드마다 호출"""
+        workers = self.workers or os.cpu_count() or 1
+        pool = mp.Pool(workers) if workers > 1 else None
+        try:
+            start, rnd = 0, 0
+            while any(s.status == "running" for s in self.stats.values()):
+                live = [c for c, s in self.stats.items() if s.status == "running"]
+                seeds = list(range(start, start + self.batch))
+                start += self.batch
+                # 설정이 워커보다 적으면 시드 묶음을 나눠 모든 워커를 씀
+                parts = max(1, workers // len(live))
+                step = -(-len(seeds) // parts)
+                jobs = [(c, seeds[i:i + step]) for c in live for i in range(0, len(seeds), step)]
+                results = pool.map(run_config, jobs) if pool else list(map(run_config, jobs))
+                for (c, _), res in zip(jobs, results):
+                    self.stats[c].add(res)
+                self._update_status()
+                rnd += 1
+                if progress:
+                    progress(rnd, self)
+        finally:
+            if pool is not None:
+                pool.terminate()
+        return self
+
+    def table(self) -> str:
+        rows = sorted(self.stats.items(), key=lambda cs: -self._ci(cs[1])[0])
+        lines = [f"{'config':<40} {'seeds':>6} {'success':>8} {'95% CI':>17} "
+                 f"{'perf':>9} {'± CI':>7}  status"]
+        for c, s in rows:
+            lo, hi = s.rate_ci(self.z)
+            plo, phi = s.perf_ci(self.z)
+            lines.append(f"{c.label():<40} {s.n:>6} {s.rate:>8.4f} [{lo:.4f}, {hi:.4f}] "
+                         f"{s.perf:>9.2f} {(phi - plo) / 2:>7.2f}  {s.status}")
+        return "\n".join(lines)
+
+    def records(self) -> List[dict]:
+        out = []
+        for c, s in self.stats.items():
+            lo, hi = s.rate_ci(self.z)
+            plo, phi = s.perf_ci(self.z)
+            out.append(dict(asdict(c), seeds=s.n, success_rate=s.rate, rate_lo=lo, rate_hi=hi,
+                            mean_performance=s.perf, perf_lo=plo, perf_hi=phi, status=s.status))
+        return out
+
+
+def grid(base: Config, axes: Dict[str, List]) -> List[Config]:
+    """axes 의 모든 조합 → 설정 목록"""
+    keys = list(axes)
+    return [replace(base, **dict(zip(keys, vals))) for vals in product(*(axes[k] for k in keys))]
+
+
+def _parse_axis(spec: str) -> Tuple[str, List]:
+    """'pit_prob=0.05,0.1' → ('pit_prob', [0.05, 0.1])"""
+    key, _, vals = spec.partition("=")
+    kind = {f: type(v) for f, v in asdict(Config()).items()}.get(key)
+    if kind is None:
+        raise SystemExit(f"알 수 없는 파라미터 {key!r} ({', '.join(asdict(Config()))})")
+    cast = float if kind is float else int              # max_pits / max_wumpi 기본 None → int
+    return key, [cast(v) for v in vals.split(",") if v]
+
+
+if __name__ == "__main__":
+    import argparse, json
+    ap = argparse.ArgumentParser(description="생성 / 에이전트 파라미터 순차 표본 스윕")
+    ap.add_argument("--grid", action="append", default=[], help="파라미터=값1,값2,... (여러 번)")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수 (--grid 로 덮어씀)")
+    ap.add_argument("--limit", type=int, default=120, help="최대 스텝 수 (--grid 로 덮어씀)")
+    ap.add_argument("--batch", type=int, default=200, help="라운드당 설정별 시드 수")
+    ap.add_argument("--min-seeds", type=int, default=400)
+    ap.add_argument("--max-seeds", type=int, default=20000)
+    ap.add_argument("--rate-tol", type=float, default=0.01, help="성공률 구간 반폭 목표")
+    ap.add_argument("--perf-tol", type=float, default=5.0, help="평균 performance 구간 반폭 목표")
+    ap.add_argument("--objective", default="success", choices=["success", "performance"])
+    ap.add_argument("--workers", type=int, help="프로세스 수 (기본: 전체 코어)")
+    ap.add_argument("--jsonl", help="설정별 결과 저장 경로")
+    args = ap.parse_args()
+    axes = dict(_parse_axis(s) for s in args.grid)
+    sw = Sweep(grid(Config(args.size, args.limit), axes), args.batch, args.min_seeds,
+               args.max_seeds, args.rate_tol, args.perf_tol, objective=args.objective,
+               workers=args.workers)
+    sw.run(lambda r, s: print(f"round {r}: running "
+                              f"{sum(x.status == 'running' for x in s.stats.values())}"
+                              f"/{len(s.stats)}"))
+    print(sw.table())
+    if args.jsonl:
+        with open(args.jsonl, "w") as f:
+            for rec in sw.records():
+                f.write(json.dumps(rec) + "\n")
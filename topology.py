@@ -0,0 +1,72 @@
+"""
+topology.py
+────────────────────────────────────────────────────────────────────────────
+• 격자 위상 공용 표 (World / Agent / planner / vecenv / main 이 같이 씀)
+  - 방향 = 정수 0..3 (E, S, W, N — 시계 방향, Dir 순서와 같음)
+    · DX / DY / LEFT / RIGHT / BACK / TURN 은 방향 번호로 바로 찾는 튜플
+  - 칸 id = x * stride + y  (stride = size+2, 벽 테두리 포함 — World / kb.Board 와 같은 배치)
+  - Grid(size) : 크기별 상수 (grid(size) 로 한 번만 만들어 공유)
+    · delta[d]   : 방향 d 로 한 칸 갈 때 id 변화량
+    · nbrs[i]    : 칸 i 의 격자 안 이웃 id (E, S, W, N 순, 벽 제외)
+    · dirs_in[i] : 칸 i 에서 격자 안으로 향하는 방향 번호
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+E, S, W, N = range(4)
+NAMES = "ESWN"
+DX = (1, 0, -1, 0)
+DY = (0, -1, 0, 1)
+LEFT = (N, E, S, W)
+RIGHT = (S, W, N, E)
+BACK = (W, N, E, S)
+# TURN[현재][목표] : 목표 방향으로 돌기 위한 첫 회전 (같은 방향이면 None)
+TURN = tuple(tuple(None if c == t else "TurnRight" if (t - c) % 4 == 1 else "TurnLeft"
+                   for t in range(4)) for c in range(4))
+
+
+def toward(dx: int, dy: int) -> int:
+    """부호 기반 탐욕 조향 방향 (x 차이 우선)"""
+    return E if dx > 0 else W if dx < 0 else N if dy > 0 else S
+
+
+class Grid:
+    """격자 크기별 상수"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.stride = s = size + 2
+        self.cells = s * s
+        self.delta = (s, -1, -s, 1)
+        self.start = s + 1                      # (1, 1)
+        inside = [1 <= x <= size and 1 <= y <= size for x in range(s) for y in range(s)]
+        self.inside = bytes(inside)
+        self.dirs_in: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(d for d in range(4) if 0 <= i + self.delta[d] < self.cells
+                  and inside[i + self.delta[d]]) if inside[i] else ()
+            for i in range(self.cells))
+        self.nbrs: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(i + self.delta[d] for d in ds) for i, ds in enumerate(self.dirs_in))
+
+    def id(self, x: int, y: int) -> int:
+        return x * self.stride + y
+
+    def xy(self, i: int) -> Tuple[int, int]:
+        return divmod(i, self.stride)
+
+    def step(self, i: int, d: int) -> int:
+        return i + self.delta[d]
+
+    def rows(self) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """위(y = size)에서 아래로 (y, 그 줄의 칸 id x = 1..size) — 화면 출력 순서"""
+        s, n = self.stride, self.size
+        for y in range(n, 0, -1):
+            yield y, tuple(x * s + y for x in range(1, n + 1))
+
+
+@lru_cache(maxsize=None)
+def grid(size: int) -> Grid:
+    return Grid(size)
@@ -0,0 +1,143 @@
+"""
+tournament.py
+────────────────────────────────────────────────────────────────────────────
+• 헤드리스 배치 실행
+  - 시드 범위/목록을 프로세스 풀(기본: 전체 코어)로 나눠 에피소드를 돌림
+  - 출력 없이 시드별 기록(dict)을 순서대로 스트리밍 + 집계 통계
+  - 기본 on_stuck="stop" : 새 지식 없는 순환을 감지하면 남은 스텝을 계산해 바로 끝냄
+    (기록은 끝까지 돌린 것과 같고, 실패 시드에서 limit 까지 도는 시간을 아낌)
+  - cache 경로를 주면 results_db 에 있는 (코드 버전, 시드) 는 읽기만 하고 나머지만 실행
+  - `python main.py --seeds 0-9999 --limit 120` 으로 사용
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Optional
+from functools import lru_cache, partial
+import multiprocessing as mp
+import os
+
+from episode import Episode
+from worldgen import generate
+from corpus import Corpus
+from metrics import Metrics
+from results_db import ResultsDB
+
+
+def parse_seeds(spec: str) -> List[int]:
+    """'0-999,1234,2000-2010' → 시드 목록 (범위는 양 끝 포함)"""
+    seeds: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        if sep and lo:
+            seeds.extend(range(int(lo), int(hi) + 1))
+        else:
+            seeds.append(int(part))
+    return seeds
+
+
+def run_seed(seed: int, limit: int = 120, size: int = 4, on_stuck: str = "stop") -> dict:
+    return Episode.from_seed(seed, limit, size, trace="off", on_stuck=on_stuck).run().record()
+
+
+@lru_cache(maxsize=None)
+def _corpus(path: str) -> Corpus:
+    return Corpus(path)                     # 워커 프로세스마다 한 번만 mmap
+
+
+def run_chunk(seeds: List[int], limit: int = 120, size: int = 4,
+              corpus: Optional[str] = None, trace_dir: Optional[str] = None,
+              metrics: bool = False, on_stuck: str = "stop") -> List[dict]:
+    """시드 묶음의 월드를 worldgen 으로 한 번에 만든 뒤 차례로 실행.
+    corpus 경로를 주면 seeds 는 코퍼스 인덱스 (생성 없이 읽기만).
+    trace_dir 를 주면 실행마다 binary trace 를 <trace_dir>/<seed>.wtr 로 저장.
+    metrics=True 면 기록마다 "metrics" 스냅샷 포함 (summarize 가 합산).
+    on_stuck : 순환 처리 (off / stop / recover, episode.Episode 참고)"""
+    worlds = (_corpus(corpus).worlds(seeds) if corpus
+              else generate(seeds, size).worlds())
+    out = []
+    for w in worlds:
+        if trace_dir:
+            ep = Episode.from_world(w, limit, "binary", os.path.join(trace_dir, f"{w.seed}.wtr"),
+                                    metrics=metrics, on_stuck=on_stuck)
+        else:
+            ep = Episode.from_world(w, limit, "off", metrics=metrics, on_stuck=on_stuck)
+        out.append(ep.run().record())
+    return out
+
+
+def run_seeds(seeds: Iterable[int], limit: int = 120,
+              workers: Optional[int] = None,
+              chunksize: Optional[int] = None, size: int = 4,
+              corpus: Optional[str] = None,
+              trace_dir: Optional[str] = None,
+              metrics: bool = False, on_stuck: str = "stop",
+              cache: Optional[str] = None) -> Iterator[dict]:
+    """시드 순서대로 기록을 yield. workers=1 이면 풀 없이 현재 프로세스에서 실행.
+    cache : results_db 파일 (코퍼스 / trace / metrics 실행은 캐시하지 않음)"""
+    seeds = list(seeds)
+    run = partial(_run_seeds, limit=limit, workers=workers, chunksize=chunksize, size=size,
+                  corpus=corpus, trace_dir=trace_dir, metrics=metrics, on_stuck=on_stuck)
+    if not cache or corpus or trace_dir or metrics:
+        yield from run(seeds)
+        return
+    with ResultsDB(cache, size, limit, on_stuck) as db:
+        have = db.get(seeds)
+        fresh = run([s for s in seeds if s not in have])
+        new: List[dict] = []
+        for s in seeds:
+            rec = have.get(s)
+            if rec is None:
+                rec = next(fresh)
+                new.append(rec)
+                if len(new) >= 1000:
+                    db.put(new); new.clear()
+            yield rec
+        db.put(new)
+
+
+def _run_seeds(seeds: List[int], limit: int, workers: Optional[int], chunksize: Optional[int],
+               size: int, corpus: Optional[str], trace_dir: Optional[str], metrics: bool,
+               on_stuck: str) -> Iterator[dict]:
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, min(1000, len(seeds) // (workers * 8)))
+    chunks = [seeds[i:i + chunksize] for i in range(0, len(seeds), chunksize)]
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+    job = partial(run_chunk, limit=limit, size=size, corpus=corpus, trace_dir=trace_dir,
+                  metrics=metrics, on_stuck=on_stuck)
+    if workers == 1 or len(chunks) < 2:
+        for recs in map(job, chunks):
+            yield from recs
+        return
+    with mp.Pool(workers) as pool:
+        for recs in pool.imap(job, chunks):
+            yield from recs
+
+
+def summarize(records: Iterable[dict]) -> dict:
+    """기록에 "metrics" 가 있으면 전부 합산해 "metrics" 스냅샷으로 포함,
+    "stuck" 이 있으면 순환으로 끝난 에피소드 수 포함"""
+    n = succ = steps = deaths = perf = arrows = 0
+    stuck: Optional[int] = None
+    m: Optional[Metrics] = None
+    for r in records:
+        n += 1
+        succ += r["success"]; steps += r["steps"]; deaths += r["deaths"]
+        perf += r["performance"]; arrows += r["arrows_used"]
+        if "stuck" in r:
+            stuck = (stuck or 0) + (r["stuck"] is not None)
+        if "metrics" in r:
+            m = (m or Metrics()).merge(r["metrics"])
+    d = max(n, 1)
+    out = dict(episodes=n, successes=succ, success_rate=succ / d,
+               mean_steps=steps / d, mean_deaths=deaths / d,
+               mean_performance=perf / d, arrows_used=arrows)
+    if stuck is not None:
+        out["stuck"] = stuck
+    if m is not None:
+        out["metrics"] = m.snapshot()
+    return out
@@ -0,0 +1,157 @@
+"""
+tracelog.py
+────────────────────────────────────────────────────────────────────────────
+• 에이전트 스텝 기록(trace) 저장소
+  - 기록 1건 = (step, 행동 코드, x, y, 방향 번호, percept 비트) 정수 튜플
+    · 행동 코드 = setting.ACTIONS 인덱스, 사망 스텝이면 DEAD 비트(0x80) 추가
+    · 방향 번호 = topology 방향 번호 (E, S, W, N — Dir 순서)
+  - 모드
+    · off    : Agent.trace = None, 기록 비용 없음
+    · list   : 메모리에 전부 보관 (콘솔 실행 기본값)
+    · ring   : 최근 maxlen 건만 보관
+    · binary : 고정 크기 레코드로 묶어 파일에 일괄 기록 (실행당 파일 하나)
+      헤더에 시드 / 크기와 함께 스텝 한도 · on_stuck · risk · 생성 파라미터 (v2)
+      → replay / analytics 가 같은 조건으로 재현 (v1 파일은 on_stuck="off" 로 읽음)
+  - 문자열 변환은 rows() / Agent.history 로 읽을 때만
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+import struct
+
+from setting import ACTIONS, HAZARD_PROB, PERCEPTS
+from topology import NAMES
+
+DEAD = 0x80
+Record = Tuple[int, int, int, int, int, int]
+
+MAGIC = b"WTRC"
+VERSION = 2
+HEADER = struct.Struct("<4sBBHQ")           # magic | version | has_seed | size | seed
+META = struct.Struct("<IBBddHH")            # (v2) limit | on_stuck | risk | pit_prob | wumpus_prob | max_pits | max_wumpi
+RECORD = struct.Struct("<IBHHBB")           # step | act | x | y | dir | percept
+ON_STUCK = ("off", "stop", "recover")       # META 의 on_stuck / risk 번호
+RISKS = ("exact", "heuristic")
+NO_CAP = 0xFFFF                             # max_pits / max_wumpi 가 None
+
+
+def row(rec: Record) -> dict:
+    """기록 1건 → 기존 history 형식 dict"""
+    step, code, x, y, d, bits = rec
+    act = ACTIONS[code & ~DEAD] + ("(DEAD)" if code & DEAD else "")
+    return dict(step=step, act=act, pos=(x, y), dir=NAMES[d], percept=repr(PERCEPTS[bits]))
+
+
+class ListTrace:
+    def __init__(self):
+        self.buf: List[Record] = []
+
+    def record(self, step: int, code: int, x: int, y: int, d: int, bits: int):
+        self.buf.append((step, code, x, y, d, bits))
+
+    def records(self) -> Iterator[Record]:
+        return iter(self.buf)
+
+    def rows(self) -> List[dict]:
+        return [row(r) for r in self.records()]
+
+    def __len__(self) -> int:
+        return len(self.buf)
+
+    def close(self):
+        pass
+
+
+class RingTrace(ListTrace):
+    def __init__(self, maxlen: int = 1024):
+        self.buf = deque(maxlen=maxlen)     # type: ignore[assignment]
+        self.total = 0
+
+    def record(self, step: int, code: int, x: int, y: int, d: int, bits: int):
+        self.buf.append((step, code, x, y, d, bits)); self.total += 1
+
+
+class BinaryTrace(ListTrace):
+    """RECORD 단위로 버퍼에 쌓았다가 flush_every 건마다 파일에 한 번에 기록"""
+
+    def __init__(self, path: str, size: int = 4, seed: Optional[int] = None,
+                 flush_every: int = 4096, limit: int = 0, on_stuck: str = "off",
+                 risk: str = "exact", params: Optional[dict] = None):
+        self.path = path
+        self.f = open(path, "wb")
+        p = params or {}
+        caps = [NO_CAP if p.get(k) is None else p[k] for k in ("max_pits", "max_wumpi")]
+        self.f.write(HEADER.pack(MAGIC, VERSION, seed is not None, size, seed or 0))
+        self.f.write(META.pack(limit, ON_STUCK.index(on_stuck), RISKS.index(risk),
+                               p.get("pit_prob", HAZARD_PROB), p.get("wumpus_prob", HAZARD_PROB), *caps))
+        self.pending = bytearray()
+        self.flush_every = flush_every * RECORD.size
+        self.count = 0
+
+    def record(self, step: int, code: int, x: int, y: int, d: int, bits: int):
+        self.pending += RECORD.pack(step, code, x, y, d, bits)
+        self.count += 1
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.pending and not self.f.closed:
+            self.f.write(self.pending); self.pending.clear()
+
+    def close(self):
+        if not self.f.closed:
+            self.flush(); self.f.close()
+
+    def records(self) -> Iterator[Record]:
+        self.flush()
+        if not self.f.closed:
+            self.f.flush()
+        return read_trace(self.path)[1]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def read_header(data: bytes, path: str = "") -> Tuple[dict, int]:
+    """파일 앞부분 → (헤더 dict, 기록 시작 위치).
+    헤더 dict : size, seed, limit (v1 은 None), on_stuck, risk, params (World(seed, size, **params))"""
+    magic, ver, has_seed, size, seed = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or ver not in (1, VERSION):
+        raise ValueError(f"{path}: trace 파일 형식이 아님")
+    head = dict(size=size, seed=seed if has_seed else None, limit=None, on_stuck="off",
+                risk="exact", params={})
+    if ver == 1:
+        return head, HEADER.size
+    limit, stuck, risk, pp, wp, mp, mw = META.unpack_from(data, HEADER.size)
+    head.update(limit=limit, on_stuck=ON_STUCK[stuck], risk=RISKS[risk],
+                params=dict(pit_prob=pp, wumpus_prob=wp, max_pits=None if mp == NO_CAP else mp,
+                            max_wumpi=None if mw == NO_CAP else mw))
+    return head, HEADER.size + META.size
+
+
+def read_trace(path: str) -> Tuple[dict, Iterator[Record]]:
+    """binary trace 파일 → (헤더 dict, 기록 iterator)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    head, start = read_header(data, path)
+    body = memoryview(data)[start:]
+    body = body[:len(body) - len(body) % RECORD.size]
+    return head, RECORD.iter_unpack(body)
+
+
+def make_trace(mode: str = "list", path: Optional[str] = None, size: int = 4,
+               seed: Optional[int] = None, maxlen: int = 1024, **meta):
+    """모드 이름 → 저장소 (off 는 None). meta : binary 헤더에 남길 limit / on_stuck / risk / params"""
+    if mode == "off":
+        return None
+    if mode == "list":
+        return ListTrace()
+    if mode == "ring":
+        return RingTrace(maxlen)
+    if mode == "binary":
+        if path is None:
+            raise ValueError("binary trace 에는 path 가 필요함")
+        return BinaryTrace(path, size, seed, **meta)
+    raise ValueError(f"알 수 없는 trace 모드: {mode}")
@@ -0,0 +1,185 @@
+"""
+vecenv.py
+────────────────────────────────────────────────────────────────────────────
+• 여러 World 를 한 번에 진행하는 벡터 환경 (Gym 스타일 reset / step)
+  - M 개 월드의 평탄 배열(pit / wumpus / stench 개수 / percept, 칸 id = x*stride+y)을
+    월드 k 가 [k*cells, (k+1)*cells) 구간을 쓰도록 이어 붙인 bytearray 하나씩으로 보관
+    · World 의 배열 배치를 그대로 씀 → 생성은 bytes 연결만, wall 은 모든 월드 공유
+  - 에이전트 상태도 월드별 배열 (pos 칸 id, dir E/S/W/N 번호, arrows, has_gold, ...)
+  - step(actions) : 행동 코드(setting.ACT_CODE) M 개 → (percept 비트, 보상, done) 배열
+    · Percept 객체 / World 메서드 호출 없이 한 루프에서 M 개 처리
+    · 규칙은 World.forward / World.shoot / take_gold, Agent.step 과 같음
+      보상 = -1 / 행동, -30 / 사망 (→ (1,1) 동쪽, 화살 3, 금 잃음), +1000 / 금 들고 (1,1) 에서 Climb
+    · exit_on_return=True 면 Episode 처럼 금을 들고 (1,1) 에 도착하면 종료 (Climb 보너스 없음)
+    · done 인 환경은 행동을 무시 (보상 0) — reset() 으로 다시 시작
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Iterable, Sequence, Tuple
+import random
+
+from setting import World, Percept, ACT_CODE
+from topology import LEFT, RIGHT, NAMES, grid
+from worldgen import generate
+
+FORWARD, TURN_LEFT, TURN_RIGHT, GRAB, SHOOT, CLIMB = (
+    ACT_CODE[a] for a in ("Forward", "TurnLeft", "TurnRight", "Grab", "Shoot", "Climb"))
+STENCH, GLITTER, BUMP, SCREAM = Percept.STENCH, Percept.GLITTER, Percept.BUMP, Percept.SCREAM
+
+
+class VecEnv:
+    def __init__(self, worlds: Sequence[World], limit: int = 120, exit_on_return: bool = False):
+        if not worlds:
+            raise ValueError("월드가 하나 이상 필요함")
+        size = worlds[0].size
+        if any(w.size != size for w in worlds):
+            raise ValueError("모든 월드의 size 가 같아야 함")
+        self.size = size
+        self.grid = g = grid(size)
+        self.stride = g.stride
+        self.cells = g.cells
+        self.limit = limit
+        self.exit_on_return = exit_on_return
+        self.seeds = [w.seed for w in worlds]
+        self.start = g.start
+        self.delta = g.delta                            # E, S, W, N → 칸 id 변화
+        self.wall = bytes(worlds[0].wall)
+        # reset() 때 되돌릴 초기 배열 (pit 은 바뀌지 않으므로 하나만)
+        self.pit = b"".join(w.pit for w in worlds)
+        self._init = (b"".join(w.wumpus for w in worlds),
+                      b"".join(w.stench for w in worlds),
+                      b"".join(w.percept for w in worlds))
+        self.reset()
+
+    @classmethod
+    def from_seeds(cls, seeds: Iterable[int], size: int = 4, limit: int = 120,
+                   exit_on_return: bool = False) -> "VecEnv":
+        """worldgen 으로 시드별 월드를 일괄 생성 (World(seed) 와 같은 배치)"""
+        return cls(list(generate(seeds, size).worlds()), limit, exit_on_return)
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    # ──────────────────────────────────────────────────────────
+    #  reset / step
+    # ──────────────────────────────────────────────────────────
+    def reset(self) -> bytearray:
+        """모든 환경을 처음 상태로 → (1,1) 의 percept 비트"""
+        m = len(self)
+        self.wumpus, self.stench, self.percept = (bytearray(b) for b in self._init)
+        self.pos = array("i", [self.start]) * m
+        self.dir = bytearray(m)                         # 0=E 1=S 2=W 3=N (Dir 순서)
+        self.arrows = bytearray([3]) * m
+        self.has_gold = bytearray(m)
+        self.steps = array("i", bytes(4 * m))
+        self.deaths = array("i", bytes(4 * m))
+        self.returns = array("i", bytes(4 * m))         # 보상 누적 (사망해도 0 으로 돌리지 않음)
+        self.done = bytearray(m)
+        self.dead = bytearray(m)                        # 마지막 step 에서 사망
+        c, st = self.cells, self.start
+        return bytearray(self.percept[k * c + st] for k in range(m))
+
+    def step(self, actions: Sequence[int]) -> Tuple[bytearray, array, bytearray]:
+        """행동 코드 M 개 → (percept 비트 | BUMP | SCREAM, 보상, done)"""
+        m = len(self)
+        if len(actions) != m:
+            raise ValueError(f"행동 {len(actions)} 개 ≠ 환경 {m} 개")
+        c, start, limit, exit_on_return = self.cells, self.start, self.limit, self.exit_on_return
+        wall, pit, wumpus, percept, delta = self.wall, self.pit, self.wumpus, self.percept, self.delta
+        pos, dirs, arrows, has_gold = self.pos, self.dir, self.arrows, self.has_gold
+        steps, deaths, returns, done, dead = self.steps, self.deaths, self.returns, self.done, self.dead
+        obs = bytearray(m)
+        rew = array("i", bytes(4 * m))
+        for k in range(m):
+            dead[k] = 0
+            if done[k]:
+                continue
+            a, i, base = actions[k], pos[k], k * c
+            r, extra = -1, 0
+            if a == FORWARD:
+                j = i + delta[dirs[k]]
+                if wall[j]:
+                    extra = BUMP
+                elif pit[base + j] or wumpus[base + j]:
+                    r -= 30; dead[k] = 1; deaths[k] += 1
+                    i = pos[k] = start
+                    dirs[k] = 0; arrows[k] = 3; has_gold[k] = 0
+                else:
+                    i = pos[k] = j
+            elif a == TURN_LEFT:
+                dirs[k] = LEFT[dirs[k]]
+            elif a == TURN_RIGHT:
+                dirs[k] = RIGHT[dirs[k]]
+            elif a == GRAB:
+                if percept[base + i] & GLITTER:
+                    percept[base + i] &= ~GLITTER
+                    has_gold[k] = 1
+            elif a == SHOOT:
+                if arrows[k]:
+                    arrows[k] -= 1
+                    if self._shoot(base, i, delta[dirs[k]]):
+                        extra = SCREAM
+            elif a == CLIMB:
+                if i == start:
+                    done[k] = 1
+                    if has_gold[k]:
+                        r += 1000
+            steps[k] += 1
+            returns[k] += r
+            rew[k] = r
+            if (exit_on_return and has_gold[k] and i == start) or steps[k] >= limit:
+                done[k] = 1
+            obs[k] = percept[base + i] | extra
+        return obs, rew, done
+
+    def _shoot(self, base: int, i: int, d: int) -> bool:
+        """World.shoot 과 같음 : 벽까지 직선, 첫 wumpus 제거 후 주변 stench 개수 감소"""
+        wall, wumpus, stench, percept, nbrs = self.wall, self.wumpus, self.stench, self.percept, self.grid.nbrs
+        i += d
+        while not wall[i]:
+            if wumpus[base + i]:
+                wumpus[base + i] = 0
+                for n in nbrs[i]:
+                    v = stench[base + n] = max(0, stench[base + n] - 1)
+                    if not v:
+                        percept[base + n] &= ~STENCH
+                return True
+            i += d
+        return False
+
+    # ──────────────────────────────────────────────────────────
+    #  조회
+    # ──────────────────────────────────────────────────────────
+    def xy(self, k: int) -> Tuple[int, int]:
+        return divmod(self.pos[k], self.stride)
+
+    def state(self, k: int) -> dict:
+        return dict(seed=self.seeds[k], pos=self.xy(k), dir=NAMES[self.dir[k]],
+                    arrows=self.arrows[k], has_gold=bool(self.has_gold[k]),
+                    steps=self.steps[k], deaths=self.deaths[k], returns=self.returns[k],
+                    done=bool(self.done[k]))
+
+
+def random_actions(env: VecEnv, rng: random.Random) -> array:
+    """균등 무작위 행동 M 개 (벤치 / 예시용)"""
+    return array("B", [rng.randrange(6) for _ in range(len(env))])
+
+
+if __name__ == "__main__":
+    import argparse, time
+    ap = argparse.ArgumentParser(description="무작위 행동으로 VecEnv 처리량 측정")
+    ap.add_argument("--envs", type=int, default=1024, help="환경 수")
+    ap.add_argument("--steps", type=int, default=120, help="스텝 수 (= limit)")
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    args = ap.parse_args()
+    env = VecEnv.from_seeds(range(args.envs), args.size, args.steps)
+    rng = random.Random(0)
+    acts = [random_actions(env, rng) for _ in range(args.steps)]
+    t = time.perf_counter()
+    for a in acts:
+        env.step(a)
+    dt = time.perf_counter() - t
+    print(f"VecEnv : {sum(env.steps) / dt:,.0f} env-steps/s  "
+          f"(mean return {sum(env.returns) / len(env):.1f}, deaths {sum(env.deaths)})")
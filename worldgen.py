@@ -0,0 +1,119 @@
+"""
+worldgen.py
+────────────────────────────────────────────────────────────────────────────
+• 여러 World 배치를 한 번에 생성
+  - 배치 샘플링은 World._generate 와 같은 setting.sample_layout 을 시드별
+    Random 으로 호출 → 같은 시드면 World(seed) 와 같은 배치
+    (SAFE_STARTS 제외, 종류별 상한, pit/wumpus 겹침 금지, gold 는 빈 칸)
+  - 생성 파라미터(pit_prob / wumpus_prob / max_pits / max_wumpi)는 World 와 같은 키워드
+  - 레이어는 K 개 월드의 평탄 배열(칸 id = x*stride+y, 월드당 cells 바이트,
+    World 와 같은 배치)을 이어 붙인 bytearray
+  - stench / breeze 인접 수는 평탄 배열 전체를 바이트 레인 정수 하나로 보고
+    상하좌우 시프트(이웃 합성곱)를 한 번 더해 계산 (칸당 최대 4 → 자리올림 없음).
+    월드마다 벽 테두리가 있어 이웃 월드로 번지지 않는다
+  - world(k) 는 이 배열의 k 번째 조각을 World.from_layout(layers=...) 로 넘김
+    → 월드마다 _build (칸별 인접 수 갱신)를 다시 하지 않음
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+import random
+
+from setting import World, Percept, HAZARD_PROB, max_hazards, sample_layout
+from kb import Board
+from topology import grid
+
+
+@dataclass
+class WorldBatch:
+    size: int
+    seeds: List[int]
+    gold: List[int] = field(default_factory=list)      # 월드별 gold 칸 id
+    params: dict = field(default_factory=dict)          # 생성 파라미터 (World 키워드)
+    # 평탄 배열 K 개를 이어 붙인 것 (월드 k 는 [k*cells, (k+1)*cells))
+    pit: bytearray = field(default_factory=bytearray)
+    wumpus: bytearray = field(default_factory=bytearray)
+    stench: bytearray = field(default_factory=bytearray)    # 인접 wumpus 수
+    breeze: bytearray = field(default_factory=bytearray)    # 인접 pit 수
+    percept: bytearray = field(default_factory=bytearray)   # 칸별 S|B|G 비트
+    board: Board = field(init=False, repr=False)
+    _layouts: list = field(default_factory=list, repr=False)   # sample_layout 결과 (pits, wumpi, gold_xy)
+
+    def __post_init__(self):
+        self.board = Board(self.size)
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def layout(self, k: int) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]], Tuple[int, int]]:
+        pits, wumpi, gold = self._layouts[k]
+        return sorted(pits), sorted(wumpi), gold
+
+    def world(self, k: int) -> World:
+        """k 번째 배치로 World 생성 (Agent 가 그대로 사용)"""
+        pits, wumpi, gold = self._layouts[k]
+        n = self.board.cells
+        a, b = k * n, (k + 1) * n
+        layers = (bytearray(_wall(self.size)), self.pit[a:b], self.wumpus[a:b],     # 조각 = 새 bytearray
+                  self.stench[a:b], self.breeze[a:b], self.percept[a:b])
+        return World.from_layout(self.size, pits, wumpi, gold, seed=self.seeds[k], layers=layers,
+                                 **self.params)
+
+    def worlds(self):
+        for k in range(len(self)):
+            yield self.world(k)
+
+
+@lru_cache(maxsize=None)
+def _wall(size: int) -> bytes:
+    return bytes(1 - v for v in grid(size).inside)
+
+
+def neighbours(layer: bytearray, k: int, board: Board) -> bytearray:
+    """K 개 평탄 배열(0/1)을 이어 붙인 layer → 칸별 상하좌우 이웃 수 (격자 내부만) — 한 번에"""
+    if not layer:
+        return bytearray()
+    s, n = board.stride * 8, len(layer)
+    m = int.from_bytes(layer, "little")
+    inside = int.from_bytes(grid(board.size).inside * k, "little") * 0xFF     # 내부 칸 바이트 = 0xFF
+    return bytearray((((m << s) + (m >> s) + (m << 8) + (m >> 8)) & inside).to_bytes(n, "little"))
+
+
+_HAS = bytes([0]) + bytes([1]) * 255                    # 인접 수 > 0 → 1
+
+
+def generate(seeds: Iterable[int], size: int = 4, pit_prob: float = HAZARD_PROB,
+             wumpus_prob: float = HAZARD_PROB, max_pits: Optional[int] = None,
+             max_wumpi: Optional[int] = None) -> WorldBatch:
+    cap = max_hazards(size)
+    max_pits = cap if max_pits is None else max_pits
+    max_wumpi = cap if max_wumpi is None else max_wumpi
+    batch = WorldBatch(size, list(seeds), params=dict(pit_prob=pit_prob, wumpus_prob=wumpus_prob,
+                                                      max_pits=max_pits, max_wumpi=max_wumpi))
+    b, k = batch.board, len(batch)
+    s, n = b.stride, b.cells
+    pit, wumpus = bytearray(k * n), bytearray(k * n)
+    rng = random.Random()
+    for j, seed in enumerate(batch.seeds):
+        rng.seed(seed)
+        lay = pits, wumpi, (gx, gy) = sample_layout(rng, size, max_pits, max_wumpi, pit_prob, wumpus_prob)
+        batch._layouts.append(lay)
+        base = j * n
+        for x, y in pits:
+            pit[base + x * s + y] = 1
+        for x, y in wumpi:
+            wumpus[base + x * s + y] = 1
+        batch.gold.append(gx * s + gy)
+    batch.pit, batch.wumpus = pit, wumpus
+    batch.stench, batch.breeze = neighbours(batch.wumpus, k, b), neighbours(batch.pit, k, b)
+    # percept = S(1) | B(2) — 0/1 배열 두 개를 바이트 레인 정수로 더함, G 는 월드마다 한 칸
+    st, br = batch.stench.translate(_HAS), batch.breeze.translate(_HAS)
+    percept = bytearray((int.from_bytes(st, "little") + 2 * int.from_bytes(br, "little"))
+                        .to_bytes(k * n, "little"))
+    for j, g in enumerate(batch.gold):
+        percept[j * n + g] |= Percept.GLITTER
+    batch.percept = percept
+    return batch
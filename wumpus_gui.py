@@ -1,11 +1,16 @@
 import tkinter as tk
-from tkinter import messagebox
+from collections import deque
 from setting import World
-from agent import Agent
+from replay import Replay
+from results_db import ResultsDB, DEFAULT_DB
+import sqlite3
+import threading
+import time
 import os
 
-SUCCESS = [ 1111, 900, 17,  88,  101, 402, 600, 1000]
+SUCCESS = [ 1111, 900, 17,  88,  101, 402, 600, 1000]     # 캐시가 없을 때 쓰는 기본 목록
 SEED_FILE = "current_seed.txt"
+ON_STUCK = "off"        # Replay 는 순환 감지 없이 끝까지 재생 → 캐시도 같은 정책의 기록만
 
 
 
@@ -14,101 +19,244 @@ SEED_FILE = "current_seed.txt"
 
 
 
-def get_next_seed():
+def success_seeds(size=4, limit=120, policy=ON_STUCK):
+    """results_db 캐시에서 현재 에이전트 버전이 같은 size / limit / on_stuck 으로 성공한 시드
+    (캐시가 없거나 비어 있으면 SUCCESS)"""
+    if os.path.exists(DEFAULT_DB):
+        try:
+            with ResultsDB(DEFAULT_DB, size, limit, policy) as db:
+                seeds = db.successes()
+        except sqlite3.Error:
+            seeds = []
+        if seeds:
+            return seeds
+    return SUCCESS
+
+
+def get_next_seed(size=4, limit=120, policy=ON_STUCK):
+    seeds = success_seeds(size, limit, policy)
     if os.path.exists(SEED_FILE):
         with open(SEED_FILE, "r") as f:
-            index = int(f.read().strip())
+            index = int(f.read().strip()) % len(seeds)
     else:
         index = 0
 
-    next_index = (index + 1) % len(SUCCESS)
+    next_index = (index + 1) % len(seeds)
     with open(SEED_FILE, "w") as f:
         f.write(str(next_index))
 
-    return SUCCESS[index]
-
-
-CHOSEN_SEED = get_next_seed()
+    return seeds[index]
+
+
+SPEEDS = [1, 2, 5, 10, 30, 100, 1000, None]     # 초당 스텝 (None = 최고 속도)
+FRAME_MS = 33                                   # 화면 갱신 주기 — 그 사이 진행된 스텝은 그리지 않음
+
+ARROW = {
+    "E": "â¡ï¸", "W": "â¬ï¸", "N": "â¬ï¸", "S": "â¬ï¸"
+}
+GOLD = "ð§"
+WUMPUS = "ð¹"
+PIT = "ð³ï¸"
+
+
+class SimWorker(threading.Thread):
+    """Replay 를 백그라운드 스레드에서 진행. GUI 는 frame(최신 상태 요약)만 읽음"""
+
+    def __init__(self, replay, speed):
+        super().__init__(daemon=True)
+        self.replay = replay
+        self.speed = speed
+        self.paused = False
+        self.stopped = False
+        self.lock = threading.Lock()            # replay 진행 / seek 직렬화
+        self.wake = threading.Event()           # 일시정지 해제 · 속도 변경 · 종료 알림
+        self.died = deque()                     # GUI 가 아직 표시하지 않은 사망 칸
+        self.frame = self.snap()
+
+    def snap(self):
+        ep = self.replay.ep
+        ag = ep.agent
+        return dict(step=ep.step_no, pos=(ag.x, ag.y), dir=ag.dir.name, has_gold=ag.has_gold,
+                    score=ag.performance, arrows=ag.arrows, deaths=ep.deaths,
+                    wumpi=frozenset(ep.world.wumpi), done=ep.done, success=ep.success)
+
+    def notify(self):
+        self.wake.set()
+
+    def run(self):
+        ep = self.replay.ep
+        while not self.stopped:
+            if self.paused or ep.done:
+                self.wake.wait(); self.wake.clear()
+                continue
+            t0 = time.perf_counter()
+            with self.lock:
+                deaths = ep.deaths
+                self.replay.forward()
+                if ep.deaths > deaths:
+                    rec = ep.agent.trace.buf[-1]        # 사망 직후 기록 (reset_position 전 위치)
+                    self.died.append((rec[2], rec[3]))
+                self.frame = self.snap()
+            if self.speed is not None:
+                self.wake.wait(max(0.0, 1 / self.speed - (time.perf_counter() - t0)))
+                self.wake.clear()
 
 
 class WumpusWorldGUI:
-    def __init__(self, root):
+    def __init__(self, root, size=4, limit=120, speed=2):
         self.root = root
-        self.root.title(f"Wumpus World GUI - Seed {CHOSEN_SEED}")
-
-        self.world = World(seed=CHOSEN_SEED)
-        self.agent = Agent(self.world)
-        self.deaths = 0
-
-        self.grid_frame = tk.Frame(self.root)
-        self.grid_frame.pack()
-
-        self.labels = [
-            [tk.Label(self.grid_frame, width=4, height=2, borderwidth=2,
-                      relief="solid", font=("Arial", 20), anchor="center")
-             for _ in range(4)] for _ in range(4)
-        ]
-
-        for y in range(4):
-            for x in range(4):
-                self.labels[y][x].grid(row=y, column=x)
-
-        self.info = tk.Label(self.root, text="Step: 0 | Score: 0 | Arrows: 3", font=("Arial", 12))
+        self.seed = get_next_seed(size, limit)
+        self.root.title(f"Wumpus World GUI - Seed {self.seed}")
+
+        # 시뮬레이션은 SimWorker 스레드, 화면은 FRAME_MS 마다 최신 frame 만 그림
+        # Space 일시정지/재개, ←/→ 이전/다음 스텝 스크럽, +/- 속도, F 빨리감기
+        self.replay = Replay(World(seed=self.seed, size=size), limit=limit)
+        self.world, self.agent = self.replay.ep.world, self.replay.ep.agent
+        n = self.world.size
+        c = self.cell = max(8, min(64, 640 // n))
+
+        self.canvas = tk.Canvas(self.root, width=n * c, height=n * c, bg="white",
+                                highlightthickness=0)
+        self.canvas.pack()
+        font = ("Arial", max(6, 80 // n))
+        self.rects, self.items, self.shown = {}, {}, {}
+        for x in range(1, n + 1):
+            for y in range(1, n + 1):
+                px, py = (x - 1) * c, (n - y) * c
+                self.rects[x, y] = self.canvas.create_rectangle(px, py, px + c, py + c,
+                                                                outline="black", fill="white")
+                self.items[x, y] = self.canvas.create_text(px + c / 2, py + c / 2, text="", font=font)
+                self.shown[x, y] = ""
+
+        self.info = tk.Label(self.root, text="", font=("Arial", 12))
         self.info.pack(pady=5)
-
-        self.step_count = 0
-        self.update_display()
-        self.root.after(500, self.step)
-
-    def update_display(self):
-        for y in range(4):
-            for x in range(4):
-                tx, ty = x + 1, 4 - y
-                label = self.labels[y][x]
-
-                emoji = ""
-                if (tx, ty) == (self.agent.x, self.agent.y):
-                    emoji = {
-                        "E": "â¡ï¸", "W": "â¬ï¸", "N": "â¬ï¸", "S": "â¬ï¸"
-                    }[self.agent.dir.name]
-                elif (tx, ty) == self.world.gold_xy and not self.agent.has_gold:
-                    emoji = "ð§"
-                elif (tx, ty) in self.world.wumpi:
-                    emoji = "ð¹"
-                elif (tx, ty) in self.world.pits:
-                    emoji = "ð³ï¸"
-
-                label.config(text=emoji)
-
+        tk.Label(self.root, text="Space: pause | Left/Right: step | +/-: speed | F: fast-forward",
+                 font=("Arial", 9)).pack()
+
+        self.root.bind("<Left>", lambda e: self.scrub(-1))
+        self.root.bind("<Right>", lambda e: self.scrub(+1))
+        self.root.bind("<space>", lambda e: self.toggle_pause())
+        self.root.bind("<plus>", lambda e: self.change_speed(+1))
+        self.root.bind("<equal>", lambda e: self.change_speed(+1))
+        self.root.bind("<minus>", lambda e: self.change_speed(-1))
+        self.root.bind("<f>", lambda e: self.fast_forward())
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.speed_idx = SPEEDS.index(speed) if speed in SPEEDS else 1
+        self.resume_idx = self.speed_idx        # 빨리감기 해제 시 돌아갈 속도
+        self.worker = SimWorker(self.replay, SPEEDS[self.speed_idx])
+        self.frame = None
+        self.reported = False
+        self.render(self.worker.frame)
+        self.worker.start()
+        self._tick = self.root.after(FRAME_MS, self.poll)
+
+    @property
+    def paused(self):
+        return self.worker.paused
+
+    @property
+    def deaths(self):
+        return self.replay.ep.deaths
+
+    # ──────────────────────────────────────────────────────────
+    #  조작
+    # ──────────────────────────────────────────────────────────
+    def scrub(self, k):
+        w = self.worker
+        w.paused = True
+        with w.lock:
+            self.replay.seek(self.replay.step + k)
+            w.frame = w.snap()
+        self.render(w.frame)
+
+    def toggle_pause(self):
+        self.worker.paused = not self.worker.paused
+        self.worker.notify()
+        self.render(self.worker.frame, force=True)
+
+    def change_speed(self, k):
+        self.speed_idx = max(0, min(len(SPEEDS) - 1, self.speed_idx + k))
+        self.resume_idx = self.speed_idx
+        self.worker.speed = SPEEDS[self.speed_idx]
+        self.worker.notify()
+        self.render(self.worker.frame, force=True)
+
+    def fast_forward(self):
+        top = len(SPEEDS) - 1
+        self.speed_idx = self.resume_idx if self.speed_idx == top else top
+        self.worker.speed = SPEEDS[self.speed_idx]
+        self.worker.notify()
+        self.render(self.worker.frame, force=True)
+
+    def close(self):
+        self.worker.stopped = True
+        self.worker.notify()
+        if self._tick is not None:
+            self.root.after_cancel(self._tick)
+        self.root.destroy()
+
+    # ──────────────────────────────────────────────────────────
+    #  그리기 : 바뀐 칸만 itemconfig
+    # ──────────────────────────────────────────────────────────
+    def poll(self):
+        self._tick = self.root.after(FRAME_MS, self.poll)
+        f = self.worker.frame
+        if f is not self.frame or self.worker.died:
+            self.render(f)
+
+    def glyph(self, xy, f):
+        if xy == f["pos"]:
+            return ARROW[f["dir"]]
+        if xy == self.world.gold_xy and not f["has_gold"]:
+            return GOLD
+        if xy in f["wumpi"]:
+            return WUMPUS
+        if xy in self.world.pits:
+            return PIT
+        return ""
+
+    def render(self, f, force=False):
+        old, self.frame = self.frame, f
+        if old is None:
+            dirty = self.items.keys()
+        else:
+            dirty = {old["pos"], f["pos"], self.world.gold_xy} | (old["wumpi"] ^ f["wumpi"])
+        for xy in dirty:
+            g = self.glyph(xy, f)
+            if xy in self.items and self.shown[xy] != g:
+                self.canvas.itemconfig(self.items[xy], text=g)
+                self.shown[xy] = g
+
+        while self.worker.died:                 # 모달 대신 사망 칸을 잠깐 붉게
+            xy = self.worker.died.popleft()
+            self.canvas.itemconfig(self.rects[xy], fill="#f4a0a0")
+            self.root.after(400, self.canvas.itemconfig, self.rects[xy], {"fill": "white"})
+
+        speed = SPEEDS[self.speed_idx]
+        status = ""
+        if f["done"]:
+            status = " | SUCCESS" if f["success"] else " | FAILED (step limit)"
+        elif self.worker.paused:
+            status = " | Paused"
         self.info.config(
-            text=f"Step: {self.step_count} | Score: {self.agent.performance} | Arrows: {self.agent.arrows}"
+            text=f"Step: {f['step']} | Score: {f['score']} | Arrows: {f['arrows']} | "
+                 f"Deaths: {f['deaths']} | Speed: {'max' if speed is None else speed}/s" + status
         )
 
-    def step(self):
-        self.step_count += 1
-        alive = self.agent.step(self.step_count)
-        self.update_display()
-
-        if not alive:
-            self.deaths += 1
-            messagebox.showwarning("ì¬ë§", f"ìì´ì í¸ê° ì£½ììµëë¤. (ì´ {self.deaths}í)")
-            self.agent.reset_position()
-            self.update_display()
-
-        if self.agent.has_gold and (self.agent.x, self.agent.y) == (1, 1):
-            self.agent.print_history()
-            messagebox.showinfo("ì±ê³µ", "ê¸ íë í íì¶ ì±ê³µ!")
-            return
-
-        if self.step_count >= 120:
-            self.agent.print_history()
-            messagebox.showinfo("ì¤í¨", "ì¤í ì í ëë¬. ì¢ë£í©ëë¤.")
-            return
-
-        self.root.after(500, self.step)
+        if f["done"] and not self.reported:
+            self.reported = True
+            with self.worker.lock:
+                self.agent.print_history(self.replay.log.rows())
 
 
 if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=4, help="격자 한 변 칸 수")
+    ap.add_argument("--limit", type=int, default=120, help="최대 스텝 수")
+    ap.add_argument("--speed", type=int, default=2, help=f"초당 스텝 {SPEEDS[:-1]} (0 = 최고 속도)")
+    args = ap.parse_args()
     root = tk.Tk()
-    app = WumpusWorldGUI(root)
+    app = WumpusWorldGUI(root, args.size, args.limit, args.speed or None)
     root.mainloop()